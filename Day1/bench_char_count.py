@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark count_characters (full read + Counter) against
+count_characters_fast (mmap + numpy.bincount) on a synthetic ASCII file.
+
+Usage:
+  python bench_char_count.py --size-mb 200
+"""
+import os
+import time
+import random
+import string
+import argparse
+import tempfile
+
+from char_count import count_characters, count_characters_fast, _numpy
+
+
+def make_input(path, size_mb, seed=42):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + string.punctuation + " " * 10
+    block = "".join(rng.choice(alphabet) for _ in range(8191)) + "\n"
+    block_bytes = block.encode("ascii")
+    with open(path, "wb") as f:
+        for _ in range(size_mb * 1024 * 1024 // len(block_bytes) + 1):
+            f.write(block_bytes)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    p = argparse.ArgumentParser(description="char_count fast path benchmark")
+    p.add_argument("--size-mb", type=int, default=100, help="Synthetic input size")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per implementation")
+    args = p.parse_args()
+
+    if _numpy() is None:
+        raise SystemExit("numpy is not installed; the fast path is unavailable")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.txt")
+        make_input(path, args.size_mb)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+
+        results = {}
+        for name, fn in (
+            ("counter", count_characters),
+            ("numpy", count_characters_fast),
+        ):
+            best, counts = float("inf"), None
+            for _ in range(args.repeat):
+                counts, elapsed = timed(fn, path)
+                best = min(best, elapsed)
+            results[name] = (counts, best)
+            print(f"{name:>8}: {best:.3f}s  ({size_mb / best:.1f} MB/s)")
+
+    (slow, t_slow), (fast, t_fast) = results["counter"], results["numpy"]
+    assert list(slow.items()) == list(fast.items()), "fast path output differs"
+    print(f" speedup: {t_slow / t_fast:.1f}x on {size_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
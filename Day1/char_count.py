@@ -1,30 +1,198 @@
-import sys, csv
+import sys, csv, argparse, mmap, os
 from collections import Counter
 
+np = None  # numpy, imported by _numpy() on the first --fast count
+
+from perf_stats import measure, format_stats
+from parallel_count import count_parallel, expand_inputs
+from s3_io import is_s3_path, open_input, open_output
+
+CHUNK_SIZE = 1024 * 1024  # characters per read in streaming mode
+SINGLE_BYTE_ENCODINGS = {"latin-1", "latin1", "iso-8859-1", "iso8859-1"}
+CR, LF = 13, 10
+
 
 def count_characters(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
+    with open_input(file_path, encoding="utf-8") as f:
         text = f.read().lower()
     return Counter(text)
 
 
+def count_characters_stream(f, chunk_size=CHUNK_SIZE):
+    """
+    Count characters from an open text stream, reading fixed-size chunks.
+    Each chunk is lowered up to its last whitespace so case mappings that
+    look at neighbouring letters (final sigma) see the same context as a
+    full read; the rest is carried into the next chunk.
+    Only a run of non-whitespace longer than chunk_size is split as is.
+    """
+    counts = Counter()
+    carry = ""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        text = carry + chunk
+        cut = len(text)
+        if not text[-1].isspace():
+            tail = len(text.rsplit(None, 1)[-1])
+            # A chunk without any whitespace is counted as is, so the carry
+            # can never grow beyond one chunk.
+            if tail < len(text):
+                cut -= tail
+        counts.update(text[:cut].lower())
+        carry = text[cut:]
+    counts.update(carry.lower())
+    return counts
+
+
+def count_characters_streaming(file_path, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    with open_input(file_path, encoding=encoding) as f:
+        return count_characters_stream(f, chunk_size)
+
+
+def _numpy():
+    """numpy for the --fast path, or None when it isn't installed."""
+    global np
+    if np is None:
+        try:
+            import numpy as np
+        except ImportError:  # the --fast path is optional
+            return None
+    return np
+
+
+def _crlf_pairs(data, block=16 * 1024 * 1024):
+    """Number of b"\\r\\n" pairs, scanned in blocks to bound temp arrays."""
+    pairs = 0
+    for i in range(0, len(data) - 1, block):
+        a = data[i : i + block + 1]
+        pairs += int(np.count_nonzero((a[:-1] == CR) & (a[1:] == LF)))
+    return pairs
+
+
+def count_characters_fast(file_path, encoding="utf-8", chunk_size=CHUNK_SIZE):
+    """
+    Vectorized count_characters for ASCII / Latin-1 files.
+
+    The file is memory-mapped and numpy.bincount builds a 256-bin byte
+    histogram, which is then case-folded into characters. Newlines are
+    translated like text mode does (\\r\\n and \\r count as \\n) and keys
+    are ordered by first occurrence, so the CSV matches count_characters.
+    UTF-8 input with multi-byte characters (or no numpy installed, or an
+    s3:// input) falls back to count_characters_streaming.
+    """
+    single_byte = encoding.lower().replace("_", "-") in SINGLE_BYTE_ENCODINGS
+    if is_s3_path(file_path) or _numpy() is None:  # nothing to mmap
+        return count_characters_streaming(file_path, chunk_size, encoding)
+
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return Counter()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = np.frombuffer(mm, dtype=np.uint8)
+            hist = np.bincount(data, minlength=256)
+            if hist[128:].any() and not single_byte:
+                del data  # release the buffer before the mmap is closed
+                return count_characters_streaming(file_path, chunk_size, encoding)
+            pairs = _crlf_pairs(data) if hist[CR] else 0
+            del data
+            first = {b: mm.find(bytes([b])) for b in range(256) if hist[b]}
+
+    # Text mode turns every \r\n and lone \r into a single \n
+    if hist[CR]:
+        hist[LF] += hist[CR] - pairs
+        first[LF] = min(first.get(LF, first[CR]), first[CR])
+        hist[CR] = 0
+        del first[CR]
+
+    totals, seen_at = {}, {}
+    for b, pos in first.items():
+        for ch in chr(b).lower():
+            totals[ch] = totals.get(ch, 0) + int(hist[b])
+            seen_at[ch] = min(seen_at.get(ch, pos), pos)
+    return Counter({ch: totals[ch] for ch in sorted(totals, key=seen_at.get)})
+
+
 def save_char_count_to_csv(counts, output_path):
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
+    with open_output(output_path, newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["character", "count"])
         for char, cnt in counts.items():
             writer.writerow([char, cnt])
 
 
+def parse_args():
+    p = argparse.ArgumentParser(
+        description="Count characters in a text file and save counts to CSV."
+    )
+    p.add_argument(
+        "inputs",
+        nargs="+",
+        help="Input text file(s) or s3://bucket/key; globs are expanded",
+    )
+    p.add_argument("output", help="Path to output CSV file (or s3://bucket/key)")
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read the input in fixed-size chunks (constant memory)",
+    )
+    p.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Characters per chunk in --stream mode (default {CHUNK_SIZE})",
+    )
+    p.add_argument(
+        "--fast",
+        action="store_true",
+        help="mmap + numpy byte histogram for ASCII/Latin-1 input",
+    )
+    p.add_argument(
+        "--encoding",
+        default="utf-8",
+        help="Input encoding for --fast (utf-8 or latin-1, default utf-8)",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Count on N processes (splits large files, spreads many files)",
+    )
+    p.add_argument(
+        "--stats", action="store_true", help="Print throughput and peak RSS"
+    )
+    return p.parse_args()
+
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usaeg char_count.py input.txt output.csv")
+    if len(sys.argv) < 3:
+        print("Usaeg char_count.py input.txt output.csv [--stream]")
         sys.exit(1)
 
-    input_path, output_path = sys.argv[1], sys.argv[2]
-    counts = count_characters(input_path)
-    save_char_count_to_csv(counts, output_path)
-    print(f"Processed {len(counts)} unique chars -> saved to {output_path}")
+    args = parse_args()
+    inputs = expand_inputs(args.inputs)
+    with measure(inputs) as stats:
+        if args.workers > 1 or len(inputs) > 1:
+            counts = count_parallel(
+                inputs,
+                count_characters_stream,
+                args.workers,
+                chunk_size=args.chunk_size,
+            )
+        elif args.fast:
+            counts = count_characters_fast(inputs[0], args.encoding, args.chunk_size)
+        elif args.stream:
+            counts = count_characters_streaming(inputs[0], args.chunk_size)
+        else:
+            counts = count_characters(inputs[0])
+    save_char_count_to_csv(counts, args.output)
+    print(f"Processed {len(counts)} unique chars -> saved to {args.output}")
+    if args.stats:
+        mode = "fast" if args.fast else "stream" if args.stream else "full-read"
+        if args.workers > 1:
+            mode = f"{args.workers} workers"
+        print(f"[{mode}] {format_stats(stats)}")
 
 
 if __name__ == "__main__":
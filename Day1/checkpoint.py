@@ -0,0 +1,82 @@
+import os
+import gzip
+import json
+import hashlib
+
+CHECKPOINT_VERSION = 1
+HEAD_BYTES = 4096  # bytes hashed to recognise the same file after rotation
+
+
+def head_hash(path, length):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+
+def last_line_end(path, size):
+    """Offset just past the last b"\\n" in the first `size` bytes (0 if none)."""
+    block = 64 * 1024
+    with open(path, "rb") as f:
+        pos = size
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            idx = f.read(pos - start).rfind(b"\n")
+            if idx != -1:
+                return start + idx + 1
+            pos = start
+    return 0
+
+
+def load_checkpoint(path):
+    """Return the saved state dict, or None if missing/unreadable/outdated."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError, EOFError):
+        return None
+    if state.get("version") != CHECKPOINT_VERSION:
+        return None
+    return state
+
+
+def save_checkpoint(path, state):
+    """Write the state atomically (temp file + rename)."""
+    state = dict(state, version=CHECKPOINT_VERSION)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(state, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def resume_offset(state, path, options):
+    """
+    Byte offset to continue from, or 0 when the file must be rescanned:
+    different inode/device (rotation), shrunk below the saved offset
+    (truncation), changed head bytes (rewritten) or different options.
+    """
+    if not state or state.get("options") != options:
+        return 0
+    st = os.stat(path)
+    if (st.st_ino, st.st_dev) != (state["inode"], state["device"]):
+        return 0
+    if st.st_size < state["offset"]:
+        return 0
+    if head_hash(path, state["head_len"]) != state["head_hash"]:
+        return 0
+    return state["offset"]
+
+
+def make_state(path, offset, options, counts):
+    st = os.stat(path)
+    head_len = min(HEAD_BYTES, offset)
+    return {
+        "file": os.path.abspath(path),
+        "inode": st.st_ino,
+        "device": st.st_dev,
+        "offset": offset,
+        "head_len": head_len,
+        "head_hash": head_hash(path, head_len),
+        "options": options,
+        "counts": list(counts.items()),
+    }
@@ -0,0 +1,130 @@
+import os
+import sys
+import heapq
+import shutil
+import tempfile
+from collections import Counter
+
+# Rough cost of one Counter entry besides the key string (dict slot + int)
+ENTRY_OVERHEAD = 100
+# Max run files merged at once; more runs are merged in several passes
+MERGE_FAN_IN = 128
+
+
+def _write_run(items, path):
+    """Write (line, count) pairs sorted by line as a tab-separated run file."""
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for line, cnt in items:
+            f.write(f"{line}\t{cnt}\n")
+
+
+def _read_run(path):
+    with open(path, "r", encoding="utf-8", newline="\n") as f:
+        for record in f:
+            line, cnt = record[:-1].rsplit("\t", 1)
+            yield line, int(cnt)
+
+
+def merge_runs(run_paths):
+    """Stream-merge sorted run files, summing counts of equal lines."""
+    streams = [_read_run(p) for p in run_paths]
+    current, total = None, 0
+    for line, cnt in heapq.merge(*streams, key=lambda item: item[0]):
+        if line == current:
+            total += cnt
+            continue
+        if current is not None:
+            yield current, total
+        current, total = line, cnt
+    if current is not None:
+        yield current, total
+
+
+class ExternalLineCounts:
+    """
+    Exact line counts under a memory budget.
+
+    Lines are counted in an in-memory Counter; once its estimated size goes
+    over max_memory bytes it is written to disk as a sorted run and cleared.
+    items() k-way merges the runs (sorted by line) and can be handed to
+    save_lines_count_to_csv directly. len() and most_common() are filled
+    in while items() is consumed.
+    """
+
+    def __init__(self, max_memory, tmp_dir=None, keep_top=5):
+        self.max_memory = max_memory
+        self.keep_top = keep_top
+        self._dir = tempfile.mkdtemp(prefix="line_count_runs_", dir=tmp_dir)
+        self._runs = []
+        self._next_run = 0
+        self._counts = Counter()
+        self._size = 0
+        self._unique = 0
+        self.spills = 0
+        self._top = []  # min-heap of (count, line)
+
+    def update(self, lines):
+        counts = self._counts
+        for line in lines:
+            if line not in counts:
+                self._size += sys.getsizeof(line) + ENTRY_OVERHEAD
+            counts[line] += 1
+            if self._size > self.max_memory:
+                self._spill()
+
+    def _new_run_path(self):
+        self._next_run += 1
+        return os.path.join(self._dir, f"run_{self._next_run:06d}.tsv")
+
+    def _spill(self):
+        if not self._counts:
+            return
+        path = self._new_run_path()
+        _write_run(sorted(self._counts.items()), path)
+        self._runs.append(path)
+        self.spills += 1
+        self._counts.clear()
+        self._size = 0
+
+    def _reduce_runs(self):
+        """Merge runs in groups until at most MERGE_FAN_IN are left."""
+        while len(self._runs) > MERGE_FAN_IN:
+            merged = []
+            for i in range(0, len(self._runs), MERGE_FAN_IN):
+                group = self._runs[i : i + MERGE_FAN_IN]
+                path = self._new_run_path()
+                _write_run(merge_runs(group), path)
+                for p in group:
+                    os.remove(p)
+                merged.append(path)
+            self._runs = merged
+
+    def items(self):
+        try:
+            if self._runs:
+                self._spill()
+                self._reduce_runs()
+                merged = merge_runs(self._runs)
+            else:  # everything fit in memory, no need to touch disk
+                merged = sorted(self._counts.items())
+            for line, cnt in merged:
+                self._unique += 1
+                entry = (cnt, line)
+                if len(self._top) < self.keep_top:
+                    heapq.heappush(self._top, entry)
+                elif entry > self._top[0]:
+                    heapq.heapreplace(self._top, entry)
+                yield line, cnt
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+        self._runs = []
+
+    def __len__(self):
+        return self._unique
+
+    def most_common(self, n=None):
+        top = sorted(self._top, reverse=True)
+        return [(line, cnt) for cnt, line in top[:n]]
@@ -1,21 +1,24 @@
 import sys, csv, logging, os
 from collections import Counter
 
-os.makedirs("logs", exist_ok=True)
+from s3_io import open_input, open_output
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("logs/app.log"),  # write to file
-        logging.StreamHandler(),  # show in console
-    ],
-)
+
+def setup_logging():
+    os.makedirs("logs", exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler("logs/app.log"),  # write to file
+            logging.StreamHandler(),  # show in console
+        ],
+    )
 
 
 def count_lines(file_path):
     logging.info(f"Counting lines from file {file_path}")
-    with open(file_path, "r", encoding="utf-8") as f:
+    with open_input(file_path, encoding="utf-8") as f:
         lines = f.readlines()
         # lines = [line.strip() for line in lines]
     return Counter(lines)
@@ -23,7 +26,7 @@ def count_lines(file_path):
 
 def save_lines_count_to_csv(counts, output_path):
     logging.info(f"saving lines count to {output_path}")
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
+    with open_output(output_path, newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["line", "count"])
         for line, cnt in counts.items():
@@ -35,6 +38,8 @@ def main():
         logging.error("Usage: python line_count.py input.txt output.csv")
         sys.exit(1)
 
+    setup_logging()  # only once there is a run to log
+
     input_path, output_path = sys.argv[1], sys.argv[2]
     logging.info("Starting line count process")
     counts = count_lines(input_path)
@@ -1,34 +1,60 @@
 #!/usr/bin/env python3
+import os
 import sys
 import csv
 import time
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
 from collections import Counter
 import argparse
+from functools import partial
+
+from parallel_count import count_parallel, count_range, expand_inputs
+from sketches import ApproxLineCounter
+from external_count import ExternalLineCounts
+import checkpoint
+from log_backend import (
+    BatchedRotatingFileHandler,
+    BatchingQueueListener,
+    InProcessQueueHandler,
+)
+from s3_io import is_s3_path, open_input, open_output
 
 # -------- Logging setup --------
 LOG_FILE = "logs/line_count.log"
 
 
-def setup_logging(log_file=LOG_FILE):
+def setup_logging(log_file=LOG_FILE, compress_rotated=False):
+    """
+    Console (INFO+) and rotating file (DEBUG+) logging behind a queue: log
+    calls only enqueue, a background QueueListener writes. The file is
+    flushed whenever the queue drains rather than after every record. The
+    listener is stopped (and pending records flushed) at exit.
+    """
     # Create logs dir if needed
-    import os
-
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
     logger = logging.getLogger("line_counter")
     logger.setLevel(logging.DEBUG)  # capture everything, filter in handlers
 
+    # Avoid duplicate handlers if setup_logging is called twice
+    if logger.handlers:
+        return logger
+
     # Console handler (INFO+)
     ch = logging.StreamHandler()
     ch.setLevel(logging.INFO)
     ch_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
     ch.setFormatter(ch_formatter)
 
-    # Rotating file handler (DEBUG+)
-    fh = RotatingFileHandler(
-        log_file, maxBytes=5_000_000, backupCount=5, encoding="utf-8"
+    # Rotating file handler (DEBUG+), rotated files optionally gzipped
+    fh = BatchedRotatingFileHandler(
+        log_file,
+        compress=compress_rotated,
+        maxBytes=5_000_000,
+        backupCount=5,
+        encoding="utf-8",
     )
     fh.setLevel(logging.DEBUG)
     fh_formatter = logging.Formatter(
@@ -36,15 +62,18 @@ def setup_logging(log_file=LOG_FILE):
     )
     fh.setFormatter(fh_formatter)
 
-    # Avoid duplicate handlers if setup_logging is called twice
-    if not logger.handlers:
-        logger.addHandler(ch)
-        logger.addHandler(fh)
+    log_queue = queue.SimpleQueue()
+    listener = BatchingQueueListener(log_queue, ch, fh, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(InProcessQueueHandler(log_queue))
 
     return logger
 
 
-logger = setup_logging()
+# Handlers are attached by setup_logging() in main(), so importing this
+# module creates no log directory, files or threads
+logger = logging.getLogger("line_counter")
 
 
 # -------- Core logic --------
@@ -54,22 +83,83 @@ def count_lines(file_path, skip_empty=True, normalize=True):
     - skip_empty: ignore blank lines
     - normalize: strip whitespace from ends
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        raw_lines = f.readlines()
+    with open_input(file_path, encoding="utf-8") as f:
+        return count_lines_stream(f, skip_empty=skip_empty, normalize=normalize)
 
-    if normalize:
-        lines = [ln.strip() for ln in raw_lines]
-    else:
-        lines = [ln.rstrip("\n") for ln in raw_lines]
 
-    if skip_empty:
-        lines = [ln for ln in lines if ln]
+def iter_lines(f, skip_empty=True, normalize=True):
+    """Yield the lines of an open text stream, cleaned as count_lines does."""
+    for ln in f:
+        ln = ln.strip() if normalize else ln.rstrip("\n")
+        if skip_empty and not ln:
+            continue
+        yield ln
 
-    return Counter(lines)
+
+def count_lines_stream(f, skip_empty=True, normalize=True):
+    return Counter(iter_lines(f, skip_empty=skip_empty, normalize=normalize))
+
+
+def count_lines_approx(file_paths, skip_empty=True, normalize=True, **sketch_opts):
+    """
+    Fixed-memory alternative to count_lines for high-cardinality input.
+    Returns an ApproxLineCounter (distinct estimate + top-K lines).
+    """
+    counts = ApproxLineCounter(**sketch_opts)
+    for path in file_paths:
+        with open_input(path, encoding="utf-8") as f:
+            counts.update(iter_lines(f, skip_empty=skip_empty, normalize=normalize))
+    return counts
+
+
+def count_lines_external(
+    file_paths, max_memory, skip_empty=True, normalize=True, tmp_dir=None
+):
+    """
+    Exact counts for inputs whose unique lines don't fit in RAM.
+    Returns ExternalLineCounts; its items() streams the merged runs.
+    """
+    counts = ExternalLineCounts(max_memory, tmp_dir=tmp_dir)
+    for path in file_paths:
+        with open_input(path, encoding="utf-8") as f:
+            counts.update(iter_lines(f, skip_empty=skip_empty, normalize=normalize))
+    return counts
+
+
+def count_lines_incremental(
+    file_path, checkpoint_path, skip_empty=True, normalize=True
+):
+    """
+    Count lines of an append-only file, reading only bytes added since the
+    last run. Counts and the file identity are kept in checkpoint_path; a
+    rotated, truncated or rewritten file is rescanned from the start.
+    A trailing line without a newline is left for the next run.
+    Returns (counts, start_offset, end_offset).
+    """
+    options = {"skip_empty": skip_empty, "normalize": normalize}
+    state = checkpoint.load_checkpoint(checkpoint_path)
+    start = checkpoint.resume_offset(state, file_path, options)
+    counts = Counter(dict(state["counts"])) if start else Counter()
+
+    end = checkpoint.last_line_end(file_path, os.path.getsize(file_path))
+    if end > start:
+        counts.update(
+            count_range(
+                partial(count_lines_stream, skip_empty=skip_empty, normalize=normalize),
+                file_path,
+                start,
+                end,
+            )
+        )
+    end = max(start, end)
+    checkpoint.save_checkpoint(
+        checkpoint_path, checkpoint.make_state(file_path, end, options, counts)
+    )
+    return counts, start, end
 
 
 def save_lines_count_to_csv(counts, output_path):
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
+    with open_output(output_path, newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["line", "count"])
         for line, cnt in counts.items():
@@ -77,12 +167,16 @@ def save_lines_count_to_csv(counts, output_path):
 
 
 # -------- CLI + main --------
-def parse_args():
+def parse_args(argv=None):
     p = argparse.ArgumentParser(
         description="Count unique lines in a text file and save counts to CSV."
     )
-    p.add_argument("input", help="Path to input text file")
-    p.add_argument("output", help="Path to output CSV file")
+    p.add_argument(
+        "inputs",
+        nargs="+",
+        help="Input text file(s) or s3://bucket/key; globs are expanded",
+    )
+    p.add_argument("output", help="Path to output CSV file (or s3://bucket/key)")
     p.add_argument("--skip-empty", action="store_true", help="Skip blank lines")
     p.add_argument(
         "--no-normalize",
@@ -90,18 +184,146 @@ def parse_args():
         action="store_false",
         help="Don't strip whitespace from lines",
     )
-    return p.parse_args()
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Count on N processes (splits large files, spreads many files)",
+    )
+    p.add_argument(
+        "--max-memory",
+        type=float,
+        metavar="MB",
+        help="Exact counting within MB of RAM: spill sorted runs to disk and "
+        "k-way merge them (output is sorted by line)",
+    )
+    p.add_argument(
+        "--tmp-dir", help="Directory for --max-memory run files (default: system temp)"
+    )
+    p.add_argument(
+        "--checkpoint",
+        help="Incremental mode: keep offset + counts in this file and only "
+        "read newly appended bytes on the next run",
+    )
+    approx = p.add_argument_group("approximate mode (fixed memory)")
+    approx.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Estimate distinct lines (HyperLogLog) and top-K lines (CMS + Space-Saving)",
+    )
+    approx.add_argument(
+        "--top-k", type=int, default=20, help="Number of top lines to report"
+    )
+    approx.add_argument(
+        "--epsilon",
+        type=float,
+        default=0.0005,
+        help="Count-Min error: overestimate <= epsilon * total lines",
+    )
+    approx.add_argument(
+        "--delta",
+        type=float,
+        default=0.01,
+        help="Count-Min failure probability for the epsilon bound",
+    )
+    approx.add_argument(
+        "--hll-precision",
+        type=int,
+        default=14,
+        help="HyperLogLog precision p (2**p registers, error ~1.04/sqrt(2**p))",
+    )
+    args = p.parse_args(argv)
+    # These modes count in this process only; don't let --workers look used
+    single = [
+        flag
+        for flag, on in (
+            ("--checkpoint", args.checkpoint),
+            ("--approximate", args.approximate),
+            ("--max-memory", args.max_memory),
+        )
+        if on
+    ]
+    if args.workers > 1 and single:
+        p.error(f"--workers can't be combined with {single[0]}")
+    return args
+
+
+def compute_counts(args, inputs):
+    if args.checkpoint:
+        if len(inputs) != 1 or is_s3_path(inputs[0]):
+            raise ValueError("--checkpoint works on a single local input file")
+        counts, start, end = count_lines_incremental(
+            inputs[0],
+            args.checkpoint,
+            skip_empty=args.skip_empty,
+            normalize=args.normalize,
+        )
+        logger.info(
+            "Incremental: %s from byte %d, read %d new bytes",
+            "resumed" if start else "full scan",
+            start,
+            end - start,
+        )
+        return counts
+    if args.approximate:
+        counts = count_lines_approx(
+            inputs,
+            skip_empty=args.skip_empty,
+            normalize=args.normalize,
+            top_k=args.top_k,
+            epsilon=args.epsilon,
+            delta=args.delta,
+            precision=args.hll_precision,
+        )
+        bounds = counts.error_bounds()
+        logger.info(
+            "Approximate: ~%d distinct lines (+/-%.2f%%), counts overestimate "
+            "by <= %.1f with %.0f%% confidence, sketch memory %.2f MB",
+            len(counts),
+            100 * bounds["distinct_relative_error"],
+            bounds["count_overestimate_max"],
+            100 * bounds["count_confidence"],
+            counts.memory_bytes() / 1e6,
+        )
+        return counts
+    if args.max_memory:
+        counts = count_lines_external(
+            inputs,
+            int(args.max_memory * 1024 * 1024),
+            skip_empty=args.skip_empty,
+            normalize=args.normalize,
+            tmp_dir=args.tmp_dir,
+        )
+        logger.info(
+            "Memory budget %.1f MB: spilled %d sorted runs to disk",
+            args.max_memory,
+            counts.spills,
+        )
+        return counts
+    if args.workers > 1 or len(inputs) > 1:
+        return count_parallel(
+            inputs,
+            count_lines_stream,
+            args.workers,
+            skip_empty=args.skip_empty,
+            normalize=args.normalize,
+        )
+    return count_lines(inputs[0], skip_empty=args.skip_empty, normalize=args.normalize)
 
 
 def main():
     args = parse_args()
+    setup_logging()
     start = time.time()
-    logger.info("Starting line_count run: input=%s output=%s", args.input, args.output)
+    logger.info(
+        "Starting line_count run: input=%s output=%s workers=%d",
+        args.inputs,
+        args.output,
+        args.workers,
+    )
 
     try:
-        counts = count_lines(
-            args.input, skip_empty=args.skip_empty, normalize=args.normalize
-        )
+        counts = compute_counts(args, expand_inputs(args.inputs))
         save_lines_count_to_csv(counts, args.output)
         duration = time.time() - start
         logger.info(
@@ -114,7 +336,7 @@ def main():
         top5 = counts.most_common(5)
         logger.debug("Top 5 lines: %s", top5)
     except FileNotFoundError as e:
-        logger.error("Input file not found: %s", args.input)
+        logger.error("Input file not found: %s", e.filename or e)
         logger.debug("Exception details:", exc_info=True)
         sys.exit(2)
     except Exception:
@@ -0,0 +1,97 @@
+"""
+Queue-based logging backend shared by Day1's setup_logging and Day2's
+utils.logger (which loads this file): loggers only enqueue records, one
+background listener formats them and writes in batches.
+"""
+
+import os
+import gzip
+import shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+def gzip_namer(name):
+    return name + ".gz"
+
+
+def gzip_rotator(source, dest):
+    # Runs on the listener thread, so callers never wait for compression
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that leaves records in the file buffer instead of
+    flushing after each one. The listener calls drain() whenever the queue
+    runs empty, so bursts become a few large writes.
+
+    The file size is tracked here rather than asked from the file: the
+    stdlib rollover check seeks to the end of the stream (which flushes it)
+    and formats the record a second time, on every record.
+    """
+
+    def __init__(self, filename, compress=False, **kwargs):
+        super().__init__(filename, **kwargs)
+        if compress:
+            self.namer = gzip_namer
+            self.rotator = gzip_rotator
+        try:
+            self._size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._size = 0
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.encoding or "utf-8", "replace"))
+            if self.maxBytes > 0 and self._size and self._size + size > self.maxBytes:
+                self.doRollover()
+                self._size = 0
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self._size += size
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        super().flush()
+
+
+class InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler for a thread (not process) queue: the record is handed over
+    as is, so message formatting and record copying happen on the listener
+    thread instead of in the caller. Log arguments are formatted later, so
+    don't mutate objects right after passing them to a log call.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers each time the queue drains."""
+
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            self.flush()
+        return self.queue.get(block)
+
+    def flush(self):
+        for handler in self.handlers:
+            try:
+                getattr(handler, "drain", handler.flush)()
+            except (OSError, ValueError):
+                pass  # stream already closed at exit, as in logging.shutdown
+
+    def stop(self):
+        super().stop()
+        self.flush()
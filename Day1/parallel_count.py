@@ -0,0 +1,159 @@
+import io
+import os
+import glob
+from collections import Counter
+from functools import partial
+
+from s3_io import is_s3_path, open_input
+
+# Files smaller than this are never split into byte ranges
+MIN_SPLIT_BYTES = 8 * 1024 * 1024
+# Ranges per worker, so a slow range does not leave the other cores idle
+RANGES_PER_WORKER = 4
+
+
+def expand_inputs(patterns):
+    """Expand globs into a sorted, de-duplicated list of file paths."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def _next_line_start(f, offset):
+    """Return the offset just after the first newline at or after offset."""
+    f.seek(offset)
+    while True:
+        block = f.read(64 * 1024)
+        if not block:
+            return f.tell()
+        idx = block.find(b"\n")
+        if idx != -1:
+            return offset + idx + 1
+        offset += len(block)
+
+
+def byte_ranges(path, parts):
+    """
+    Split a file into at most `parts` (start, end) byte ranges.
+    Every range starts at the beginning of a line, so no line, word or
+    multi-byte UTF-8 character is ever cut in half.
+    """
+    size = os.path.getsize(path)
+    if parts <= 1 or size == 0:
+        return [(0, size)]
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        for i in range(1, parts):
+            if start >= size:
+                break
+            end = _next_line_start(f, max(start, size * i // parts - 1))
+            if end > start:
+                ranges.append((start, min(end, size)))
+                start = end
+        if start < size:
+            ranges.append((start, size))
+    return ranges
+
+
+class _RangeReader(io.RawIOBase):
+    """Raw reader limited to the bytes [start, end) of a file."""
+
+    def __init__(self, path, start, end):
+        self._f = open(path, "rb")
+        self._f.seek(start)
+        self._left = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._left <= 0:
+            return 0
+        n = self._f.readinto(memoryview(b)[: min(len(b), self._left)])
+        self._left -= n
+        return n
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+def count_range(count_stream, path, start, end):
+    """
+    Run count_stream over one byte range of a file, decoded as text.
+    end=None means the whole input, which may be an s3:// object.
+    """
+    if end is None:
+        with open_input(path, encoding="utf-8") as f:
+            return count_stream(f)
+    raw = _RangeReader(path, start, end)
+    with io.TextIOWrapper(io.BufferedReader(raw), encoding="utf-8") as f:
+        return count_stream(f)
+
+
+def merge_counters(counters):
+    """
+    Merge counters in order into the first one, in this process.
+    Shipping partial counters back to the pool to merge them would pickle
+    every key twice more for no gain, since a merge is a single update().
+    Merging in job order keeps first-seen key order (and therefore the CSV
+    row order) the same as a serial pass.
+    """
+    merged = None
+    for counter in counters:
+        if merged is None:
+            merged = counter
+        else:
+            merged.update(counter)
+    return merged if merged is not None else Counter()
+
+
+def plan_jobs(paths, workers):
+    """
+    Turn input files into (path, start, end) jobs of roughly equal size.
+    S3 objects are one job each: their reads are already concurrent.
+    """
+    local = [p for p in paths if not is_s3_path(p)]
+    total = sum(os.path.getsize(p) for p in local)
+    target = max(MIN_SPLIT_BYTES, total // max(1, workers * RANGES_PER_WORKER))
+    jobs = []
+    for path in paths:
+        if is_s3_path(path):
+            jobs.append((path, 0, None))
+            continue
+        parts = max(1, -(-os.path.getsize(path) // target))
+        jobs.extend((path, start, end) for start, end in byte_ranges(path, parts))
+    return jobs
+
+
+def count_parallel(inputs, count_stream, workers=None, **kwargs):
+    """
+    Count over files/globs on a process pool.
+
+    count_stream(f, **kwargs) must count an open text stream and return a
+    Counter (e.g. word_count.count_words_stream). Large files are split
+    into newline-aligned byte ranges, many files are spread over the
+    pool, and the partial counters are merged as they come back.
+    """
+    paths = expand_inputs(inputs)
+    for path in paths:
+        if not is_s3_path(path) and not os.path.isfile(path):
+            raise FileNotFoundError(path)
+    workers = workers or os.cpu_count() or 1
+    fn = partial(count_range, partial(count_stream, **kwargs))
+    jobs = plan_jobs(paths, workers)
+
+    if workers <= 1 or len(jobs) <= 1:
+        return merge_counters(fn(*job) for job in jobs)
+
+    from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        # map() yields in job order; each partial is merged and dropped as
+        # soon as it arrives instead of holding them all
+        return merge_counters(pool.map(fn, *zip(*jobs)))
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+import resource
+from contextlib import contextmanager
+
+from s3_io import input_size
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+@contextmanager
+def measure(input_paths):
+    """
+    Time the enclosed block and collect stats for the given input file(s).
+    Yields a dict that is filled with seconds, mb, mb_per_s and peak_rss_mb
+    once the block exits.
+    """
+    if isinstance(input_paths, (str, os.PathLike)):
+        input_paths = [input_paths]
+    stats = {}
+    start = time.perf_counter()
+    yield stats
+    elapsed = time.perf_counter() - start
+    size_mb = sum(input_size(p) for p in input_paths) / (1024 * 1024)
+    stats["seconds"] = elapsed
+    stats["mb"] = size_mb
+    stats["mb_per_s"] = size_mb / elapsed if elapsed > 0 else float("inf")
+    stats["peak_rss_mb"] = peak_rss_mb()
+
+
+def format_stats(stats):
+    return (
+        f"{stats['mb']:.1f} MB in {stats['seconds']:.2f}s "
+        f"({stats['mb_per_s']:.1f} MB/s), peak RSS {stats['peak_rss_mb']:.1f} MB"
+    )
@@ -0,0 +1,289 @@
+"""
+s3://bucket/key paths as plain file objects, so the counters read S3
+objects and write their CSVs back without a local copy.
+
+Reads are ranged GETs of PART_SIZE, WORKERS of them in flight ahead of the
+reader, handed over in order; .gz / .zst objects are decompressed on the
+fly. Writes go out as a multipart upload while they are produced (a
+single PUT if the output stays under one part). Local paths fall through
+to open(). boto3 is only imported once an s3:// path is used.
+Day2's utils/s3_io.py loads this same file, so keep it self-contained.
+"""
+
+import io
+import os
+import gzip
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+PART_SIZE = 8 * 1024 * 1024  # bytes per ranged GET / uploaded part
+WORKERS = 4  # ranged GETs in flight / parts uploading at once
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _forget_client():
+    global _client
+    _client = None  # a client's connections can't be shared with a forked child
+
+
+os.register_at_fork(after_in_child=_forget_client)
+
+
+def is_s3_path(path):
+    return isinstance(path, str) and path.startswith("s3://")
+
+
+def split_s3_path(path):
+    bucket, _, key = path[len("s3://") :].partition("/")
+    if not bucket or not key:
+        raise ValueError(f"Expected s3://bucket/key, got {path}")
+    return bucket, key
+
+
+def get_client():
+    """One S3 client per process, shared by every read and write."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import boto3
+            from botocore.config import Config
+
+            _client = boto3.client(
+                "s3", config=Config(max_pool_connections=2 * WORKERS)
+            )
+        return _client
+
+
+def input_size(path):
+    """Size in bytes of a local file or an S3 object (as stored)."""
+    if not is_s3_path(path):
+        return os.path.getsize(path)
+    bucket, key = split_s3_path(path)
+    return get_client().head_object(Bucket=bucket, Key=key)["ContentLength"]
+
+
+class RangedReader(io.RawIOBase):
+    """
+    Raw stream over one S3 object. Up to `workers` ranged GETs run ahead of
+    the reader, so at most workers * part_size bytes are held at a time.
+    Every range is pinned to the ETag seen at open: if the object is
+    replaced mid-read the next GET fails instead of mixing two versions.
+    """
+
+    def __init__(self, bucket, key, part_size=PART_SIZE, workers=WORKERS):
+        self._client = get_client()
+        self.bucket, self.key = bucket, key
+        head = self._client.head_object(Bucket=bucket, Key=key)
+        self.size, self._etag = head["ContentLength"], head["ETag"]
+        self.content_encoding = head.get("ContentEncoding", "")
+        self._part_size = part_size
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = deque()
+        self._next = 0
+        self._buf, self._pos = b"", 0
+        for _ in range(workers):
+            self._schedule()
+
+    def _schedule(self):
+        if self._next >= self.size:
+            return
+        start, end = self._next, min(self.size, self._next + self._part_size) - 1
+        self._next = end + 1
+        self._pending.append(self._pool.submit(self._fetch, start, end))
+
+    def _fetch(self, start, end):
+        resp = self._client.get_object(
+            Bucket=self.bucket,
+            Key=self.key,
+            Range=f"bytes={start}-{end}",
+            IfMatch=self._etag,
+        )
+        return resp["Body"].read()
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._pos >= len(self._buf):
+            if not self._pending:
+                return 0
+            self._buf, self._pos = self._pending.popleft().result(), 0
+            self._schedule()
+        n = min(len(b), len(self._buf) - self._pos)
+        b[:n] = self._buf[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pending.clear()
+        super().close()
+
+
+class MultipartWriter(io.RawIOBase):
+    """
+    Raw writable stream into one S3 object. Every full part is uploaded in
+    the background (at most `workers` at once, so memory stays bounded);
+    close() sends the rest and completes the upload, abort() discards it.
+    Output smaller than one part is sent with a single PUT instead.
+    """
+
+    def __init__(self, bucket, key, part_size=PART_SIZE, workers=WORKERS):
+        self._client = get_client()
+        self.bucket, self.key = bucket, key
+        self._part_size = part_size
+        self._buf = bytearray()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers)
+        self._parts = []  # futures of (PartNumber, ETag), in order
+        self._upload_id = None
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._buf += b
+        while len(self._buf) >= self._part_size:
+            self._send(bytes(self._buf[: self._part_size]))
+            del self._buf[: self._part_size]
+        return len(b)
+
+    def _send(self, data):
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key
+            )["UploadId"]
+        number = len(self._parts) + 1
+        self._slots.acquire()
+        self._parts.append(self._pool.submit(self._upload_part, number, data))
+
+    def _upload_part(self, number, data):
+        try:
+            resp = self._client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                PartNumber=number,
+                Body=data,
+            )
+            return {"PartNumber": number, "ETag": resp["ETag"]}
+        finally:
+            self._slots.release()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._client.put_object(
+                    Bucket=self.bucket, Key=self.key, Body=bytes(self._buf)
+                )
+            else:
+                if self._buf or not self._parts:
+                    self._send(bytes(self._buf))
+                parts = [future.result() for future in self._parts]
+                self._client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._pool.shutdown()
+            super().close()
+
+    def abort(self):
+        """Drop everything written so far; nothing appears in the bucket."""
+        if self.closed:
+            return
+        self._pool.shutdown(cancel_futures=True)
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+        super().close()
+
+
+def _zstd():
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "Reading .zst objects needs zstandard: pip install zstandard"
+            ) from None
+        return zstandard
+    return zstd
+
+
+def _decompressed(raw, key, content_encoding=""):
+    if key.endswith(".gz") or content_encoding == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if key.endswith(".zst"):
+        zstd = _zstd()
+        if hasattr(zstd, "ZstdDecompressor"):  # zstandard
+            return io.BufferedReader(zstd.ZstdDecompressor().stream_reader(raw))
+        return zstd.ZstdFile(raw, mode="rb")
+    return raw
+
+
+@contextmanager
+def open_input(path, mode="r", encoding="utf-8", newline=None, **s3_options):
+    """
+    open() for reading that also takes s3://bucket/key (text or "rb").
+    s3_options: part_size, workers.
+    """
+    if not is_s3_path(path):
+        with open(
+            path, mode, encoding=None if "b" in mode else encoding, newline=newline
+        ) as f:
+            yield f
+        return
+    raw = RangedReader(*split_s3_path(path), **s3_options)
+    try:
+        stream = _decompressed(
+            io.BufferedReader(raw, PART_SIZE), raw.key, raw.content_encoding
+        )
+        if "b" not in mode:
+            stream = io.TextIOWrapper(stream, encoding=encoding, newline=newline)
+        yield stream
+    finally:
+        raw.close()
+
+
+@contextmanager
+def open_output(path, mode="w", encoding="utf-8", newline=None, **s3_options):
+    """
+    open() for writing that also takes s3://bucket/key; a .gz key is
+    gzip-compressed on the way. If the block raises, the upload is aborted
+    and no object is created. s3_options: part_size, workers.
+    """
+    if not is_s3_path(path):
+        with open(
+            path, mode, encoding=None if "b" in mode else encoding, newline=newline
+        ) as f:
+            yield f
+        return
+    raw = MultipartWriter(*split_s3_path(path), **s3_options)
+    try:
+        buffered = stream = io.BufferedWriter(raw, 1024 * 1024)
+        if raw.key.endswith(".gz"):
+            stream = gzip.GzipFile(fileobj=stream, mode="wb")
+        if "b" not in mode:
+            stream = io.TextIOWrapper(stream, encoding=encoding, newline=newline)
+        yield stream
+        stream.close()  # GzipFile leaves its fileobj open
+        buffered.close()
+    except BaseException:
+        raw.abort()
+        raise
@@ -0,0 +1,169 @@
+import math
+import heapq
+from array import array
+from hashlib import blake2b
+
+MASK64 = (1 << 64) - 1
+
+
+def hash_pair(item):
+    """Two independent 64-bit hashes of a string."""
+    digest = blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class HyperLogLog:
+    """Distinct-count estimator using 2**precision one-byte registers."""
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self._rest_bits = 64 - precision
+
+    def add_hash(self, h):
+        idx = h >> self._rest_bits
+        rest = h & ((1 << self._rest_bits) - 1)
+        rank = self._rest_bits - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def add(self, item):
+        self.add_hash(hash_pair(item)[0])
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(self.m)
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting for small sets
+        return raw
+
+
+class CountMinSketch:
+    """
+    Frequency estimator: estimate(x) >= true count, and with probability
+    1 - delta it overshoots by at most epsilon * total.
+    """
+
+    def __init__(self, epsilon=0.0005, delta=0.01):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.rows = [array("Q", bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0
+
+    def _columns(self, h1, h2):
+        return [((h1 + i * h2) & MASK64) % self.width for i in range(self.depth)]
+
+    def add_hash(self, h1, h2, count=1):
+        self.total += count
+        for row, col in zip(self.rows, self._columns(h1, h2)):
+            row[col] += count
+
+    def estimate_hash(self, h1, h2):
+        return min(row[col] for row, col in zip(self.rows, self._columns(h1, h2)))
+
+    def estimate(self, item):
+        return self.estimate_hash(*hash_pair(item))
+
+    @property
+    def error_bound(self):
+        return self.epsilon * self.total
+
+
+class SpaceSaving:
+    """
+    Heavy-hitter tracker with a fixed number of counters. A tracked item's
+    true count lies in [count - error, count].
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self._heap = []  # (count, item); entries may lag behind counts
+
+    def add(self, item):
+        if item in self.counts:
+            self.counts[item] += 1
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[item] = 1
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (1, item))
+            return
+        # Evict the current minimum; stale heap entries are refreshed lazily
+        while True:
+            cnt, victim = heapq.heappop(self._heap)
+            if self.counts[victim] == cnt:
+                break
+            heapq.heappush(self._heap, (self.counts[victim], victim))
+        del self.counts[victim]
+        del self.errors[victim]
+        self.counts[item] = cnt + 1
+        self.errors[item] = cnt
+        heapq.heappush(self._heap, (cnt + 1, item))
+
+    def top(self, k):
+        return heapq.nlargest(k, self.counts.items(), key=lambda kv: kv[1])
+
+
+class ApproxLineCounter:
+    """
+    Fixed-memory stand-in for Counter(lines): HyperLogLog for the number of
+    distinct lines, Space-Saving for top-K candidates and Count-Min Sketch
+    to tighten their counts. Supports len(), most_common() and items() so
+    it can be logged and saved like the exact Counter.
+    """
+
+    def __init__(self, top_k=20, epsilon=0.0005, delta=0.01, precision=14):
+        self.top_k = top_k
+        self.hll = HyperLogLog(precision)
+        self.cms = CountMinSketch(epsilon, delta)
+        self.heavy = SpaceSaving(max(10 * top_k, 1000))
+
+    def add(self, line):
+        h1, h2 = hash_pair(line)
+        self.hll.add_hash(h1)
+        self.cms.add_hash(h1, h2)
+        self.heavy.add(line)
+
+    def update(self, lines):
+        for line in lines:
+            self.add(line)
+
+    def __len__(self):
+        return round(self.hll.estimate())
+
+    def most_common(self, n=None):
+        n = self.top_k if n is None else n
+        candidates = self.heavy.top(max(n, self.top_k))
+        refined = [
+            (line, min(cnt, self.cms.estimate(line))) for line, cnt in candidates
+        ]
+        refined.sort(key=lambda kv: kv[1], reverse=True)
+        return refined[:n]
+
+    def items(self):
+        return self.most_common(self.top_k)
+
+    def memory_bytes(self):
+        cms = self.cms.depth * self.cms.width * 8
+        return self.hll.m + cms
+
+    def error_bounds(self):
+        return {
+            "distinct_relative_error": self.hll.relative_error,
+            "count_overestimate_max": self.cms.error_bound,
+            "count_confidence": 1 - self.cms.delta,
+            "total_lines": self.cms.total,
+        }
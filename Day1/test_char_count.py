@@ -0,0 +1,52 @@
+# test_char_count.py
+import pytest
+from collections import Counter
+from char_count import (
+    count_characters,
+    count_characters_fast,
+    count_characters_streaming,
+    save_char_count_to_csv,
+)
+
+pytest.importorskip("numpy")
+
+INPUTS = {
+    "ascii": ("The Quick brown FOX, 42 times!\n" * 50, "utf-8", "\n"),
+    "crlf": ("line one\r\nLINE two\r\n\r\nlone cr\rend", "utf-8", ""),
+    "cr only": ("a\rb\rC\r", "utf-8", ""),
+    "latin-1": ("Ça coûte 5 £, ÉTÉ à Zürich\n" * 20, "latin-1", "\n"),
+    "utf-8": ("Σίσυφος ΣΊΣΥΦΟΣ naïve €uro\n" * 20, "utf-8", "\n"),
+    "empty": ("", "utf-8", "\n"),
+}
+
+
+def csv_of(counts, path):
+    save_char_count_to_csv(counts, str(path))
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("name", list(INPUTS))
+def test_fast_path_writes_the_same_csv(tmp_path, name):
+    text, encoding, newline = INPUTS[name]
+    path = tmp_path / "input.txt"
+    path.write_text(text, encoding=encoding, newline=newline)
+
+    if encoding == "utf-8":
+        expected = count_characters(str(path))
+    else:  # count_characters itself only reads UTF-8
+        expected = Counter(path.read_text(encoding=encoding).lower())
+    fast = count_characters_fast(str(path), encoding=encoding)
+    assert fast == expected
+    assert csv_of(fast, tmp_path / "fast.csv") == csv_of(expected, tmp_path / "ref.csv")
+
+
+def test_multi_byte_input_falls_back_to_streaming(tmp_path, monkeypatch):
+    path = tmp_path / "input.txt"
+    path.write_text("naïve ΣΊΣΥΦΟΣ\n", encoding="utf-8")
+    calls = []
+    monkeypatch.setattr(
+        "char_count.count_characters_streaming",
+        lambda *a: calls.append(a) or count_characters_streaming(*a),
+    )
+    assert count_characters_fast(str(path)) == count_characters(str(path))
+    assert len(calls) == 1
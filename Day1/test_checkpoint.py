@@ -0,0 +1,85 @@
+# test_checkpoint.py
+import os
+from collections import Counter
+import checkpoint
+import line_count_with_logging as lc
+
+
+def write(path, text, mode="w"):
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def test_resume_reads_only_appended_lines(tmp_path):
+    log, ckpt = tmp_path / "app.log", tmp_path / "app.ckpt"
+    write(log, "a\nb\na\n")
+    counts, start, end = lc.count_lines_incremental(log, ckpt)
+    assert (counts, start, end) == (Counter({"a": 2, "b": 1}), 0, 6)
+
+    # A trailing line without a newline waits for the next run
+    write(log, "c\npart", mode="a")
+    counts, start, end = lc.count_lines_incremental(log, ckpt)
+    assert (start, end) == (6, 8)
+    assert counts == Counter({"a": 2, "b": 1, "c": 1})
+
+    write(log, "ial\n", mode="a")
+    counts, start, _ = lc.count_lines_incremental(log, ckpt)
+    assert start == 8
+    assert counts == Counter({"a": 2, "b": 1, "c": 1, "partial": 1})
+
+
+def test_truncated_file_is_rescanned(tmp_path):
+    log, ckpt = tmp_path / "app.log", tmp_path / "app.ckpt"
+    write(log, "a\nb\nc\n")
+    lc.count_lines_incremental(log, ckpt)
+
+    write(log, "x\n")  # truncated and rewritten in place
+    counts, start, end = lc.count_lines_incremental(log, ckpt)
+    assert (counts, start, end) == (Counter({"x": 1}), 0, 2)
+
+
+def test_rewritten_head_is_rescanned(tmp_path):
+    log, ckpt = tmp_path / "app.log", tmp_path / "app.ckpt"
+    write(log, "a\nb\n")
+    lc.count_lines_incremental(log, ckpt)
+
+    with open(log, "r+b") as f:  # same inode and a larger size
+        f.write(b"z\nb\nq\n")
+    counts, start, _ = lc.count_lines_incremental(log, ckpt)
+    assert start == 0
+    assert counts == Counter({"z": 1, "b": 1, "q": 1})
+
+
+def test_rotated_file_is_rescanned(tmp_path):
+    log, ckpt = tmp_path / "app.log", tmp_path / "app.ckpt"
+    write(log, "a\nb\n")
+    lc.count_lines_incremental(log, ckpt)
+
+    # logrotate: move the old file away, start a new one at the same path
+    os.rename(log, tmp_path / "app.log.1")
+    write(log, "a\nb\nc\n")
+    counts, start, _ = lc.count_lines_incremental(log, ckpt)
+    assert start == 0
+    assert counts == Counter({"a": 1, "b": 1, "c": 1})
+
+
+def test_changed_options_rescan(tmp_path):
+    log, ckpt = tmp_path / "app.log", tmp_path / "app.ckpt"
+    write(log, " a \n\n")
+    lc.count_lines_incremental(log, ckpt)
+
+    counts, start, _ = lc.count_lines_incremental(log, ckpt, normalize=False)
+    assert start == 0
+    assert counts == Counter({" a ": 1})
+
+
+def test_unreadable_or_outdated_checkpoint_is_ignored(tmp_path):
+    ckpt = tmp_path / "app.ckpt"
+    write(ckpt, "not gzip")
+    assert checkpoint.load_checkpoint(ckpt) is None
+
+    checkpoint.save_checkpoint(ckpt, {"offset": 3})
+    assert checkpoint.load_checkpoint(ckpt)["offset"] == 3
+    checkpoint.save_checkpoint(ckpt, {"offset": 3, "version": 1})
+    assert not list(tmp_path.glob("*.tmp"))
+    assert checkpoint.load_checkpoint(tmp_path / "missing.ckpt") is None
@@ -0,0 +1,48 @@
+# test_external_count.py
+import os
+import random
+from collections import Counter
+import external_count
+from external_count import ExternalLineCounts
+
+
+def sample_lines(n=5_000, distinct=800, seed=3):
+    rng = random.Random(seed)
+    # Tabs and non-ASCII text must survive the run files unchanged
+    return [f"line\t{rng.randrange(distinct)} é" for _ in range(n)]
+
+
+def test_spilled_counts_match_counter(tmp_path):
+    lines = sample_lines()
+    counts = ExternalLineCounts(max_memory=4_000, tmp_dir=tmp_path)
+    counts.update(lines)
+    assert counts.spills > 1
+
+    items = list(counts.items())
+    assert items == sorted(Counter(lines).items())
+    assert len(counts) == len(set(lines))
+    exact = Counter(lines)
+    top = counts.most_common(5)
+    # Ties may pick different lines; the counts must match exactly
+    assert [cnt for _, cnt in top] == [cnt for _, cnt in exact.most_common(5)]
+    assert all(exact[line] == cnt for line, cnt in top)
+    assert os.listdir(tmp_path) == []  # run files are cleaned up
+
+
+def test_multi_pass_merge(tmp_path, monkeypatch):
+    monkeypatch.setattr(external_count, "MERGE_FAN_IN", 3)
+    lines = sample_lines(n=3_000)
+    counts = ExternalLineCounts(max_memory=2_000, tmp_dir=tmp_path)
+    counts.update(lines)
+    assert counts.spills > 9  # at least two merge passes
+
+    assert dict(counts.items()) == Counter(lines)
+
+
+def test_fits_in_memory_without_spilling(tmp_path):
+    lines = sample_lines(n=200, distinct=10)
+    counts = ExternalLineCounts(max_memory=10_000_000, tmp_dir=tmp_path)
+    counts.update(lines)
+
+    assert dict(counts.items()) == Counter(lines)
+    assert counts.spills == 0
@@ -0,0 +1,17 @@
+# test_line_count_with_logging.py
+import pytest
+from line_count_with_logging import parse_args
+
+
+@pytest.mark.parametrize(
+    "mode", [["--checkpoint", "c.ckpt"], ["--approximate"], ["--max-memory", "64"]]
+)
+def test_workers_are_rejected_with_single_process_modes(mode, capsys):
+    assert parse_args(["in.txt", "out.csv", *mode]).workers == 1
+    with pytest.raises(SystemExit):
+        parse_args(["in.txt", "out.csv", "--workers", "4", *mode])
+    assert f"--workers can't be combined with {mode[0]}" in capsys.readouterr().err
+
+
+def test_workers_alone_are_accepted():
+    assert parse_args(["a.txt", "b.txt", "out.csv", "--workers", "4"]).workers == 4
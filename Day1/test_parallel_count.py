@@ -0,0 +1,66 @@
+# test_parallel_count.py
+import random
+import pytest
+from collections import Counter
+import parallel_count
+from parallel_count import byte_ranges, count_parallel, expand_inputs, plan_jobs
+from word_count import count_words, count_words_stream
+from char_count import count_characters, count_characters_stream
+
+WORDS = ["alpha", "Beta", "γάμμα", "ΣΊΣΥΦΟΣ", "naïve", "x", "€uro"]
+
+
+def write_text(path, lines, seed):
+    rng = random.Random(seed)
+    text = "".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randrange(0, 12))) + "\n"
+        for _ in range(lines)
+    )
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def small_splits(monkeypatch):
+    # Real inputs are split from 8 MB up; split these few KB instead
+    monkeypatch.setattr(parallel_count, "MIN_SPLIT_BYTES", 512)
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 7, 50, 10_000])
+def test_byte_ranges_are_line_aligned_and_cover_the_file(tmp_path, parts):
+    path = write_text(tmp_path / "a.txt", 300, seed=parts)
+    data = path.read_bytes()
+    ranges = byte_ranges(str(path), parts)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert all(data[start - 1 : start] == b"\n" for start, _ in ranges[1:])
+    assert len(ranges) <= parts
+
+
+def test_parallel_matches_single_process(tmp_path, small_splits):
+    path = write_text(tmp_path / "a.txt", 2_000, seed=1)
+    jobs = plan_jobs([str(path)], workers=3)
+    assert len(jobs) > 3  # several ranges per worker
+
+    for count, count_stream in (
+        (count_words, count_words_stream),
+        (count_characters, count_characters_stream),
+    ):
+        expected = count(str(path))
+        for workers in (1, 3):
+            result = count_parallel([str(path)], count_stream, workers=workers)
+            assert result == expected
+            assert list(result) == list(expected)  # same CSV row order
+
+
+def test_many_files_and_globs(tmp_path, small_splits):
+    paths = [write_text(tmp_path / f"part{i}.txt", 200 * i, seed=i) for i in range(4)]
+    (tmp_path / "empty.txt").write_text("")
+    expected = sum((count_words(str(p)) for p in paths), Counter())
+    assert count_parallel([str(tmp_path / "*.txt")], count_words_stream, workers=2) == (
+        expected
+    )
+    assert expand_inputs([str(tmp_path / "part*.txt")]) == sorted(map(str, paths))
+
+    with pytest.raises(FileNotFoundError):
+        count_parallel([str(tmp_path / "missing.txt")], count_words_stream)
@@ -0,0 +1,113 @@
+# test_s3_io.py
+import io
+import gzip
+import boto3
+import pytest
+from moto import mock_aws
+import s3_io
+from s3_io import open_input, open_output
+from word_count import (
+    count_words,
+    count_words_stream,
+    count_words_streaming,
+    save_words_count_to_csv,
+)
+from char_count import count_characters, count_characters_fast
+from parallel_count import count_parallel
+
+MB = 1024 * 1024
+BUCKET = "bucket-in"
+TEXT = "Σίσυφος rolls the stone\nthe stone rolls back ΣΊΣΥΦΟΣ\n" * 20_000
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setattr(s3_io, "_client", None)
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def test_counters_read_s3_objects(s3, tmp_path):
+    local = tmp_path / "input.txt"
+    local.write_text(TEXT, encoding="utf-8")
+    s3.put_object(Bucket=BUCKET, Key="input.txt", Body=TEXT.encode())
+    s3.put_object(Bucket=BUCKET, Key="input.txt.gz", Body=gzip.compress(TEXT.encode()))
+
+    expected = count_words(str(local))
+    assert count_words("s3://bucket-in/input.txt") == expected
+    assert (
+        count_words_streaming("s3://bucket-in/input.txt.gz", chunk_size=1000)
+        == expected
+    )
+    assert count_characters("s3://bucket-in/input.txt") == count_characters(str(local))
+    assert count_characters_fast("s3://bucket-in/input.txt") == count_characters(
+        str(local)
+    )
+    assert count_parallel(
+        ["s3://bucket-in/input.txt", str(local)], count_words_stream
+    ) == (expected + expected)
+
+
+def test_zstd_objects_are_decompressed(s3):
+    zstandard = pytest.importorskip("zstandard")
+    s3.put_object(
+        Bucket=BUCKET,
+        Key="input.txt.zst",
+        Body=zstandard.ZstdCompressor().compress(TEXT.encode()),
+    )
+    with open_input("s3://bucket-in/input.txt.zst") as f:
+        assert f.read() == TEXT
+
+
+def test_ranged_reads_cross_part_boundaries(s3, monkeypatch):
+    # Small parts: many ranges, and multi-byte characters cut between them
+    data = TEXT.encode()
+    s3.put_object(Bucket=BUCKET, Key="k", Body=data)
+    ranges = []
+    client = s3_io.get_client()
+    real_get_object = client.get_object
+    monkeypatch.setattr(
+        client,
+        "get_object",
+        lambda **kw: ranges.append(kw["Range"]) or real_get_object(**kw),
+    )
+    with open_input("s3://bucket-in/k", part_size=1001, workers=3) as f:
+        assert f.read() == TEXT
+    assert len(ranges) == -(-len(data) // 1001)
+
+
+def test_output_streams_as_multipart_upload(s3):
+    with open_output("s3://bucket-in/out.csv", newline="", part_size=5 * MB) as f:
+        for i in range(800_000):
+            f.write(f"line {i:08d}\n")  # 11.2 MB: two full parts and a tail
+    head = s3.head_object(Bucket=BUCKET, Key="out.csv")
+    assert head["ETag"].endswith('-3"')
+    body = s3.get_object(Bucket=BUCKET, Key="out.csv")["Body"].read().decode()
+    assert body.splitlines()[-1] == "line 00799999"
+
+
+def test_small_gzip_output_and_csv(s3):
+    save_words_count_to_csv(
+        count_words_stream(io.StringIO("a b a")), "s3://bucket-in/w.csv"
+    )
+    assert s3.get_object(Bucket=BUCKET, Key="w.csv")["Body"].read() == (
+        b"word,count\r\na,2\r\nb,1\r\n"
+    )
+    with open_output("s3://bucket-in/w.txt.gz") as f:
+        f.write("zipped")
+    with open_input("s3://bucket-in/w.txt.gz") as f:
+        assert f.read() == "zipped"
+
+
+def test_failed_output_leaves_nothing_behind(s3):
+    with pytest.raises(RuntimeError):
+        with open_output("s3://bucket-in/partial.txt", part_size=5 * MB) as f:
+            f.write("x" * (6 * MB))
+            raise RuntimeError("boom")
+    assert "Contents" not in s3.list_objects_v2(Bucket=BUCKET)
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
@@ -0,0 +1,74 @@
+# test_sketches.py
+import random
+from collections import Counter
+from sketches import (
+    ApproxLineCounter,
+    CountMinSketch,
+    HyperLogLog,
+    SpaceSaving,
+    hash_pair,
+)
+
+
+def zipf_lines(n, distinct, seed=7):
+    """n lines over `distinct` values, a few of them very frequent."""
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(distinct)]
+    return [f"line {i}" for i in rng.choices(range(distinct), weights, k=n)]
+
+
+def test_hyperloglog_within_error_bound():
+    hll = HyperLogLog(precision=12)
+    for i in range(50_000):
+        hll.add(f"user-{i}")
+    # 4 standard errors: fails far less than once in 10k runs
+    assert abs(hll.estimate() - 50_000) <= 4 * hll.relative_error * 50_000
+
+
+def test_hyperloglog_small_sets_are_exact_enough():
+    hll = HyperLogLog(precision=14)
+    for i in range(100):
+        hll.add(str(i % 50))
+    assert round(hll.estimate()) in range(49, 52)
+
+
+def test_count_min_never_underestimates_and_respects_epsilon():
+    lines = zipf_lines(20_000, 2_000)
+    exact = Counter(lines)
+    cms = CountMinSketch(epsilon=0.001, delta=0.01)
+    for line in lines:
+        cms.add_hash(*hash_pair(line))
+
+    overshoots = [cms.estimate(line) - cnt for line, cnt in exact.items()]
+    assert min(overshoots) >= 0
+    over_bound = sum(o > cms.error_bound for o in overshoots)
+    assert over_bound <= cms.delta * len(exact)
+
+
+def test_space_saving_count_brackets_true_count():
+    lines = zipf_lines(20_000, 5_000)
+    exact = Counter(lines)
+    ss = SpaceSaving(capacity=200)
+    for line in lines:
+        ss.add(line)
+
+    assert len(ss.counts) == 200
+    for line, cnt in ss.counts.items():
+        assert cnt - ss.errors[line] <= exact[line] <= cnt
+
+
+def test_approx_counter_finds_heavy_hitters():
+    lines = zipf_lines(30_000, 10_000)
+    exact = Counter(lines)
+    approx = ApproxLineCounter(top_k=5, epsilon=0.001)
+    approx.update(lines)
+
+    top = approx.most_common(5)
+    assert [line for line, _ in top] == [line for line, _ in exact.most_common(5)]
+    bounds = approx.error_bounds()
+    for line, cnt in top:
+        assert exact[line] <= cnt <= exact[line] + bounds["count_overestimate_max"]
+    assert bounds["total_lines"] == len(lines)
+    assert abs(len(approx) - len(exact)) <= 4 * bounds["distinct_relative_error"] * (
+        len(exact)
+    )
@@ -0,0 +1,46 @@
+# test_word_count.py
+import io
+import pytest
+from collections import Counter
+from word_count import count_words, count_words_stream, count_words_streaming
+from char_count import count_characters_stream
+
+# Final sigma is lowered by context, so a cut word must still see its end
+TEXT = (
+    "The quick  brown fox\tjumps over the lazy dog\n"
+    "ΣΊΣΥΦΟΣ rolls the stone; the STONE rolls back\r\n\n"
+    "   supercalifragilisticexpialidocious  word-with-dashes end"
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 13, 40, 1024])
+def test_streams_match_full_read(tmp_path, chunk_size):
+    path = tmp_path / "input.txt"
+    path.write_text(TEXT, encoding="utf-8", newline="")
+    assert count_words_stream(io.StringIO(TEXT), chunk_size) == count_words(path)
+    assert count_words_streaming(path, chunk_size) == count_words(path)
+
+    chars = count_characters_stream(io.StringIO(TEXT), chunk_size)
+    if chunk_size <= max(len(word) for word in TEXT.split()):
+        # Longer runs are cut as is, so only their case folding may differ
+        assert sum(chars.values()) == len(TEXT)
+        return
+    assert chars == Counter(TEXT.lower())
+    assert list(chars) == list(Counter(TEXT.lower()))  # same CSV row order
+
+
+@pytest.mark.parametrize("text", ["", "   ", "word", "a bb", "trailing partial wo"])
+def test_edge_inputs(text):
+    for chunk_size in (1, 2, 4):
+        assert count_words_stream(io.StringIO(text), chunk_size) == Counter(
+            text.lower().split()
+        )
+        assert count_characters_stream(io.StringIO(text), chunk_size) == Counter(
+            text.lower()
+        )
+
+
+def test_long_run_without_whitespace_is_counted_in_pieces():
+    text = "x" * 50 + " Σ" + "y" * 30
+    assert count_words_stream(io.StringIO(text), 7) == Counter(text.lower().split())
+    assert count_characters_stream(io.StringIO(text), 7) == Counter(text.lower())
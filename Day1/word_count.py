@@ -1,31 +1,116 @@
 import sys
 import csv
+import argparse
 from collections import Counter
 
+from perf_stats import measure, format_stats
+from parallel_count import count_parallel, expand_inputs
+from s3_io import open_input, open_output
+
+CHUNK_SIZE = 1024 * 1024  # characters per read in streaming mode
+
 
 def count_words(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
+    with open_input(file_path, encoding="utf-8") as f:
         text = f.read().lower().split()
     return Counter(text)
 
 
+def count_words_stream(f, chunk_size=CHUNK_SIZE):
+    """
+    Count words from an open text stream, reading fixed-size chunks.
+    A word cut by a chunk boundary is carried over to the next chunk,
+    so the result is identical to count_words on the whole text.
+    """
+    counts = Counter()
+    carry = ""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        text = carry + chunk
+        # Keep the trailing (possibly incomplete) word for the next round.
+        # Only text up to a whitespace boundary is lowered, so context
+        # sensitive case mappings (e.g. final sigma) match the full read.
+        cut = len(text)
+        if not text[-1].isspace():
+            cut -= len(text.rsplit(None, 1)[-1])
+        counts.update(text[:cut].lower().split())
+        carry = text[cut:]
+    if carry:
+        counts.update(carry.lower().split())
+    return counts
+
+
+def count_words_streaming(file_path, chunk_size=CHUNK_SIZE):
+    with open_input(file_path, encoding="utf-8") as f:
+        return count_words_stream(f, chunk_size)
+
+
 def save_words_count_to_csv(counts, output_path):
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
+    with open_output(output_path, newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["word", "count"])
         for word, cnt in counts.items():
             writer.writerow([word, cnt])
 
 
+def parse_args():
+    p = argparse.ArgumentParser(
+        description="Count words in a text file and save counts to CSV."
+    )
+    p.add_argument(
+        "inputs",
+        nargs="+",
+        help="Input text file(s) or s3://bucket/key; globs are expanded",
+    )
+    p.add_argument("output", help="Path to output CSV file (or s3://bucket/key)")
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read the input in fixed-size chunks (constant memory)",
+    )
+    p.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Characters per chunk in --stream mode (default {CHUNK_SIZE})",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Count on N processes (splits large files, spreads many files)",
+    )
+    p.add_argument(
+        "--stats", action="store_true", help="Print throughput and peak RSS"
+    )
+    return p.parse_args()
+
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python word_count.py input.txt output.csv")
+    if len(sys.argv) < 3:
+        print("Usage: python word_count.py input.txt output.csv [--stream]")
         sys.exit(1)
 
-    input_path, output_path = sys.argv[1], sys.argv[2]
-    counts = count_words(input_path)
-    save_words_count_to_csv(counts, output_path)
-    print(f"Processed {len(counts)} unique words -> saved to {output_path}")
+    args = parse_args()
+    inputs = expand_inputs(args.inputs)
+    with measure(inputs) as stats:
+        if args.workers > 1 or len(inputs) > 1:
+            counts = count_parallel(
+                inputs, count_words_stream, args.workers, chunk_size=args.chunk_size
+            )
+        elif args.stream:
+            counts = count_words_streaming(inputs[0], args.chunk_size)
+        else:
+            counts = count_words(inputs[0])
+    save_words_count_to_csv(counts, args.output)
+    print(f"Processed {len(counts)} unique words -> saved to {args.output}")
+    if args.stats:
+        mode = "stream" if args.stream else "full-read"
+        if args.workers > 1:
+            mode = f"{args.workers} workers"
+        print(f"[{mode}] {format_stats(stats)}")
 
 
 if __name__ == "__main__":
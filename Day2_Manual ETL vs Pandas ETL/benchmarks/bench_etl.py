@@ -0,0 +1,271 @@
+"""
+Manual (file_handler) vs pandas ETL, end to end, on synthetic inputs.
+
+For every scale both jobs run with both engines, each run in a fresh
+interpreter so peak RSS and imports are not shared:
+  sales_join  users.csv x sales.json -> transformed_data.csv
+  employees   employess.csv -> cleaned employees JSON
+Wall time, CPU time, peak RSS and rows/s go to a JSON report that can be
+diffed against a report from another commit with --compare.
+
+Run from the Day2 folder:
+  python -m benchmarks.bench_etl --scales 1k,100k,1m
+  python -m benchmarks.bench_etl --scales 1m --compare old_report.json
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.generate_data import generate, parse_rows
+
+JOBS = ("sales_join", "employees")
+ENGINES = ("manual", "pandas")
+REPORT_DIR = Path(__file__).parent / "reports"
+# Modules each run needs, imported before the clock starts so that import
+# time (pandas alone is ~0.5s) is not counted as ETL time. etl_employees
+# imports pandas lazily, so it is listed on its own
+ENGINE_MODULES = {
+    ("sales_join", "manual"): ("etl_scripts.main_etl",),
+    ("sales_join", "pandas"): ("pandas",),
+    ("employees", "manual"): ("etl_scripts.file_handler",),
+    ("employees", "pandas"): ("etl_scripts.etl_employees", "pandas"),
+}
+
+
+# -------- Reference implementations (the engine each script doesn't use) --------
+def pandas_sales_join(input_dir, output_dir):
+    """main_etl's left join and aggregates, written with pandas."""
+    import pandas as pd
+
+    users = pd.read_csv(input_dir / "users.csv")
+    sales = pd.read_json(input_dir / "sales.json")
+    agg = sales.groupby("user", sort=False).agg(
+        sales_count=("id", "size"),
+        sales_total=("amount", "sum"),
+        last_sale_id=("id", "last"),
+    )
+    out = users.merge(agg, how="left", left_on="name", right_index=True)
+    out["sales_count"] = out["sales_count"].fillna(0).astype("int64")
+    out["sales_total"] = out["sales_total"].fillna(0.0).astype("float64")
+    out["last_sale_id"] = out["last_sale_id"].astype("Int64")
+    out = out.rename(columns={"name": "username"})
+    output_dir.mkdir(parents=True, exist_ok=True)
+    out.to_csv(output_dir / "transformed_data.csv", index=False)
+
+
+def manual_employees(input_dir, output_dir):
+    """etl_employees' cleaning steps, written with file_handler streams."""
+    from etl_scripts.file_handler import iter_csv, write_json_stream
+
+    updated_at = datetime.now().isoformat()
+
+    def transform(rows):
+        for row in rows:
+            if any(v in ("", None) for v in row.values()):
+                continue
+            salary = float(row["salary"])
+            if row["department"] == "Engineering":
+                salary *= 1.10
+            yield {
+                **row,
+                "id": int(row["id"]),
+                "salary": salary,
+                "full_name": row["first_name"] + " " + row["last_name"],
+                "updated_at": updated_at,
+            }
+
+    write_json_stream(
+        output_dir / "employees_summary.csv",
+        transform(iter_csv(input_dir / "employess.csv")),
+    )
+
+
+def run_job(engine, job, input_dir, output_dir):
+    if job == "sales_join" and engine == "manual":
+        from etl_scripts import main_etl
+
+        main_etl.main(["--input-dir", str(input_dir), "--output-dir", str(output_dir)])
+    elif job == "sales_join":
+        pandas_sales_join(input_dir, output_dir)
+    elif engine == "pandas":
+        from etl_scripts import etl_employees
+
+        etl_employees.main(
+            ["--input-dir", str(input_dir), "--output-dir", str(output_dir)]
+        )
+    else:
+        manual_employees(input_dir, output_dir)
+
+
+def peak_rss_mb():
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def worker(engine, job, input_dir, output_dir):
+    """One measured run in this process; prints the result as one JSON line."""
+    from utils.logger import configure_logging
+
+    # Keep the ETL logs quiet and out of the repo's logs/ folder
+    configure_logging(log_file=output_dir / "bench.log", level=logging.WARNING)
+    for module in ENGINE_MODULES[job, engine]:
+        importlib.import_module(module)
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    run_job(engine, job, input_dir, output_dir)
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+    print(
+        json.dumps(
+            {"wall_s": wall, "cpu_s": cpu, "peak_rss_mb": peak_rss_mb()},
+        )
+    )
+
+
+def measure(engine, job, input_dir, rows):
+    with tempfile.TemporaryDirectory(prefix="bench_etl_") as out:
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_etl",
+                "--worker",
+                engine,
+                job,
+                str(input_dir),
+                out,
+            ],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent.parent,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{engine}/{job} failed:\n{proc.stderr}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    # sales_join reads users and sales, employees reads one file
+    rows_in = rows * 2 if job == "sales_join" else rows
+    result["rows_per_s"] = rows_in / result["wall_s"] if result["wall_s"] else 0.0
+    return {"rows": rows, "job": job, "engine": engine, **result}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment():
+    try:
+        import pandas
+
+        pandas_version = pandas.__version__
+    except ImportError:
+        pandas_version = None
+    return {
+        "python": platform.python_version(),
+        "pandas": pandas_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path):
+    """Print wall-time ratios against a report from another run."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    old = {(r["rows"], r["job"], r["engine"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} (commit {baseline.get('commit')}):")
+    for r in results:
+        prev = old.get((r["rows"], r["job"], r["engine"]))
+        if prev:
+            print(
+                f"{r['rows']:>10,} {r['job']:<11}{r['engine']:<7}"
+                f"  speedup {prev['wall_s'] / r['wall_s']:.2f}x"
+                f"   RSS {r['peak_rss_mb'] - prev['peak_rss_mb']:+.1f} MB"
+            )
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Manual vs pandas ETL benchmark")
+    p.add_argument("--scales", default="1k,10k,100k", help="Comma list, e.g. 1k,1m,50m")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--jobs", default=",".join(JOBS))
+    p.add_argument("--engines", default=",".join(ENGINES))
+    p.add_argument(
+        "--data-dir",
+        type=Path,
+        help="Keep generated inputs here and reuse them (default: temp dir)",
+    )
+    p.add_argument("--report", type=Path, help="Report path (default: reports/)")
+    p.add_argument("--compare", type=Path, help="Earlier report to diff against")
+    p.add_argument("--worker", nargs=4, help=argparse.SUPPRESS)
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker:
+        engine, job, input_dir, output_dir = args.worker
+        worker(engine, job, Path(input_dir), Path(output_dir))
+        return
+
+    scales = [parse_rows(s) for s in args.scales.split(",")]
+    jobs = args.jobs.split(",")
+    engines = args.engines.split(",")
+    commit = git_commit()
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="bench_data_") as tmp:
+        data_root = args.data_dir or Path(tmp)
+        print(
+            f"{'rows':>10} {'job':<11}{'engine':<7}{'wall s':>9}{'cpu s':>9}"
+            f"{'RSS MB':>9}{'rows/s':>12}"
+        )
+        for rows in scales:
+            input_dir = Path(
+                generate(data_root / f"rows_{rows}_seed_{args.seed}", rows, args.seed)
+            )
+            for job in jobs:
+                for engine in engines:
+                    r = measure(engine, job, input_dir, rows)
+                    results.append(r)
+                    print(
+                        f"{rows:>10,} {job:<11}{engine:<7}{r['wall_s']:>9.3f}"
+                        f"{r['cpu_s']:>9.3f}{r['peak_rss_mb']:>9.1f}"
+                        f"{r['rows_per_s']:>12,.0f}"
+                    )
+
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "environment": environment(),
+        "results": results,
+    }
+    report_path = args.report or REPORT_DIR / f"bench_etl_{commit}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {report_path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Output size and write/read time of the file_handler backends on the sample
+sales records scaled up: CSV, JSON, NDJSON, Parquet (snappy, zstd) and
+Arrow IPC (zstd), plus a projected (and, for Parquet, filtered) read.
+
+Run from the Day2 folder:
+  python -m benchmarks.bench_formats --rows 500000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from itertools import cycle, islice
+
+from etl_scripts import file_handler as fh
+
+SALES_JSON = fh.DATA_DIR / "input" / "sales.json"
+PROJECTION = ["user", "amount"]
+FILTERS = [("amount", ">", 50_000)]
+SCHEMA = {"id": "int64", "user": "string", "item": "string", "amount": "int64"}
+
+
+def scaled_sales(rows):
+    """Cycle the sample sales, giving each copy a fresh id and amount."""
+    for i, sale in enumerate(islice(cycle(fh.read_json(SALES_JSON)), rows)):
+        yield {**sale, "id": i + 1, "amount": sale["amount"] + i % 100_000}
+
+
+def _project(records, columns):
+    return [{c: r[c] for c in columns} for r in records]
+
+
+# name -> (extension, write(path, records), read(path), projected read(path))
+FORMATS = {
+    "csv": (
+        "csv",
+        lambda p, r: fh.write_csv_stream(p, r, list(SCHEMA)),
+        fh.read_csv,
+        lambda p: _project(fh.iter_csv(p), PROJECTION),
+    ),
+    "json": (
+        "json",
+        fh.write_json_stream,
+        fh.read_json,
+        lambda p: _project(fh.iter_json(p), PROJECTION),
+    ),
+    "ndjson": (
+        "ndjson",
+        lambda p, r: fh.write_json_stream(p, r, ndjson=True),
+        fh.read_json,
+        lambda p: _project(fh.iter_json(p), PROJECTION),
+    ),
+    "parquet-snappy": (
+        "parquet",
+        lambda p, r: fh.write_parquet(p, r, "snappy", schema=SCHEMA),
+        fh.read_parquet,
+        lambda p: fh.read_parquet(p, columns=PROJECTION),
+    ),
+    "parquet-zstd": (
+        "parquet",
+        lambda p, r: fh.write_parquet(p, r, "zstd", schema=SCHEMA),
+        fh.read_parquet,
+        lambda p: fh.read_parquet(p, columns=PROJECTION),
+    ),
+    "arrow-zstd": (
+        "arrow",
+        lambda p, r: fh.write_arrow(p, r, "zstd", schema=SCHEMA),
+        fh.read_arrow,
+        lambda p: fh.read_arrow(p, columns=PROJECTION),
+    ),
+}
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    p = argparse.ArgumentParser(description="File format size/speed benchmark")
+    p.add_argument("--rows", type=int, default=500_000)
+    args = p.parse_args()
+
+    # Keep the per-call read/write INFO lines out of the timings
+    logging.getLogger(fh.__name__).setLevel(logging.WARNING)
+    # pyarrow loads on first use; import it now so the first columnar
+    # write isn't charged for it
+    fh._require_pyarrow()
+    records = list(scaled_sales(args.rows))
+
+    print(
+        f"{'format':<15}{'size MB':>9}{'write s':>9}{'read s':>9}"
+        f"{'proj s':>9}{'filter s':>10}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (ext, write, read, read_projected) in FORMATS.items():
+            path = os.path.join(tmp, f"{name}.{ext}")
+            write_s, _ = timed(write, path, records)
+            read_s, data = timed(read, path)
+            assert len(data) == len(records), name
+            proj_s, _ = timed(read_projected, path)
+            filter_col = "-"
+            if ext == "parquet":
+                filter_s, _ = timed(fh.read_parquet, path, PROJECTION, FILTERS)
+                filter_col = f"{filter_s:.3f}"
+            print(
+                f"{name:<15}{os.path.getsize(path) / 1e6:>9.2f}{write_s:>9.3f}"
+                f"{read_s:>9.3f}{proj_s:>9.3f}{filter_col:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
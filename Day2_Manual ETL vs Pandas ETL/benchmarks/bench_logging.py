@@ -0,0 +1,86 @@
+"""
+Per-call latency of a logger writing straight to FileHandler/StreamHandler
+(the old get_logger) versus the shared queue backend in utils.logger.
+
+Run from the Day2 folder:
+  python -m benchmarks.bench_logging --calls 50000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from utils import logger as log_backend
+
+
+def direct_logger(log_file):
+    logger = logging.getLogger("bench.direct")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    formatter = logging.Formatter(
+        log_backend.LOG_FORMAT, datefmt=log_backend.DATE_FORMAT
+    )
+    handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    return logger, [handler]
+
+
+def queued_logger(log_file):
+    log_queue = log_backend.configure_logging(log_file=log_file)
+    # Benchmark the file path only: keep the console out of the listener
+    log_backend._listener.handlers = tuple(
+        h
+        for h in log_backend._listener.handlers
+        if type(h) is not logging.StreamHandler
+    )
+    logger = logging.getLogger("bench.queued")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(log_backend.InProcessQueueHandler(log_queue))
+    return logger, []
+
+
+def run(logger, calls):
+    samples = []
+    for i in range(calls):
+        t0 = time.perf_counter_ns()
+        logger.info("Read %d records from %s", i, "data/input/users.csv")
+        samples.append(time.perf_counter_ns() - t0)
+        logger.debug("Below threshold, never formatted: %s", i)
+    samples.sort()
+    return {
+        "mean_us": sum(samples) / len(samples) / 1000,
+        "p50_us": samples[len(samples) // 2] / 1000,
+        "p99_us": samples[int(len(samples) * 0.99)] / 1000,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description="Logging backend micro-benchmark")
+    p.add_argument("--calls", type=int, default=50_000)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, factory in (("direct", direct_logger), ("queued", queued_logger)):
+            logger, handlers = factory(os.path.join(tmp, f"{name}.log"))
+            results[name] = run(logger, args.calls)
+            for h in handlers:
+                h.close()
+        log_backend.shutdown_logging()
+
+    for name, r in results.items():
+        print(
+            f"{name:>7}: mean {r['mean_us']:.2f}us  p50 {r['p50_us']:.2f}us  "
+            f"p99 {r['p99_us']:.2f}us per call"
+        )
+    print(
+        f"speedup (mean): {results['direct']['mean_us'] / results['queued']['mean_us']:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
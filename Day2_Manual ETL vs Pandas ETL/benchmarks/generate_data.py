@@ -0,0 +1,124 @@
+"""
+Synthetic users.csv, sales.json and employess.csv in the same layout as
+data/input, at any scale. The same --rows and --seed always produce the
+same files, so runs on different commits measure identical inputs.
+
+Run from the Day2 folder:
+  python -m benchmarks.generate_data /tmp/etl_1m --rows 1m
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+
+FIRST_NAMES = ["Akhil", "Ravi", "Sneha", "Manav", "Anjali", "Priya", "Rahul", "Neha"]
+LAST_NAMES = ["Patil", "Sharma", "Desai", "Kulkarni", "Joshi", "Mehta", "Rao"]
+DEPARTMENTS = ["Engineering", "Sales", "HR", "Finance", "Marketing"]
+ITEMS = ["Laptop", "Mouse", "Keyboard", "Monitor", "Headset", "Dock"]
+UNKNOWN_USER_RATE = 0.05  # sales whose user is not in users.csv
+MISSING_SALARY_RATE = 0.02  # employees dropped by the cleaning step
+MAX_ROWS = 50_000_000
+
+
+def parse_rows(text):
+    """'1k' -> 1000, '2.5m' -> 2500000, '500' -> 500."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    if scale > 1:
+        text = text[:-1]
+    rows = int(float(text) * scale)
+    if not 1 <= rows <= MAX_ROWS:
+        raise ValueError(f"rows must be between 1 and {MAX_ROWS:,}, got {rows:,}")
+    return rows
+
+
+def user_name(i):
+    return f"{FIRST_NAMES[i % len(FIRST_NAMES)]}{i}"
+
+
+def write_users(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "email"])
+        writer.writerows(
+            (user_name(i), f"{user_name(i).lower()}@example.com") for i in range(rows)
+        )
+
+
+def write_sales(path, rows, users, rng):
+    """A JSON array with one record per line (streamed, never held in memory)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(rows):
+            if rng.random() < UNKNOWN_USER_RATE:
+                user = f"Guest{i}"
+            else:
+                user = user_name(rng.randrange(users))
+            sale = {
+                "id": i + 1,
+                "user": user,
+                "item": rng.choice(ITEMS),
+                "amount": rng.randrange(100, 100_000),
+            }
+            f.write(("    " if i == 0 else ",\n    ") + json.dumps(sale))
+        f.write("\n]\n")
+
+
+def write_employees(path, rows, rng):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "first_name", "last_name", "department", "salary"])
+        for i in range(rows):
+            salary = rng.randrange(30_000, 150_000)
+            writer.writerow(
+                [
+                    i + 1,
+                    rng.choice(FIRST_NAMES),
+                    rng.choice(LAST_NAMES),
+                    rng.choice(DEPARTMENTS),
+                    "" if rng.random() < MISSING_SALARY_RATE else salary,
+                ]
+            )
+
+
+def generate(out_dir, rows, seed=42):
+    """
+    Write the three input files with `rows` rows each into out_dir.
+    Skipped when out_dir already holds files for the same rows and seed.
+    Returns the path of the data directory.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    meta_path = os.path.join(out_dir, "meta.json")
+    meta = {"rows": rows, "seed": seed}
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            if json.load(f) == meta:
+                return out_dir
+
+    # One generator per random file, so each file is stable on its own
+    write_users(os.path.join(out_dir, "users.csv"), rows)
+    write_sales(
+        os.path.join(out_dir, "sales.json"), rows, rows, random.Random(seed + 1)
+    )
+    write_employees(
+        os.path.join(out_dir, "employess.csv"), rows, random.Random(seed + 2)
+    )
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return out_dir
+
+
+def main():
+    p = argparse.ArgumentParser(description="Generate synthetic ETL inputs")
+    p.add_argument("out_dir", help="Directory for users.csv, sales.json, employess.csv")
+    p.add_argument("--rows", type=parse_rows, default=1000, help="e.g. 1k, 2m, 50m")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args()
+    generate(args.out_dir, args.rows, args.seed)
+    print(f"Wrote {args.rows:,} rows per file to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
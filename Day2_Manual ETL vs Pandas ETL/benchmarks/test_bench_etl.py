@@ -0,0 +1,104 @@
+# test_bench_etl.py
+import csv
+import json
+import os
+import pytest
+from pathlib import Path
+from benchmarks import bench_etl
+from benchmarks.generate_data import MAX_ROWS, generate, parse_rows
+from etl_scripts import etl_employees, main_etl
+from etl_scripts.file_handler import read_csv
+
+
+@pytest.mark.parametrize(
+    "text, rows", [("500", 500), ("1k", 1000), (" 2.5M ", 2_500_000), ("50m", MAX_ROWS)]
+)
+def test_parse_rows(text, rows):
+    assert parse_rows(text) == rows
+
+
+@pytest.mark.parametrize("text", ["0", "51m", "-1k", "many"])
+def test_parse_rows_rejects_bad_scales(text):
+    with pytest.raises(ValueError):
+        parse_rows(text)
+
+
+def test_generate_is_deterministic_and_reused(tmp_path):
+    a = generate(str(tmp_path / "a"), 200, seed=7)
+    b = generate(str(tmp_path / "b"), 200, seed=7)
+    names = ("users.csv", "sales.json", "employess.csv")
+    for name in names:
+        assert Path(a, name).read_bytes() == Path(b, name).read_bytes()
+
+    assert len(read_csv(os.path.join(a, "users.csv"))) == 200
+    assert len(read_csv(os.path.join(a, "employess.csv"))) == 200
+    with open(os.path.join(a, "sales.json"), encoding="utf-8") as f:
+        assert [s["id"] for s in json.load(f)] == list(range(1, 201))
+
+    # Same rows and seed: the files are kept as they are
+    mtimes = [os.stat(os.path.join(a, n)).st_mtime_ns for n in names]
+    generate(a, 200, seed=7)
+    assert [os.stat(os.path.join(a, n)).st_mtime_ns for n in names] == mtimes
+
+    generate(a, 200, seed=8)
+    assert Path(a, "sales.json").read_bytes() != Path(b, "sales.json").read_bytes()
+
+
+@pytest.fixture(scope="module")
+def input_dir(tmp_path_factory):
+    return Path(generate(str(tmp_path_factory.mktemp("input")), 400, seed=11))
+
+
+def test_engines_agree_on_sales_join(input_dir, tmp_path):
+    main_etl.main(["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "m")])
+    bench_etl.pandas_sales_join(input_dir, tmp_path / "p")
+
+    def rows(path):
+        with open(path / "transformed_data.csv", newline="", encoding="utf-8") as f:
+            return [
+                {
+                    **r,
+                    "sales_count": int(r["sales_count"]),
+                    "sales_total": float(r["sales_total"]),
+                }
+                for r in csv.DictReader(f)
+            ]
+
+    assert rows(tmp_path / "p") == rows(tmp_path / "m")
+
+
+def test_engines_agree_on_employees(input_dir, tmp_path):
+    etl_employees.main(
+        ["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "p")]
+    )
+    bench_etl.manual_employees(input_dir, tmp_path / "m")
+
+    def rows(path):
+        with open(path / "employees_summary.csv", encoding="utf-8") as f:
+            records = json.load(f)
+        for r in records:
+            del r["updated_at"]
+            r["salary"] = round(r["salary"], 6)  # only to_json rounds floats
+        return records
+
+    assert rows(tmp_path / "m") == rows(tmp_path / "p")
+
+
+def test_report_and_compare(tmp_path, capsys):
+    report = tmp_path / "report.json"
+    argv = ["--scales", "100", "--data-dir", str(tmp_path / "data")]
+    bench_etl.main([*argv, "--report", str(report)])
+    results = json.loads(report.read_text(encoding="utf-8"))["results"]
+    assert {(r["job"], r["engine"]) for r in results} == {
+        (job, engine) for job in bench_etl.JOBS for engine in bench_etl.ENGINES
+    }
+    for r in results:
+        assert r["rows"] == 100
+        assert r["wall_s"] > 0 and r["cpu_s"] >= 0 and r["peak_rss_mb"] > 0
+        assert r["rows_per_s"] > 0
+
+    bench_etl.main(
+        [*argv, "--jobs", "employees", "--report", str(tmp_path / "new.json")]
+        + ["--compare", str(report)]
+    )
+    assert capsys.readouterr().out.count("speedup") == 2
@@ -0,0 +1,10 @@
+import pytest
+from utils import logger
+
+
+@pytest.fixture(autouse=True, scope="session")
+def log_to_tmp(tmp_path_factory):
+    # Keep the ETL logs of test runs out of the repo's logs/ folder
+    logger.configure_logging(log_file=tmp_path_factory.mktemp("logs") / "app.log")
+    yield
+    logger.shutdown_logging()
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR_NAME = ".etl_cache"  # per-stage manifests, inside the output folder
+HASH_CHUNK = 1024 * 1024
+MANIFEST_VERSION = 1
+
+
+def file_digest(path):
+    """blake2b of a file's content, read in 1 MB chunks."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class StageCache:
+    """
+    Content-hash manifest for one ETL stage, like a tiny make/ninja.
+
+    A stage is fresh when its input contents, code files and config are the
+    same as on its last successful run and its outputs are still exactly
+    what that run wrote. Files whose size and mtime didn't change reuse the
+    recorded digest, so a no-op check is a few stat() calls.
+
+    Manifests are one JSON file per stage, so stages running at the same
+    time never write the same file.
+
+    is_fresh() fingerprints the inputs before the run starts and record()
+    stores that fingerprint, so inputs edited while the stage was running
+    make the next check miss instead of being marked as built.
+    """
+
+    def __init__(self, stage, output_dir):
+        self.stage = stage
+        self.path = Path(output_dir) / CACHE_DIR_NAME / f"{stage}.json"
+        self._entry = self._load()
+        self._digests = dict(self._entry.get("files", {}))
+        self._pending = None  # (fingerprint, tracked paths) taken before the run
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable manifest %s: %s", self.path, e)
+            return {}
+        return entry if entry.get("version") == MANIFEST_VERSION else {}
+
+    def _digest(self, path):
+        """Content digest, reusing the recorded one while size/mtime match."""
+        path = str(path)
+        stat = _stat_key(path)
+        known = self._digests.get(path)
+        if known and known["stat"] == stat:
+            return known["digest"]
+        digest = file_digest(path)
+        self._digests[path] = {"stat": stat, "digest": digest}
+        return digest
+
+    def fingerprint(self, inputs, code, config):
+        h = hashlib.blake2b(digest_size=16)
+        for label, paths in (("in", inputs), ("code", code)):
+            for p in sorted(str(p) for p in paths):
+                h.update(f"{label}:{p}:{self._digest(p)}\n".encode("utf-8"))
+        h.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    def is_fresh(self, inputs, outputs, code=(), config=None):
+        """
+        True when the stage can be skipped. Call it before running the stage
+        (even when forcing a rerun): the fingerprint it takes is the one
+        record() stores.
+        """
+        self._pending = None
+        try:
+            fingerprint = self.fingerprint(inputs, code, config)
+        except OSError:  # an input is missing
+            return False
+        self._pending = (fingerprint, {str(p) for p in (*inputs, *code)})
+        if not self._entry:
+            return False
+        try:
+            if fingerprint != self._entry["fingerprint"]:
+                return False
+            recorded = self._entry["outputs"]
+            if sorted(recorded) != sorted(str(p) for p in outputs):
+                return False
+            # Outputs must still hold what the last run wrote
+            return all(self._digest(p) == d for p, d in recorded.items())
+        except OSError:  # an output is missing
+            return False
+
+    def record(self, outputs):
+        """Store the manifest after a successful run (atomic replace)."""
+        if self._pending is None:
+            raise RuntimeError(f"is_fresh() was not called for stage {self.stage!r}")
+        fingerprint, sources = self._pending
+        entry = {
+            "version": MANIFEST_VERSION,
+            "stage": self.stage,
+            "fingerprint": fingerprint,
+            "outputs": {str(p): self._digest(p) for p in outputs},
+        }
+        tracked = set(entry["outputs"]) | sources
+        entry["files"] = {p: d for p, d in self._digests.items() if p in tracked}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp, self.path)
+        self._entry = entry
+        self._pending = None
+
+    def invalidate(self):
+        self._entry = {}
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -1,18 +1,280 @@
-import pandas as pd
+import argparse
 from pathlib import Path
+from etl_scripts import file_handler
+from etl_scripts.build_cache import StageCache
+from etl_scripts.file_handler import count_columnar_rows
+from etl_scripts.pipeline import Pipeline
 from utils.logger import get_logger
 
+# pandas is imported by the functions that use it, so --help and jobs the
+# stage cache skips don't wait for it
 logger = get_logger(__name__)
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Explicit schema for chunked mode: no type inference. id is downcast to a
+# nullable Int32 (ids stay far below 2**31, and a blank id still reaches
+# dropna like in the default mode); salary stays float64 so money values
+# round-trip exactly. The extract has no date columns to pre-parse
+SCHEMA = {
+    "id": "Int32",
+    "first_name": "string",
+    "last_name": "string",
+    "department": "category",
+    "salary": "float64",
+}
+FORMATS = ("json", "parquet", "arrow")
+DEFAULT_COMPRESSION = {"parquet": "snappy", "arrow": "zstd"}
 
-def main():
-    input_path = DATA_DIR / "input" / "employess.csv"
-    output_path = DATA_DIR / "output" / "employees_summary.csv"
+
+def transform_chunk(df, updated_at):
+    """full_name, Engineering raise, dropna and timestamp for one chunk."""
+    df["full_name"] = df["first_name"] + " " + df["last_name"]
+    df.loc[df["department"] == "Engineering", "salary"] *= 1.10
+    df = df.dropna()
+    df["updated_at"] = updated_at
+    return df
+
+
+def _plain_table(df):
+    """
+    DataFrame chunk -> pyarrow Table with category columns as plain values,
+    so every chunk has the same schema whatever categories it happened to see.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            column = table.column(i).cast(field.type.value_type)
+            table = table.set_column(i, field.name, column)
+    return table
+
+
+class _ColumnarWriter:
+    """
+    Append DataFrame chunks to one Parquet or Arrow IPC file. pyarrow is
+    imported here, only for --format parquet/arrow.
+    """
+
+    def __init__(self, output_path, fmt, compression):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "--format %s needs pyarrow: pip install pyarrow" % fmt
+            ) from None
+        self.output_path = output_path
+        self.fmt = fmt
+        self.compression = compression
+        self.schema = None
+        self._writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = _plain_table(df)
+        if self._writer is None:
+            self.schema = table.schema
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(
+                    self.output_path, self.schema, compression=self.compression
+                )
+            else:
+                options = pa.ipc.IpcWriteOptions(compression=self.compression)
+                self._writer = pa.ipc.new_file(
+                    self.output_path, self.schema, options=options
+                )
+        self._writer.write_table(table.cast(self.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def read_chunks(input_path, chunksize):
+    """Yield the CSV in chunks of `chunksize` rows, read with an explicit schema."""
+    import pandas as pd
+
+    columns = pd.read_csv(input_path, nrows=0).columns
+    dtype = {c: t for c, t in SCHEMA.items() if c in columns}
+    rows_in = 0
+    for chunk in pd.read_csv(input_path, dtype=dtype, chunksize=chunksize):
+        rows_in += len(chunk)
+        yield chunk
+    logger.info("Initial row count: %d", rows_in)
+
+
+def write_chunks(chunks, output_path, fmt="json", compression=None):
+    """
+    Append transformed chunks to output_path: NDJSON for json, one row
+    group / record batch per chunk for parquet and arrow. Memory is bounded
+    by one chunk; the row count is tracked instead of re-reading.
+    """
+    rows_out = 0
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "json":
+        out = open(output_path, "w", encoding="utf-8")
+    else:
+        out = _ColumnarWriter(output_path, fmt, compression)
+    try:
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+            if fmt == "json":
+                chunk.to_json(out, orient="records", lines=True, date_format="iso")
+            else:
+                out.write(chunk)
+            rows_out += len(chunk)
+    finally:
+        out.close()
+    logger.info("Row count after cleaning: %d", rows_out)
+    logger.info("Wrote cleaned data to %s", output_path)
+    return rows_out
+
+
+def write_frame(df, output_path, fmt, compression=None):
+    """Write the whole DataFrame as pretty JSON, Parquet or Arrow IPC."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        df.to_parquet(output_path, index=False, compression=compression)
+    elif fmt == "arrow":
+        # dropna leaves gaps in the index, which would be stored as a column
+        df.reset_index(drop=True).to_feather(output_path, compression=compression)
+    else:
+        df.to_json(output_path, orient="records", indent=4)
+
+
+def verify_rows(output_path, fmt):
+    """Row count of the written file (metadata only for columnar formats)."""
+    if fmt == "json":
+        import pandas as pd
+
+        return len(pd.read_json(output_path))
+    return count_columnar_rows(output_path)
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Employees ETL with pandas")
+    p.add_argument(
+        "--chunksize",
+        type=int,
+        help="Process the CSV in chunks of N rows and write NDJSON "
+        "(bounded memory for inputs larger than RAM)",
+    )
+    p.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="json",
+        help="Output format (json is NDJSON in --chunksize mode)",
+    )
+    p.add_argument(
+        "--compression",
+        help="Parquet/Arrow codec (default snappy for parquet, zstd for arrow)",
+    )
+    p.add_argument("--input-dir", type=Path, default=DATA_DIR / "input")
+    p.add_argument("--output-dir", type=Path, default=DATA_DIR / "output")
+    p.add_argument(
+        "--force", action="store_true", help="Rerun even if inputs are unchanged"
+    )
+    return p.parse_args(argv)
+
+
+def job_cache(args):
+    """Input/output paths, codec and build-cache entry for these options."""
+    input_path = args.input_dir / "employess.csv"
+    output_path = args.output_dir / "employees_summary.csv"
+    compression = args.compression or DEFAULT_COMPRESSION.get(args.format)
+    if args.format != "json":
+        output_path = output_path.with_suffix("." + args.format)
+
+    if args.chunksize and args.format == "json":
+        output_path = output_path.with_suffix(".ndjson")
+
+    cache = StageCache(f"employees_{output_path.suffix[1:]}", args.output_dir)
+    stage = {
+        "inputs": [input_path],
+        "outputs": [output_path],
+        "code": [__file__, file_handler.__file__],
+        "config": {"chunksize": args.chunksize, "compression": compression},
+    }
+    return input_path, output_path, compression, cache, stage
+
+
+def is_fresh(args):
+    """True when the job would be skipped (output cached and up to date)."""
+    *_, cache, stage = job_cache(args)
+    return cache.is_fresh(**stage) and not args.force
+
+
+def add_stages(pipeline, args):
+    """
+    Declare the employees job (extract, transform, load, verify) on a
+    Pipeline. Returns a finish(results) callback that records the build
+    cache once the pipeline has succeeded, or None without adding anything
+    when the cached output is fresh.
+    """
+    input_path, output_path, compression, cache, stage = job_cache(args)
+
+    # Skip the whole job when input, code and options match the last run
+    if cache.is_fresh(**stage) and not args.force:
+        logger.info("Input unchanged, keeping %s", output_path)
+        return None
+
+    if args.chunksize:
+        # Reading, transforming and writing chunks overlap, with at most a
+        # few chunks buffered between stages
+        logger.info("Reading input CSV in chunks of %d rows...", args.chunksize)
+        import pandas as pd
+
+        updated_at = pd.Timestamp.now()
+        pipeline.add(
+            "employees_extract",
+            lambda: read_chunks(input_path, args.chunksize),
+            stream=True,
+            batch_size=1,
+        )
+        pipeline.add(
+            "employees_transform",
+            lambda chunks: (transform_chunk(c, updated_at) for c in chunks),
+            deps=("employees_extract",),
+            stream=True,
+            batch_size=1,
+        )
+        pipeline.add(
+            "employees_load",
+            lambda chunks: write_chunks(chunks, output_path, args.format, compression),
+            deps=("employees_transform",),
+        )
+    else:
+        pipeline.add("employees_extract", lambda: extract(input_path))
+        pipeline.add(
+            "employees_transform", transform_frame, deps=("employees_extract",)
+        )
+        pipeline.add(
+            "employees_load",
+            lambda df: load(df, output_path, args.format, compression),
+            deps=("employees_transform",),
+        )
+    pipeline.add(
+        "employees_verify",
+        lambda rows: verify(output_path, args.format, rows),
+        deps=("employees_load",),
+    )
+    return lambda results: cache.record(stage["outputs"])
+
+
+def extract(input_path):
+    import pandas as pd
 
     logger.info("Reading input CSV...")
     df = pd.read_csv(input_path)
-    logger.info(f"Initial row count: {len(df)}")
+    logger.info("Initial row count: %d", len(df))
+    return df
+
+
+def transform_frame(df):
+    import pandas as pd
 
     # 1.Add full_name column
     df["full_name"] = df["first_name"] + " " + df["last_name"]
@@ -34,23 +296,43 @@ means:
 
     # 3. Drop rows with any nulls
     df.dropna(inplace=True)
-    logger.info(f"Row count after cleaning: {len(df)}")
+    logger.info("Row count after cleaning: %d", len(df))
 
     # 4. Add a timestamp column
     df["updated_at"] = pd.Timestamp.now()
+    return df
+
 
-    # 5.Write Output to JSON
+def load(df, output_path, fmt, compression):
+    # 5.Write Output to JSON (or Parquet / Arrow with --format)
     """
-    df.to_json(output_path, orient="records", indent=4)
-Writes the DataFrame to JSON with one object per row. orient="records" produces a list of objects like your earlier manual list[dict].
+        df.to_json(output_path, orient="records", indent=4)
+    Writes the DataFrame to JSON with one object per row. orient="records" produces a list of objects like your earlier manual list[dict].
     """
     # df.to_json(output_path, orient="records", indent=4)
-    df.to_json(output_path, orient="records", indent=4)
-    logger.info(f"Wrote cleaned data to {output_path}")
+    write_frame(df, output_path, fmt, compression)
+    logger.info("Wrote cleaned data to %s", output_path)
+    return None
+
+
+def verify(output_path, fmt, rows):
+    # 6. Verify (chunked mode already counted the rows it wrote)
+    if rows is None:
+        rows = verify_rows(output_path, fmt)
+    logger.info("Verified Row count in output: %d records.", rows)
+    return rows
+
 
-    # 6. Verify
-    check = pd.read_json(output_path)
-    logger.info(f"Verified Row count in output: {len(check)} records.")
+def main(argv=None):
+    args = parse_args(argv)
+    pipeline = Pipeline("employees", queue_size=2)
+    finish = add_stages(pipeline, args)
+    if finish is None:
+        return None
+    results = pipeline.run()
+    pipeline.log_timings()
+    finish(results)
+    return results["employees_verify"]
 
 
 if __name__ == "__main__":
@@ -1,51 +1,426 @@
 import csv, json, os
+import textwrap
+from itertools import islice
 from pathlib import Path
 from utils.logger import get_logger
+from utils.s3_io import is_s3_path, open_input, open_output
+
+# Columnar formats are optional: pyarrow is imported by _require_pyarrow()
+# on first use, so CSV/JSON-only runs never pay for loading it
+pa = pads = pq = None
 
 logger = get_logger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+BATCH_SIZE = 1000  # rows per writerows() call in the streaming writers
+JSON_READ_SIZE = 64 * 1024  # characters per read in the incremental JSON parser
+ROW_GROUP_SIZE = 128 * 1024  # rows per Parquet row group / Arrow record batch
+
+_decoder = json.JSONDecoder()
+
+
+def batched(iterable, size=BATCH_SIZE):
+    """Yield lists of up to `size` items from any iterable."""
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _pulled_batches(iterable, size, reading):
+    """
+    batched(), with reading[0] set while the source is being pulled: a
+    writer then tells the source's errors (re-raised) from its own.
+    """
+    it = batched(iterable, size)
+    while True:
+        reading[0] = True
+        batch = next(it, None)
+        reading[0] = False
+        if batch is None:
+            return
+        yield batch
+
+
+# -------- Readers --------
+def _csv_rows(file_path):
+    with open_input(file_path, newline="", encoding="utf-8") as file:
+        yield from csv.DictReader(file)
+
+
+def iter_csv(file_path):
+    """
+    Yield CSV rows as dicts, one at a time (constant memory).
+    Read errors are logged and re-raised, so a consumer never mistakes a
+    corrupt file for a short one.
+    """
+    count = 0
+    try:
+        for row in _csv_rows(file_path):
+            count += 1
+            yield row
+    except Exception as e:
+        logger.error(
+            "Failed to read CSV file %s after %d rows: %s", file_path, count, e
+        )
+        raise
+    logger.info("Read %d records from %s", count, file_path)
+
 
 def read_csv(file_path):
     try:
-        with open(file_path, mode="r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            data = list(reader)
-            logger.info(f"Read {len(data)} records from {file_path}")
-            return data
+        data = list(_csv_rows(file_path))
+        logger.info("Read %d records from %s", len(data), file_path)
+        return data
     except Exception as e:
-        logger.error((f"Failed to read CSV file {file_path}: {e}"))
+        logger.error("Failed to read CSV file %s: %s", file_path, e)
         return []
 
 
-def write_csv(file_path, data, fieldnames):
+def _json_values(f, read_size=JSON_READ_SIZE):
+    """
+    Incrementally parse a JSON document from a text stream.
+
+    Returns (is_array, iterator). For a top-level array the iterator yields
+    its elements; otherwise it yields each whitespace-separated value, which
+    covers NDJSON and single-document files. Only one element plus one read
+    buffer is held in memory at a time.
+    """
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(read_size)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    def next_value():
+        nonlocal pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+                # A number cut by the read buffer still parses ("-1." of
+                # "-1.5e3"), so only trust values followed by a delimiter
+                if eof or (end < len(buf) and buf[end] in " \t\r\n,]"):
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    fill()
+    skip(" \t\r\n")
+    is_array = buf[pos : pos + 1] == "["
+    if is_array:
+        pos += 1
+
+    def values():
+        nonlocal pos
+        while True:
+            skip(" \t\r\n," if is_array else " \t\r\n")
+            if pos >= len(buf):
+                if is_array:
+                    raise json.JSONDecodeError("Unterminated array", buf, pos)
+                return
+            if is_array and buf[pos] == "]":
+                return
+            yield next_value()
+
+    return is_array, values()
+
+
+def iter_json(file_path):
+    """
+    Yield records from a JSON array or an NDJSON file one at a time,
+    without loading the whole document. Parse errors are logged and
+    re-raised (see iter_csv).
+    """
+    count = 0
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
-            logger.info(f"Wrote {len(data)} records to {file_path}")
+        with open_input(file_path, newline="", encoding="utf-8") as f:
+            _, values = _json_values(f)
+            for value in values:
+                count += 1
+                yield value
     except Exception as e:
-        logger.error(f"Failed to write in csv file {file_path}: {e}")
+        logger.error(
+            "Failed to read JSON file %s after %d records: %s", file_path, count, e
+        )
+        raise
+    logger.info("Read %d JSON records from %s", count, file_path)
 
 
 def read_json(file_path):
     try:
-        with open(file_path, mode="r", newline="", encoding="utf-8") as f:
-            data = json.load(f)
-            logger.info(f"Read JSON data from {file_path}")
+        with open_input(file_path, newline="", encoding="utf-8") as f:
+            is_array, values = _json_values(f)
+            data = list(values)
+            if not is_array and len(data) == 1:
+                data = data[0]  # a single (non-array) document
+            logger.info("Read JSON data from %s", file_path)
             return data
     except Exception as e:
-        logger.error(f"Failed to read JSON file {file_path}: {e}")
+        logger.error("Failed to read JSON file %s: %s", file_path, e)
         return []
 
 
+# -------- Writers --------
+def write_csv_stream(file_path, rows, fieldnames, batch_size=BATCH_SIZE):
+    """
+    Write dict rows from any iterable in writerows() batches.
+    Returns the number of rows written (0 if the file can't be written);
+    errors raised by `rows` itself propagate.
+    """
+    count = 0
+    reading = [False]
+    try:
+        if not is_s3_path(file_path):
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open_output(file_path, newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            for batch in _pulled_batches(rows, batch_size, reading):
+                writer.writerows(batch)
+                count += len(batch)
+        logger.info("Wrote %d records to %s", count, file_path)
+    except OSError as e:
+        if reading[0]:
+            raise
+        logger.error("Failed to write in csv file %s: %s", file_path, e)
+        return 0
+    return count
+
+
+def write_csv(file_path, data, fieldnames):
+    write_csv_stream(file_path, data, fieldnames)
+
+
+def write_json_stream(
+    file_path, records, ndjson=False, indent=4, batch_size=BATCH_SIZE
+):
+    """
+    Write records from any iterable, either as a JSON array (same layout as
+    json.dump(..., indent=indent)) or as NDJSON, one record per line.
+    Returns the number of records written (0 if the file can't be
+    written); errors raised by `records` itself propagate.
+    """
+    count = 0
+    reading = [False]
+    try:
+        dirname = os.path.dirname(file_path)
+        if dirname and not is_s3_path(file_path):
+            os.makedirs(dirname, exist_ok=True)
+        with open_output(file_path, newline="", encoding="utf-8") as f:
+            if ndjson:
+                for batch in _pulled_batches(records, batch_size, reading):
+                    f.writelines(json.dumps(r) + "\n" for r in batch)
+                    count += len(batch)
+            else:
+                pad = " " * indent if indent else ""
+                sep = ",\n" if indent else ", "
+                for batch in _pulled_batches(records, batch_size, reading):
+                    f.write(("[\n" if indent else "[") if count == 0 else sep)
+                    f.write(
+                        sep.join(
+                            textwrap.indent(json.dumps(r, indent=indent), pad)
+                            for r in batch
+                        )
+                    )
+                    count += len(batch)
+                f.write(("\n]" if indent else "]") if count else "[]")
+        logger.info("Wrote %d JSON records to %s", count, file_path)
+    except OSError as e:
+        if reading[0]:
+            raise
+        logger.error("Failed to write JSON file %s: %s", file_path, e)
+        return 0
+    return count
+
+
 def write_json(file_path, data):
+    if isinstance(data, list):
+        write_json_stream(file_path, data)
+        return
     try:
-        with open(file_path, mode="w", newline="", encoding="utf-8") as f:
+        with open_output(file_path, newline="", encoding="utf-8") as f:
             json.dump(data, f, indent=4)
-        logger.info(f"Wrote JSON data to {file_path}")
+        logger.info("Wrote JSON data to %s", file_path)
+    except Exception as e:
+        logger.error("Failed to write JSON file %s: %s", file_path, e)
+
+
+# -------- Columnar (Parquet / Arrow IPC) --------
+def _require_pyarrow():
+    global pa, pads, pq
+    if pa is not None:
+        return
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Parquet/Arrow support needs pyarrow: pip install pyarrow"
+        ) from None
+    pads, pq = pyarrow.dataset, pyarrow.parquet
+    pa = pyarrow
+
+
+def _arrow_schema(schema):
+    """Accept a pyarrow schema or a {column: type alias} dict like {"id": "int64"}."""
+    if schema is None or isinstance(schema, pa.Schema):
+        return schema
+    return pa.schema([(name, pa.type_for_alias(t)) for name, t in schema.items()])
+
+
+def _record_batches(records, batch_size, schema=None):
+    """
+    Turn an iterable of dicts into pyarrow Tables of up to batch_size rows.
+    Without a schema it is inferred from the first batch, so pass one when
+    early rows may be all-null in some column.
+    """
+    schema = _arrow_schema(schema)
+    for batch in batched(records, batch_size):
+        table = pa.Table.from_pylist(batch, schema=schema)
+        schema = table.schema  # later batches must match the first one
+        yield table
+
+
+def write_parquet(
+    file_path,
+    records,
+    compression="snappy",
+    row_group_size=ROW_GROUP_SIZE,
+    schema=None,
+):
+    """
+    Write dict records (any iterable) to Parquet, one row group per batch.
+    compression: snappy, zstd, gzip, lz4 or none. Returns rows written.
+    """
+    count = 0
+    try:
+        _require_pyarrow()
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        writer = None
+        try:
+            for table in _record_batches(records, row_group_size, schema):
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        file_path, table.schema, compression=compression
+                    )
+                writer.write_table(table)
+                count += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        logger.info("Wrote %d records to %s (%s)", count, file_path, compression)
+    except Exception as e:
+        logger.error("Failed to write Parquet file %s: %s", file_path, e)
+        return 0
+    return count
+
+
+def iter_parquet(file_path, columns=None, filters=None, batch_size=ROW_GROUP_SIZE):
+    """
+    Yield Parquet rows as dicts, reading only the requested columns.
+    filters use pyarrow's DNF form, e.g. [("amount", ">", 1000)]; row groups
+    whose min/max statistics can't match are skipped without being read.
+    Read errors are logged and re-raised (see iter_csv).
+    """
+    count = 0
+    try:
+        _require_pyarrow()
+        dataset = pads.dataset(file_path, format="parquet")
+        expression = pq.filters_to_expression(filters) if filters else None
+        for batch in dataset.to_batches(
+            columns=columns, filter=expression, batch_size=batch_size
+        ):
+            rows = batch.to_pylist()
+            count += len(rows)
+            yield from rows
+    except Exception as e:
+        logger.error(
+            "Failed to read Parquet file %s after %d rows: %s", file_path, count, e
+        )
+        raise
+    logger.info("Read %d records from %s", count, file_path)
+
+
+def read_parquet(file_path, columns=None, filters=None):
+    try:
+        _require_pyarrow()
+        table = pq.read_table(file_path, columns=columns, filters=filters)
+        data = table.to_pylist()
+        logger.info("Read %d records from %s", len(data), file_path)
+        return data
     except Exception as e:
-        logger.error(f"Failed to write JSON file {file_path}: {e}")
+        logger.error("Failed to read Parquet file %s: %s", file_path, e)
+        return []
+
+
+def write_arrow(
+    file_path, records, compression="zstd", batch_size=ROW_GROUP_SIZE, schema=None
+):
+    """
+    Write dict records to an Arrow IPC (Feather v2) file, one record batch
+    per batch_size rows. compression: zstd, lz4 or None. Returns rows written.
+    """
+    count = 0
+    try:
+        _require_pyarrow()
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = None
+        try:
+            for table in _record_batches(records, batch_size, schema):
+                if writer is None:
+                    writer = pa.ipc.new_file(file_path, table.schema, options=options)
+                writer.write_table(table)
+                count += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        logger.info("Wrote %d records to %s (%s)", count, file_path, compression)
+    except Exception as e:
+        logger.error("Failed to write Arrow file %s: %s", file_path, e)
+        return 0
+    return count
+
+
+def read_arrow(file_path, columns=None):
+    """Read an Arrow IPC file (memory-mapped), optionally only some columns."""
+    try:
+        _require_pyarrow()
+        with pa.memory_map(str(file_path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns:
+            table = table.select(columns)
+        data = table.to_pylist()
+        logger.info("Read %d records from %s", len(data), file_path)
+        return data
+    except Exception as e:
+        logger.error("Failed to read Arrow file %s: %s", file_path, e)
+        return []
+
+
+def count_columnar_rows(file_path):
+    """Row count of a Parquet or Arrow IPC file from its metadata alone."""
+    _require_pyarrow()
+    if str(file_path).endswith(".parquet"):
+        return pq.ParquetFile(file_path).metadata.num_rows
+    with pa.memory_map(str(file_path)) as source:
+        reader = pa.ipc.open_file(source)
+        return sum(
+            reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+        )
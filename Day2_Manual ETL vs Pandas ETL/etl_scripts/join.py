@@ -0,0 +1,170 @@
+import json
+import os
+import shutil
+import tempfile
+import zlib
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOIN_TYPES = ("left", "inner", "anti")
+MAX_KEYS = 1_000_000  # distinct sales keys kept in memory before partitioning
+PARTITIONS = 16
+
+
+def _key(value):
+    # CSV gives strings, JSON may give numbers: compare keys as text
+    return None if value is None else str(value)
+
+
+def _add_sale(index, key, sale, amount_field):
+    agg = index.get(key)
+    if agg is None:
+        agg = index[key] = {"count": 0, "sum": 0.0, "last_sale": None}
+    agg["count"] += 1
+    agg["sum"] += float(sale.get(amount_field) or 0)
+    agg["last_sale"] = sale
+
+
+def _merge_agg(index, key, part):
+    agg = index.get(key)
+    if agg is None:
+        index[key] = part
+        return
+    agg["count"] += part["count"]
+    agg["sum"] += part["sum"]
+    agg["last_sale"] = part["last_sale"]  # partials are written in file order
+
+
+def build_sales_index(sales, sales_key="user", amount_field="amount"):
+    """One streaming pass over sales -> {user key: count, sum, last_sale}."""
+    index = {}
+    for sale in sales:
+        key = _key(sale.get(sales_key))
+        if key is not None:
+            _add_sale(index, key, sale, amount_field)
+    return index
+
+
+def probe(users, index, user_key="name", how="left"):
+    """Stream users against the index, yielding (user, aggregate or None)."""
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unknown join type {how!r}, expected one of {JOIN_TYPES}")
+    for user in users:
+        agg = index.get(_key(user.get(user_key)))
+        if how == "inner" and agg is None:
+            continue
+        if how == "anti" and agg is not None:
+            continue
+        yield user, agg
+
+
+class _Partitions:
+    """N append-only NDJSON files, records routed by a stable key hash."""
+
+    def __init__(self, directory, name, count):
+        self.paths = [
+            os.path.join(directory, f"{name}_{i:03d}.ndjson") for i in range(count)
+        ]
+        self._files = [open(p, "w", encoding="utf-8") for p in self.paths]
+
+    def write(self, key, record):
+        idx = zlib.crc32(key.encode("utf-8")) % len(self._files)
+        self._files[idx].write(json.dumps([key, record]) + "\n")
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+    @staticmethod
+    def read(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def hash_join(
+    users,
+    sales,
+    user_key="name",
+    sales_key="user",
+    how="left",
+    amount_field="amount",
+    max_keys=MAX_KEYS,
+    partitions=PARTITIONS,
+    tmp_dir=None,
+):
+    """
+    Join streamed users with per-user sales aggregates in O(n + m).
+
+    The sales side is aggregated into an in-memory hash index. If it grows
+    past max_keys distinct users, the partial aggregates are spilled to
+    hash partitions on disk (grace hash join): users are partitioned the
+    same way and each partition is joined on its own. In that case output
+    rows are grouped by partition instead of following the users order.
+
+    Yields (user, aggregate) pairs; aggregate is None for users without
+    sales (left/anti joins).
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unknown join type {how!r}, expected one of {JOIN_TYPES}")
+
+    index, sales_parts, user_parts, workdir = {}, None, None, None
+    try:
+        for sale in sales:
+            key = _key(sale.get(sales_key))
+            if key is None:
+                continue
+            _add_sale(index, key, sale, amount_field)
+            if len(index) > max_keys:
+                if sales_parts is None:
+                    workdir = tempfile.mkdtemp(prefix="grace_join_", dir=tmp_dir)
+                    sales_parts = _Partitions(workdir, "sales", partitions)
+                    logger.info(
+                        "Sales index over %d keys, switching to %d-way grace hash join",
+                        max_keys,
+                        partitions,
+                    )
+                for k, agg in index.items():
+                    sales_parts.write(k, agg)
+                index.clear()
+
+        if sales_parts is None:
+            yield from probe(users, index, user_key, how)
+            return
+
+        for k, agg in index.items():
+            sales_parts.write(k, agg)
+        index.clear()
+        sales_parts.close()
+
+        user_parts = _Partitions(workdir, "users", partitions)
+        unkeyed = []  # users without a join key never match any sale
+        for user in users:
+            key = _key(user.get(user_key))
+            if key is None:
+                if how != "inner":
+                    unkeyed.append(user)
+                continue
+            user_parts.write(key, user)
+        user_parts.close()
+
+        for sales_path, users_path in zip(sales_parts.paths, user_parts.paths):
+            part_index = {}
+            for k, agg in _Partitions.read(sales_path):
+                _merge_agg(part_index, k, agg)
+            yield from probe(
+                (user for _, user in _Partitions.read(users_path)),
+                part_index,
+                user_key,
+                how,
+            )
+        for user in unkeyed:
+            yield user, None
+    finally:
+        for parts in (sales_parts, user_parts):
+            if parts is not None:
+                parts.close()
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
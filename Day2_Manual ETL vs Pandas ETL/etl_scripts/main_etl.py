@@ -1,30 +1,165 @@
-from etl_scripts.file_handler import read_csv, write_csv, read_json
+import argparse
+from itertools import chain
+from etl_scripts import file_handler, join
+from etl_scripts.build_cache import StageCache
+from etl_scripts.file_handler import (
+    iter_csv,
+    iter_json,
+    write_arrow,
+    write_csv_stream,
+    write_parquet,
+)
+from etl_scripts.join import JOIN_TYPES, MAX_KEYS, hash_join
+from etl_scripts.pipeline import Pipeline
 from utils.logger import get_logger
 from pathlib import Path
 
 logger = get_logger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
+FIELDNAMES = ["username", "email", "sales_count", "sales_total", "last_sale_id"]
+COLUMN_TYPES = {
+    "username": "string",
+    "email": "string",
+    "sales_count": "int64",
+    "sales_total": "double",
+    "last_sale_id": "int64",
+}
+FORMATS = ("csv", "parquet", "arrow")
+DEFAULT_COMPRESSION = {"parquet": "snappy", "arrow": "zstd"}
 
 
-def main():
-    users_csv = DATA_DIR / "input" / "users.csv"
-    sales_json = DATA_DIR / "input" / "sales.json"
-    output_csv = DATA_DIR / "output" / "transformed_data.csv"
+def write_output(output_path, rows, fmt, compression=None):
+    if fmt == "csv":
+        return write_csv_stream(output_path, rows, FIELDNAMES)
+    compression = compression or DEFAULT_COMPRESSION[fmt]
+    writer = write_parquet if fmt == "parquet" else write_arrow
+    return writer(output_path, rows, compression=compression, schema=COLUMN_TYPES)
 
-    users = read_csv(users_csv)
-    sales = read_json(sales_json)
 
-    transformed = [
-        {"username": u["name"], "email": u["email"], "sales_count": len(sales)}
-        for u in users
-    ]
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Users x sales ETL (manual, streaming)")
+    p.add_argument(
+        "--join",
+        choices=JOIN_TYPES,
+        default="left",
+        help="left: all users, inner: users with sales, anti: users without sales",
+    )
+    p.add_argument(
+        "--max-keys",
+        type=int,
+        default=MAX_KEYS,
+        help="Distinct sales users kept in memory before a grace hash join",
+    )
+    p.add_argument(
+        "--format", choices=FORMATS, default="csv", help="Output file format"
+    )
+    p.add_argument(
+        "--compression",
+        help="Parquet/Arrow codec (default snappy for parquet, zstd for arrow)",
+    )
+    p.add_argument("--input-dir", type=Path, default=DATA_DIR / "input")
+    p.add_argument("--output-dir", type=Path, default=DATA_DIR / "output")
+    p.add_argument(
+        "--force", action="store_true", help="Rerun even if inputs are unchanged"
+    )
+    return p.parse_args(argv)
 
-    if transformed:
-        write_csv(output_csv, transformed, ["username", "email", "sales_count"])
-        logger.info("Transformation Comapleted!")
-    else:
+
+def transform(joined):
+    for u, agg in joined:
+        yield {
+            "username": u["name"],
+            "email": u["email"],
+            "sales_count": agg["count"] if agg else 0,
+            "sales_total": agg["sum"] if agg else 0.0,
+            "last_sale_id": agg["last_sale"].get("id") if agg else None,
+        }
+
+
+def load(rows, output_path, args):
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
         logger.warning("No data transformed!")
+        return 0
+    count = write_output(
+        output_path, chain([first], rows), args.format, args.compression
+    )
+    logger.info("Transformation Comapleted!")
+    return count
+
+
+def add_stages(pipeline, args):
+    """
+    Declare the users x sales job (extract, join, load) on a Pipeline.
+    Returns a finish(results) callback that records the build cache once the
+    pipeline has succeeded, or None without adding anything when the cached
+    output is fresh.
+    """
+    users_csv = args.input_dir / "users.csv"
+    sales_json = args.input_dir / "sales.json"
+    output_path = args.output_dir / f"transformed_data.{args.format}"
+
+    # Skip the join when inputs, code and options match the last run
+    cache = StageCache(f"sales_join_{args.format}", args.output_dir)
+    stage = {
+        "inputs": [users_csv, sales_json],
+        "outputs": [output_path],
+        "code": [__file__, join.__file__, file_handler.__file__],
+        "config": {
+            "join": args.join,
+            "max_keys": args.max_keys,
+            "compression": args.compression,
+        },
+    }
+    if cache.is_fresh(**stage) and not args.force:
+        logger.info("Inputs unchanged, keeping %s", output_path)
+        return None
+
+    # Users and sales are extracted concurrently; one streaming pass builds
+    # the per-user sales index, then users are streamed through it straight
+    # into the writer
+    pipeline.add("extract_users", lambda: iter_csv(users_csv), stream=True)
+    pipeline.add("extract_sales", lambda: iter_json(sales_json), stream=True)
+    pipeline.add(
+        "join",
+        lambda users, sales: transform(
+            hash_join(
+                users,
+                sales,
+                user_key="name",
+                sales_key="user",
+                how=args.join,
+                max_keys=args.max_keys,
+            )
+        ),
+        deps=("extract_users", "extract_sales"),
+        stream=True,
+    )
+    pipeline.add(
+        "load",
+        lambda rows: load(rows, output_path, args),
+        deps=("join",),
+    )
+
+    def finish(results):
+        if results["load"]:
+            cache.record(stage["outputs"])
+
+    return finish
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pipeline = Pipeline("sales_join")
+    finish = add_stages(pipeline, args)
+    if finish is None:
+        return None
+    results = pipeline.run()
+    pipeline.log_timings()
+    finish(results)
+    return results["load"]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from utils.logger import forward_from_processes, forward_to_parent, get_logger
+
+logger = get_logger(__name__)
+
+QUEUE_SIZE = 8  # batches buffered between a streaming stage and its consumer
+STREAM_BATCH = 512  # items per queue put: amortises locking per record
+POLL_SECONDS = 0.1  # how often blocked puts/gets check for failures
+
+
+class PipelineError(Exception):
+    """A stage failed; the original exception is chained as __cause__."""
+
+    def __init__(self, stage, error):
+        super().__init__(f"Stage {stage!r} failed: {error}")
+        self.stage = stage
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class _Stream:
+    """Bounded queue of item batches from one producer to one consumer."""
+
+    _END = object()
+
+    def __init__(self, failed, maxsize, batch_size):
+        self._queue = queue.Queue(maxsize)
+        self._failed = failed
+        self._batch_size = batch_size
+        self.closed = threading.Event()  # consumer stopped reading early
+        self.items = 0
+        self.blocked_s = 0.0  # producer time spent waiting on a full queue
+
+    def _put(self, value):
+        start = time.perf_counter()
+        while True:
+            if self._failed.is_set() or self.closed.is_set():
+                raise _Cancelled
+            try:
+                self._queue.put(value, timeout=POLL_SECONDS)
+                break
+            except queue.Full:
+                pass
+        self.blocked_s += time.perf_counter() - start
+
+    def feed(self, iterable):
+        it = iter(iterable)
+        try:
+            while batch := list(islice(it, self._batch_size)):
+                self._put(batch)
+                self.items += len(batch)
+            self._put(self._END)
+        except _Cancelled:
+            if self._failed.is_set() or not self.closed.is_set():
+                raise
+            # Consumer is done with us (e.g. stopped early): not an error
+
+    def __iter__(self):
+        while True:
+            try:
+                batch = self._queue.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                if self._failed.is_set():
+                    raise _Cancelled
+                continue
+            if batch is self._END:
+                return
+            yield from batch
+
+
+class _Stage:
+    def __init__(self, name, fn, deps, stream, executor, batch_size):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.stream = stream
+        self.executor = executor
+        self.batch_size = batch_size
+        self.future = Future()
+        self.output = None  # _Stream for streaming stages
+        self.timing = {"stage": name, "status": "pending"}
+
+
+def _call(fn, args):
+    return fn(*args)
+
+
+class Pipeline:
+    """
+    A small DAG runtime for ETL stages.
+
+    Stages are declared with add(name, fn, deps); fn is called with the
+    results of its deps, in order. Every stage gets its own worker thread,
+    so independent stages run concurrently as soon as their inputs are
+    ready. A stage declared with stream=True returns an iterable that is
+    fed through a bounded queue to its (single) consumer, which starts
+    right away and reads items as they are produced; a full queue blocks
+    the producer (backpressure). executor="process" runs a stage in a
+    separate process (fn and inputs must be picklable, no streams), for
+    CPU-bound work that would otherwise contend for the GIL.
+
+    run() returns {stage: result} and fills `timings`; if a stage fails the
+    rest are cancelled or skipped and PipelineError is raised.
+    """
+
+    def __init__(
+        self,
+        name="pipeline",
+        queue_size=QUEUE_SIZE,
+        batch_size=STREAM_BATCH,
+        process_workers=None,
+    ):
+        self.name = name
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.process_workers = process_workers
+        self.timings = []
+        self._stages = {}
+        self._failed = threading.Event()
+
+    def add(self, name, fn, deps=(), stream=False, executor="thread", batch_size=None):
+        """
+        Declare a stage. batch_size overrides the pipeline's items per queue
+        put for this stream (use 1 when items are already large, e.g. chunks).
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage {name!r}")
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor {executor!r}")
+        for dep in deps:
+            upstream = self._stages.get(dep)
+            if upstream is None:  # declaring in order also rules out cycles
+                raise ValueError(f"Stage {name!r} depends on unknown stage {dep!r}")
+            if upstream.stream and executor == "process":
+                raise ValueError(f"Process stage {name!r} can't read stream {dep!r}")
+            if upstream.stream and any(dep in s.deps for s in self._stages.values()):
+                raise ValueError(f"Stream {dep!r} already has a consumer")
+        if stream and executor == "process":
+            raise ValueError(f"Process stage {name!r} can't stream its output")
+        self._stages[name] = _Stage(
+            name, fn, deps, stream, executor, batch_size or self.batch_size
+        )
+        return self
+
+    def _run_stage(self, stage, start, processes):
+        timing = stage.timing
+        try:
+            # Streams are handed over at once, other results are awaited
+            upstreams = [self._stages[dep] for dep in stage.deps]
+            args = [u.output if u.stream else u.future.result() for u in upstreams]
+        except BaseException as e:
+            timing["status"] = "skipped"
+            stage.future.set_exception(e)
+            return
+
+        timing["start_s"] = time.perf_counter() - start
+        timing["status"] = "running"
+        try:
+            if stage.executor == "process":
+                result = processes.submit(_call, stage.fn, args).result()
+            else:
+                result = stage.fn(*args)
+            if stage.stream:
+                stage.output.feed(result)
+                timing["items"] = stage.output.items
+                timing["blocked_s"] = stage.output.blocked_s
+                result = None
+            timing["status"] = "ok"
+            stage.future.set_result(result)
+        except _Cancelled as e:
+            timing["status"] = "cancelled"
+            stage.future.set_exception(e)
+        except BaseException as e:
+            if not self._failed.is_set():
+                logger.error("Stage %s failed: %s", stage.name, e)
+            timing["status"] = "failed"
+            self._failed.set()
+            stage.future.set_exception(e)
+        finally:
+            for dep in stage.deps:
+                upstream = self._stages[dep]
+                if upstream.stream:
+                    upstream.output.closed.set()
+            timing["end_s"] = time.perf_counter() - start
+            timing["duration_s"] = timing["end_s"] - timing["start_s"]
+
+    def run(self):
+        consumed = {dep for s in self._stages.values() for dep in s.deps}
+        for stage in self._stages.values():
+            if stage.stream and stage.name not in consumed:
+                raise ValueError(f"Stream {stage.name!r} has no consumer")
+        self._failed.clear()
+        for stage in self._stages.values():
+            stage.future = Future()
+            stage.timing = {"stage": stage.name, "status": "pending"}
+            if stage.stream:
+                stage.output = _Stream(self._failed, self.queue_size, stage.batch_size)
+
+        processes = log_listener = None
+        if any(s.executor == "process" for s in self._stages.values()):
+            # spawn, not fork: forking a process that runs threads is unsafe.
+            # Workers log through this process, not to a log file of their own
+            mp_context = multiprocessing.get_context("spawn")
+            log_queue, log_listener = forward_from_processes(mp_context)
+            processes = ProcessPoolExecutor(
+                self.process_workers,
+                mp_context=mp_context,
+                initializer=forward_to_parent,
+                initargs=(log_queue,),
+            )
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max(len(self._stages), 1),
+                thread_name_prefix=self.name,
+            ) as threads:
+                for stage in self._stages.values():
+                    threads.submit(self._run_stage, stage, start, processes)
+        finally:
+            if processes is not None:
+                processes.shutdown()
+                log_listener.stop()
+        self.timings = [s.timing for s in self._stages.values()]
+        self.wall_s = time.perf_counter() - start
+
+        for stage in self._stages.values():
+            if stage.timing["status"] == "failed":
+                raise PipelineError(stage.name, stage.future.exception()) from (
+                    stage.future.exception()
+                )
+        return {name: s.future.result() for name, s in self._stages.items()}
+
+    def log_timings(self):
+        """One log line per stage: start/end offsets, duration, stream stats."""
+        for t in self.timings:
+            if "duration_s" not in t:
+                logger.info("[%s] %-22s %s", self.name, t["stage"], t["status"])
+                continue
+            extra = ""
+            if "items" in t:
+                extra = f", {t['items']} items, blocked {t['blocked_s']:.3f}s"
+            logger.info(
+                "[%s] %-22s %s %.3fs -> %.3fs (%.3fs%s)",
+                self.name,
+                t["stage"],
+                t["status"],
+                t["start_s"],
+                t["end_s"],
+                t["duration_s"],
+                extra,
+            )
+        logger.info("[%s] total %.3fs", self.name, self.wall_s)
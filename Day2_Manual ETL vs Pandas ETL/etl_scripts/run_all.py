@@ -0,0 +1,60 @@
+import argparse
+from functools import partial
+from pathlib import Path
+from etl_scripts import etl_employees, main_etl
+from etl_scripts.pipeline import Pipeline
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(
+        description="Run the sales join and employees ETL jobs together"
+    )
+    p.add_argument("--input-dir", type=Path, default=DATA_DIR / "input")
+    p.add_argument("--output-dir", type=Path, default=DATA_DIR / "output")
+    p.add_argument(
+        "--force", action="store_true", help="Rerun even if inputs are unchanged"
+    )
+    p.add_argument(
+        "--threads-only",
+        action="store_true",
+        help="Run the employees job on threads in this process instead of "
+        "in its own process",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    common = ["--input-dir", str(args.input_dir), "--output-dir", str(args.output_dir)]
+    if args.force:
+        common.append("--force")
+
+    pipeline = Pipeline("run_all")
+    # Build caches are only recorded once the whole pipeline has succeeded
+    finishers = [main_etl.add_stages(pipeline, main_etl.parse_args(common))]
+    employees_args = etl_employees.parse_args(common)
+    if args.threads_only:
+        finishers.append(etl_employees.add_stages(pipeline, employees_args))
+    elif etl_employees.is_fresh(employees_args):
+        logger.info("Employees input unchanged, not starting its process")
+    else:
+        # The pandas job is CPU-bound: give it its own interpreter (and GIL)
+        # so it doesn't slow down the pure-Python join running next to it
+        pipeline.add(
+            "employees", partial(etl_employees.main, common), executor="process"
+        )
+    results = pipeline.run()
+    pipeline.log_timings()
+    for finish in finishers:
+        if finish is not None:
+            finish(results)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# test_build_cache.py
+import json
+import os
+import pytest
+from benchmarks.generate_data import generate
+from etl_scripts import etl_employees, main_etl, run_all
+from etl_scripts.build_cache import CACHE_DIR_NAME, StageCache
+from etl_scripts.pipeline import PipelineError
+
+
+@pytest.fixture
+def files(tmp_path):
+    src, out = tmp_path / "in.txt", tmp_path / "out" / "result.txt"
+    src.write_text("a,b\n1,2\n")
+    out.parent.mkdir()
+    return src, out
+
+
+def build(cache, src, out, config=None):
+    """One stage run: check, then 'build' out from src and record."""
+    stage = {"inputs": [src], "outputs": [out], "config": config}
+    if cache.is_fresh(**stage):
+        return False
+    out.write_text(src.read_text().upper())
+    cache.record([out])
+    return True
+
+
+def test_stage_cache_skips_until_something_changes(files):
+    src, out = files
+    assert build(StageCache("s", out.parent), src, out)
+    # A new StageCache reads the manifest the last one wrote
+    assert not build(StageCache("s", out.parent), src, out)
+
+    # Touching the input without changing it is not a change
+    os.utime(src, ns=(1, 1))
+    assert not build(StageCache("s", out.parent), src, out)
+
+    src.write_text("a,b\n1,3\n")
+    assert build(StageCache("s", out.parent), src, out)
+    assert build(StageCache("s", out.parent), src, out, config={"join": "inner"})
+    assert not build(StageCache("s", out.parent), src, out, config={"join": "inner"})
+
+    out.write_text("edited by hand")
+    assert build(StageCache("s", out.parent), src, out)
+    out.unlink()
+    assert build(StageCache("s", out.parent), src, out)
+
+    # Stages keep separate manifests
+    assert build(StageCache("other", out.parent), src, out)
+
+
+def test_stage_cache_records_the_inputs_seen_before_the_run(files):
+    src, out = files
+    cache = StageCache("s", out.parent)
+    assert not cache.is_fresh([src], [out])
+    out.write_text("built")
+    src.write_text("edited while the stage was running")
+    cache.record([out])
+    assert not StageCache("s", out.parent).is_fresh([src], [out])
+
+
+def test_stage_cache_errors(files):
+    src, out = files
+    cache = StageCache("s", out.parent)
+    with pytest.raises(RuntimeError):
+        cache.record([out])
+    assert not cache.is_fresh([src.with_name("missing.txt")], [out])
+
+    assert build(cache, src, out)
+    cache.path.write_text("{not json")
+    assert build(StageCache("s", out.parent), src, out)
+
+    cache = StageCache("s", out.parent)
+    cache.invalidate()
+    assert not cache.path.exists()
+    assert build(cache, src, out)
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    input_dir = generate(str(tmp_path / "input"), 200, seed=9)
+    return ["--input-dir", input_dir, "--output-dir", str(tmp_path / "output")]
+
+
+def test_main_etl_reruns_only_when_needed(dirs, tmp_path):
+    assert main_etl.main(dirs) == 200
+    assert main_etl.main(dirs) is None
+    assert main_etl.main([*dirs, "--force"]) == 200
+    assert main_etl.main([*dirs, "--join", "inner"]) < 200
+
+    users = tmp_path / "input" / "users.csv"
+    with open(users, "a", encoding="utf-8") as f:
+        f.write("Zed,zed@example.com\n")
+    assert main_etl.main([*dirs, "--join", "inner"]) is not None
+    assert main_etl.main(dirs) == 201
+
+
+def test_failed_runs_are_not_recorded(dirs, monkeypatch):
+    def broken_load(*args):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(main_etl, "load", broken_load)
+        with pytest.raises(PipelineError):
+            main_etl.main(dirs)
+        m.setattr(etl_employees, "load", broken_load)
+        with pytest.raises(PipelineError):
+            etl_employees.main(dirs)
+    assert not os.path.exists(os.path.join(dirs[3], CACHE_DIR_NAME))
+
+    assert main_etl.main(dirs) == 200
+    assert etl_employees.main(dirs) > 0
+
+
+def test_employees_and_run_all_skip_fresh_jobs(dirs, tmp_path):
+    output_dir = tmp_path / "output"
+    results = run_all.main(dirs)
+    assert results["load"] == 200 and results["employees"] > 0
+    manifests = sorted(os.listdir(output_dir / CACHE_DIR_NAME))
+    assert manifests == ["employees_csv.json", "sales_join_csv.json"]
+
+    assert etl_employees.main(dirs) is None
+    assert run_all.main(dirs) == {}
+
+    # Only the employees input changed: only its job runs again
+    with open(tmp_path / "input" / "employess.csv", "w", encoding="utf-8") as f:
+        f.write("id,first_name,last_name,department,salary\n1,Ann,Lee,HR,100\n")
+    assert run_all.main([*dirs, "--threads-only"]).keys() == {
+        "employees_extract",
+        "employees_transform",
+        "employees_load",
+        "employees_verify",
+    }
+    with open(output_dir / CACHE_DIR_NAME / "employees_csv.json") as f:
+        assert json.load(f)["stage"] == "employees_csv"
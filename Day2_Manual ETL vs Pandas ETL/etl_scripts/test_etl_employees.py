@@ -0,0 +1,60 @@
+# test_etl_employees.py
+import json
+import pytest
+from benchmarks.generate_data import generate
+from etl_scripts import etl_employees
+from etl_scripts.etl_employees import SCHEMA, read_chunks
+from etl_scripts.file_handler import read_arrow, read_parquet
+
+pd = pytest.importorskip("pandas")
+
+
+@pytest.fixture(scope="module")
+def input_dir(tmp_path_factory):
+    path = generate(str(tmp_path_factory.mktemp("input")), 500, seed=3)
+    with open(f"{path}/employess.csv", "a", encoding="utf-8") as f:
+        f.write(",No,Id,Engineering,50000\n")  # dropped like a missing salary
+    return path
+
+
+def run(input_dir, output_dir, *args):
+    argv = ["--input-dir", input_dir, "--output-dir", str(output_dir), *args]
+    return etl_employees.main(argv)
+
+
+def records(path):
+    """Output rows without updated_at (the run's own timestamp)."""
+    text = path.read_text(encoding="utf-8")
+    rows = (
+        json.loads(text) if text.startswith("[") else map(json.loads, text.splitlines())
+    )
+    return [{k: v for k, v in row.items() if k != "updated_at"} for row in rows]
+
+
+@pytest.mark.parametrize("chunksize", [1, 37, 10_000])
+def test_chunked_mode_matches_whole_file_mode(input_dir, tmp_path, chunksize):
+    whole = run(input_dir, tmp_path / "whole")
+    chunked = run(input_dir, tmp_path / "chunked", "--chunksize", str(chunksize))
+    expected = records(tmp_path / "whole" / "employees_summary.csv")
+    assert whole == chunked == len(expected) < 501
+    assert records(tmp_path / "chunked" / "employees_summary.ndjson") == expected
+
+
+def test_chunks_are_read_with_the_schema(input_dir):
+    chunk = next(read_chunks(f"{input_dir}/employess.csv", 100))
+    assert {c: str(t) for c, t in chunk.dtypes.items()} == SCHEMA
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_output_matches_json(input_dir, tmp_path, fmt):
+    pytest.importorskip("pyarrow")
+    read = read_parquet if fmt == "parquet" else read_arrow
+    run(input_dir, tmp_path / "json")
+    expected = records(tmp_path / "json" / "employees_summary.csv")
+    for mode in ([], ["--chunksize", "64"]):
+        out = tmp_path / f"{fmt}{len(mode)}"
+        assert run(input_dir, out, "--format", fmt, *mode) == len(expected)
+        rows = read(str(out / f"employees_summary.{fmt}"))
+        rows = [{k: v for k, v in r.items() if k != "updated_at"} for r in rows]
+        # The JSON writer rounds floats to 10 digits; the columnar ones don't
+        assert rows == [{**r, "salary": pytest.approx(r["salary"])} for r in expected]
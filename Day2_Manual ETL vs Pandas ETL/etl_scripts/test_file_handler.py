@@ -0,0 +1,160 @@
+# test_file_handler.py
+import io
+import json
+import pytest
+from etl_scripts.file_handler import (
+    _json_values,
+    count_columnar_rows,
+    iter_json,
+    iter_parquet,
+    read_arrow,
+    read_csv,
+    read_json,
+    read_parquet,
+    write_arrow,
+    write_csv_stream,
+    write_json_stream,
+    write_parquet,
+)
+
+ROWS = [{"name": f"user{i}", "score": str(i % 7)} for i in range(25)]
+
+
+def failing_source(n, exc):
+    yield from ROWS[:n]
+    raise exc
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 1000])
+def test_writers_round_trip(tmp_path, batch_size):
+    csv_path, json_path = tmp_path / "out.csv", tmp_path / "out.json"
+    assert (
+        write_csv_stream(str(csv_path), iter(ROWS), ["name", "score"], batch_size) == 25
+    )
+    assert read_csv(str(csv_path)) == ROWS
+
+    assert write_json_stream(str(json_path), iter(ROWS), batch_size=batch_size) == 25
+    assert json_path.read_text(encoding="utf-8") == json.dumps(ROWS, indent=4)
+
+    for indent in (None, 0):
+        write_json_stream(
+            str(json_path), iter(ROWS), indent=indent, batch_size=batch_size
+        )
+        assert json.loads(json_path.read_text(encoding="utf-8")) == ROWS
+
+    ndjson = tmp_path / "out.ndjson"
+    write_json_stream(str(ndjson), iter(ROWS), ndjson=True, batch_size=batch_size)
+    lines = ndjson.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+
+
+def test_empty_input(tmp_path):
+    assert write_json_stream(str(tmp_path / "e.json"), iter([])) == 0
+    assert read_json(str(tmp_path / "e.json")) == []
+    assert write_csv_stream(str(tmp_path / "e.csv"), iter([]), ["name"]) == 0
+    assert (tmp_path / "e.csv").read_bytes() == b"name\r\n"
+
+
+@pytest.mark.parametrize("exc", [ValueError("bad row"), FileNotFoundError("gone")])
+def test_source_errors_propagate(tmp_path, exc):
+    # A reader failing mid-stream must not look like a short, successful write
+    with pytest.raises(type(exc)):
+        write_csv_stream(
+            str(tmp_path / "a.csv"), failing_source(10, exc), ["name", "score"], 4
+        )
+    with pytest.raises(type(exc)):
+        write_json_stream(str(tmp_path / "a.json"), failing_source(10, exc))
+    with pytest.raises(type(exc)):
+        write_json_stream(str(tmp_path / "a.ndjson"), failing_source(0, exc), True)
+
+
+def test_unwritable_output_returns_zero(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    assert write_csv_stream(str(blocker / "a.csv"), iter(ROWS), ["name", "score"]) == 0
+    assert write_json_stream(str(blocker / "a.json"), iter(ROWS)) == 0
+
+
+# Numbers, escapes and multi-byte text, so read buffers cut through all of them
+VALUES = [
+    {"id": i, "amount": -1.5e3 * i, "name": f'Σ\\"{i}', "tags": [i, None, True]}
+    for i in range(40)
+]
+
+
+def parse(text, read_size):
+    is_array, values = _json_values(io.StringIO(text), read_size)
+    return is_array, list(values)
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64, 65536])
+def test_json_values_split_across_reads(read_size):
+    array = json.dumps(VALUES, indent=2)
+    assert parse(array, read_size) == (True, VALUES)
+    assert parse(json.dumps(VALUES, separators=(",", ":")), read_size) == (True, VALUES)
+
+    ndjson = "".join(json.dumps(v) + "\n" for v in VALUES)
+    assert parse(ndjson, read_size) == (False, VALUES)
+    assert parse("1 22 -3.25e2\n\n[4]", read_size) == (False, [1, 22, -325.0, [4]])
+    assert parse('{"a": 1}', read_size) == (False, [{"a": 1}])
+    assert parse(" [ ] ", read_size) == (True, [])
+    assert parse("", read_size) == (False, [])
+
+
+@pytest.mark.parametrize("tail", ['{"id": 99', ", {", ', {"id": 1}'])
+def test_json_corrupt_tail_raises_after_good_values(tail):
+    text = json.dumps(VALUES[:3])[:-1] + tail  # array loses its "]"
+    _, values = _json_values(io.StringIO(text), 5)
+    assert [next(values) for _ in range(3)] == VALUES[:3]
+    with pytest.raises(json.JSONDecodeError):
+        list(values)
+
+    _, values = _json_values(io.StringIO('{"a": 1}\n{"b": '), 5)
+    assert next(values) == {"a": 1}
+    with pytest.raises(json.JSONDecodeError):
+        next(values)
+
+
+def test_iter_json_reads_files(tmp_path):
+    path = tmp_path / "v.ndjson"
+    path.write_text("".join(json.dumps(v) + "\n" for v in VALUES), encoding="utf-8")
+    assert list(iter_json(str(path))) == VALUES
+
+    path.write_text(json.dumps(VALUES)[:-1], encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_json(str(path)))
+    assert read_json(str(path)) == []  # the non-streaming reader logs instead
+
+
+@pytest.mark.parametrize("batch_size", [7, 1000])
+def test_columnar_round_trip(tmp_path, batch_size):
+    pytest.importorskip("pyarrow")
+    rows = [{"id": i, "user": f"user{i % 5}", "amount": i * 1.5} for i in range(50)]
+    parquet, arrow = str(tmp_path / "a.parquet"), str(tmp_path / "a.arrow")
+
+    assert write_parquet(parquet, iter(rows), row_group_size=batch_size) == 50
+    assert read_parquet(parquet) == rows
+    assert list(iter_parquet(parquet, batch_size=3)) == rows
+    assert read_parquet(parquet, columns=["id"], filters=[("id", ">=", 45)]) == [
+        {"id": i} for i in range(45, 50)
+    ]
+    assert write_arrow(arrow, iter(rows), batch_size=batch_size) == 50
+    assert read_arrow(arrow) == rows
+    assert read_arrow(arrow, columns=["user"]) == [{"user": r["user"]} for r in rows]
+    assert count_columnar_rows(parquet) == count_columnar_rows(arrow) == 50
+
+
+def test_columnar_schema_and_errors(tmp_path):
+    pytest.importorskip("pyarrow")
+    # The first batch is all-null in "amount": only the schema gives its type
+    rows = [{"id": 1, "amount": None}] + [{"id": i, "amount": 2.5} for i in range(9)]
+    path = str(tmp_path / "s.parquet")
+    schema = {"id": "int64", "amount": "double"}
+    assert write_parquet(path, iter(rows), row_group_size=1, schema=schema) == 10
+    assert read_parquet(path) == rows
+
+    assert write_parquet(path, iter([{"id": 1}, {"id": "x"}]), row_group_size=1) == 0
+    missing = str(tmp_path / "missing.parquet")
+    assert read_parquet(missing) == [] and read_arrow(missing) == []
+    with pytest.raises(FileNotFoundError):
+        list(iter_parquet(missing))
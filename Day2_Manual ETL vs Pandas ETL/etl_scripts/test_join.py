@@ -0,0 +1,71 @@
+# test_join.py
+import random
+import pytest
+from etl_scripts.join import JOIN_TYPES, build_sales_index, hash_join, probe
+
+
+def sample_data(users=300, sales=2_000, seed=11):
+    rng = random.Random(seed)
+    user_rows = [
+        {"name": f"user{i}", "email": f"u{i}@example.com"} for i in range(users)
+    ]
+    user_rows.append({"name": None, "email": "nobody@example.com"})
+    sale_rows = []
+    for i in range(sales):
+        # Some sales belong to unknown users, some have no user at all
+        who = rng.choice([f"user{rng.randrange(users)}", "guest", None])
+        sale_rows.append({"id": i + 1, "user": who, "amount": rng.randrange(1, 500)})
+    return user_rows, sale_rows
+
+
+def rows(pairs):
+    """Join output as comparable tuples, ignoring output order."""
+    out = []
+    for user, agg in pairs:
+        summary = None
+        if agg is not None:
+            summary = (agg["count"], round(agg["sum"], 6), agg["last_sale"]["id"])
+        out.append((str(user["name"]), user["email"], summary))
+    return sorted(out)
+
+
+@pytest.mark.parametrize("how", JOIN_TYPES)
+def test_grace_join_matches_in_memory_join(how, tmp_path):
+    users, sales = sample_data()
+    expected = rows(probe(users, build_sales_index(sales), how=how))
+
+    grace = hash_join(
+        iter(users), iter(sales), how=how, max_keys=20, partitions=4, tmp_dir=tmp_path
+    )
+    assert rows(grace) == expected
+    assert list(tmp_path.iterdir()) == []  # partitions are removed
+
+
+@pytest.mark.parametrize("how", JOIN_TYPES)
+def test_in_memory_join_keeps_users_order(how):
+    users, sales = sample_data(users=50, sales=100)
+    joined = [user["name"] for user, _ in hash_join(users, sales, how=how)]
+    assert joined == sorted(joined, key=[u["name"] for u in users].index)
+
+
+def test_join_semantics():
+    users = [{"name": "a", "email": "a@x"}, {"name": "b", "email": "b@x"}]
+    sales = [
+        {"id": 1, "user": "a", "amount": "10.5"},
+        {"id": 2, "user": "a", "amount": 2},
+        {"id": 3, "user": "zed", "amount": 7},
+    ]
+    left = list(hash_join(users, sales))
+    assert [(u["name"], agg and agg["count"]) for u, agg in left] == [
+        ("a", 2),
+        ("b", None),
+    ]
+    assert left[0][1]["sum"] == 12.5
+    assert left[0][1]["last_sale"]["id"] == 2
+    assert [u["name"] for u, _ in hash_join(users, sales, how="inner")] == ["a"]
+    assert [u["name"] for u, _ in hash_join(users, sales, how="anti")] == ["b"]
+
+
+def test_unknown_join_type():
+    with pytest.raises(ValueError):
+        list(hash_join([], [], how="outer"))
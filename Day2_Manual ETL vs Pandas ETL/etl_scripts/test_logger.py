@@ -0,0 +1,63 @@
+# test_logger.py
+import os
+import queue
+import logging
+import threading
+import pytest
+from etl_scripts.pipeline import Pipeline
+from utils import logger as log_backend
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """A fresh, not yet started backend; the session's is restored after."""
+    monkeypatch.setattr(log_backend, "_log_queue", queue.SimpleQueue())
+    monkeypatch.setattr(log_backend, "_listener", None)
+    monkeypatch.setattr(log_backend, "_shut_down", False)
+    log = logging.getLogger("test_logger.backend")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    handler = log_backend.InProcessQueueHandler(log_backend._log_queue)
+    log.addHandler(handler)
+    yield log
+    log.removeHandler(handler)
+    log_backend.shutdown_logging()
+
+
+def log_in_worker():
+    log_backend.get_logger("test_logger.worker").info("worker %d", os.getpid())
+    return os.getpid()
+
+
+def test_first_record_starts_and_shutdown_flushes(backend, tmp_path):
+    log_file = tmp_path / "app.log"
+    log_backend.configure_logging(log_file=log_file)
+    backend.info("queued %d", 1)
+    log_backend.shutdown_logging()
+    assert "queued 1" in log_file.read_text(encoding="utf-8")
+
+
+def test_records_after_shutdown_do_not_restart_the_listener(backend, tmp_path):
+    log_backend.configure_logging(log_file=tmp_path / "app.log")
+    log_backend.shutdown_logging()
+    threads = threading.active_count()
+    backend.info("late record, e.g. from an atexit hook")
+    assert log_backend._listener is None
+    assert threading.active_count() == threads
+
+    # An explicit configure_logging() brings it back
+    log_backend.configure_logging(log_file=tmp_path / "again.log")
+    backend.info("back")
+    log_backend.shutdown_logging()
+    assert "back" in (tmp_path / "again.log").read_text(encoding="utf-8")
+
+
+def test_process_stages_log_through_the_parent(backend, tmp_path):
+    log_file = tmp_path / "app.log"
+    log_backend.configure_logging(log_file=log_file)
+    p = Pipeline("procs", process_workers=1)
+    p.add("log", log_in_worker, executor="process")
+    pid = p.run()["log"]
+    log_backend.shutdown_logging()
+    assert pid != os.getpid()
+    assert f"test_logger.worker - worker {pid}" in log_file.read_text("utf-8")
@@ -0,0 +1,43 @@
+# test_main_etl.py
+import pytest
+from benchmarks.generate_data import generate
+from etl_scripts import main_etl
+from etl_scripts.file_handler import read_arrow, read_csv, read_parquet
+
+
+@pytest.fixture(scope="module")
+def input_dir(tmp_path_factory):
+    return generate(str(tmp_path_factory.mktemp("input")), 300, seed=5)
+
+
+def run(input_dir, output_dir, *args):
+    argv = ["--input-dir", input_dir, "--output-dir", str(output_dir), *args]
+    return main_etl.main(argv)
+
+
+def as_csv(rows):
+    return [{k: "" if v is None else str(v) for k, v in r.items()} for r in rows]
+
+
+@pytest.mark.parametrize("join", ["left", "inner", "anti"])
+def test_columnar_outputs_hold_the_csv_rows(input_dir, tmp_path, join):
+    pytest.importorskip("pyarrow")
+    assert run(input_dir, tmp_path, "--join", join) > 0
+    expected = read_csv(str(tmp_path / "transformed_data.csv"))
+
+    for fmt, read in (("parquet", read_parquet), ("arrow", read_arrow)):
+        assert run(input_dir, tmp_path, "--join", join, "--format", fmt) == len(
+            expected
+        )
+        rows = read(str(tmp_path / f"transformed_data.{fmt}"))
+        assert list(rows[0]) == main_etl.FIELDNAMES
+        assert as_csv(rows) == expected
+
+
+def test_parquet_projection_and_filters(input_dir, tmp_path):
+    pytest.importorskip("pyarrow")
+    run(input_dir, tmp_path, "--format", "parquet", "--compression", "zstd")
+    path = str(tmp_path / "transformed_data.parquet")
+    every = read_parquet(path)
+    big = read_parquet(path, ["username"], [("sales_count", ">=", 3)])
+    assert big == [{"username": r["username"]} for r in every if r["sales_count"] >= 3]
@@ -0,0 +1,120 @@
+# test_pipeline.py
+import itertools
+import time
+import pytest
+from etl_scripts.pipeline import Pipeline, PipelineError
+
+
+def statuses(pipeline):
+    return {t["stage"]: t["status"] for t in pipeline.timings}
+
+
+def square(x):
+    return x * x
+
+
+def test_results_and_streams():
+    p = Pipeline("ok", queue_size=2, batch_size=3)
+    p.add("numbers", lambda: range(10), stream=True)
+    p.add("total", sum, deps=("numbers",))
+    p.add("scale", lambda: 2)
+    p.add("scaled", lambda total, k: total * k, deps=("total", "scale"))
+
+    assert p.run() == {"numbers": None, "total": 45, "scale": 2, "scaled": 90}
+    assert set(statuses(p).values()) == {"ok"}
+    assert p.timings[0]["items"] == 10
+
+
+def test_failure_skips_downstream_stages():
+    def boom():
+        raise KeyError("missing column")
+
+    p = Pipeline("fail")
+    p.add("extract", boom)
+    p.add("transform", lambda x: x, deps=("extract",))
+    p.add("load", lambda x: x, deps=("transform",))
+
+    with pytest.raises(PipelineError) as exc:
+        p.run()
+    assert exc.value.stage == "extract"
+    assert isinstance(exc.value.__cause__, KeyError)
+    assert statuses(p) == {
+        "extract": "failed",
+        "transform": "skipped",
+        "load": "skipped",
+    }
+
+
+def test_failing_consumer_cancels_blocked_producer():
+    def consume(items):
+        next(iter(items))
+        raise ValueError("bad row")
+
+    p = Pipeline("cancel", queue_size=1, batch_size=1)
+    p.add("extract", lambda: itertools.count(), stream=True)  # never ends
+    p.add("load", consume, deps=("extract",))
+
+    start = time.perf_counter()
+    with pytest.raises(PipelineError) as exc:
+        p.run()
+    assert time.perf_counter() - start < 5
+    assert exc.value.stage == "load"
+    assert statuses(p) == {"extract": "cancelled", "load": "failed"}
+
+
+def test_failing_producer_cancels_consumer_and_siblings():
+    def extract():
+        yield from range(5)
+        raise OSError("disk gone")
+
+    def slow_lookup():
+        while True:  # only ends when cancelled through its stream
+            yield "x"
+
+    p = Pipeline("cancel", queue_size=1, batch_size=1)
+    p.add("extract", extract, stream=True)
+    p.add("lookup", slow_lookup, stream=True)
+    p.add("join", lambda rows, keys: list(zip(rows, keys)), deps=("extract", "lookup"))
+    p.add("report", len, deps=("join",))
+
+    with pytest.raises(PipelineError) as exc:
+        p.run()
+    assert exc.value.stage == "extract"
+    assert statuses(p) == {
+        "extract": "failed",
+        "lookup": "cancelled",
+        "join": "cancelled",
+        "report": "skipped",
+    }
+
+
+def test_consumer_stopping_early_is_not_an_error():
+    p = Pipeline("early", queue_size=1, batch_size=1)
+    p.add("extract", lambda: itertools.count(), stream=True)
+    p.add("head", lambda items: list(itertools.islice(items, 3)), deps=("extract",))
+
+    assert p.run()["head"] == [0, 1, 2]
+    assert statuses(p) == {"extract": "ok", "head": "ok"}
+
+
+def test_process_stage():
+    p = Pipeline("procs", process_workers=1)
+    p.add("n", lambda: 7)
+    p.add("square", square, deps=("n",), executor="process")
+    assert p.run()["square"] == 49
+
+
+def test_invalid_graphs():
+    p = Pipeline()
+    p.add("a", lambda: [], stream=True)
+    with pytest.raises(ValueError):
+        p.add("a", lambda: 1)
+    with pytest.raises(ValueError):
+        p.add("b", lambda x: x, deps=("missing",))
+    with pytest.raises(ValueError):
+        p.add("c", len, deps=("a",), executor="process")
+    with pytest.raises(ValueError):
+        p.run()  # stream "a" has no consumer
+    p.add("d", list, deps=("a",))
+    with pytest.raises(ValueError):
+        p.add("e", list, deps=("a",))  # a stream has a single consumer
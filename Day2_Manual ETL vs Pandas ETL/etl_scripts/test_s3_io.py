@@ -0,0 +1,68 @@
+# test_s3_io.py
+import gzip
+import json
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+from utils import s3_io
+from etl_scripts.file_handler import (
+    iter_csv,
+    iter_json,
+    read_csv,
+    read_json,
+    write_csv_stream,
+    write_json_stream,
+)
+
+BUCKET = "etl-data"
+ROWS = [{"name": f"user{i}", "score": str(i % 100)} for i in range(5_000)]
+CSV = "name,score\r\n" + "".join(f"{r['name']},{r['score']}\r\n" for r in ROWS)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setattr(s3_io, "_client", None)
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def test_read_csv_and_json_from_s3(s3):
+    s3.put_object(Bucket=BUCKET, Key="in/users.csv", Body=CSV.encode())
+    s3.put_object(
+        Bucket=BUCKET, Key="in/users.csv.gz", Body=gzip.compress(CSV.encode())
+    )
+    s3.put_object(Bucket=BUCKET, Key="in/users.json", Body=json.dumps(ROWS).encode())
+    ndjson = "".join(json.dumps(r) + "\n" for r in ROWS)
+    s3.put_object(Bucket=BUCKET, Key="in/users.ndjson", Body=ndjson.encode())
+
+    assert read_csv(f"s3://{BUCKET}/in/users.csv") == ROWS
+    assert list(iter_csv(f"s3://{BUCKET}/in/users.csv.gz")) == ROWS
+    assert read_json(f"s3://{BUCKET}/in/users.json") == ROWS
+    assert list(iter_json(f"s3://{BUCKET}/in/users.ndjson")) == ROWS
+
+
+def test_missing_object_is_logged_like_a_missing_file(s3):
+    assert read_csv(f"s3://{BUCKET}/nope.csv") == []
+    with pytest.raises(ClientError):
+        list(iter_csv(f"s3://{BUCKET}/nope.csv"))
+
+
+def test_writers_stream_to_s3(s3, tmp_path):
+    assert (
+        write_csv_stream(f"s3://{BUCKET}/out/users.csv", iter(ROWS), ["name", "score"])
+        == 5_000
+    )
+    body = s3.get_object(Bucket=BUCKET, Key="out/users.csv")["Body"].read()
+    assert body.decode() == CSV
+
+    local = tmp_path / "users.json"
+    write_json_stream(str(local), ROWS)
+    assert write_json_stream(f"s3://{BUCKET}/out/users.json", iter(ROWS)) == 5_000
+    body = s3.get_object(Bucket=BUCKET, Key="out/users.json")["Body"].read()
+    assert body == local.read_bytes()
@@ -0,0 +1,22 @@
+"""
+Modules shared with Day1 live there once. A utils module that is a Day1
+module calls load() on import and is replaced by it, so fixes go to Day1.
+"""
+
+import sys
+import importlib.util
+from pathlib import Path
+
+DAY1 = Path(__file__).resolve().parents[2] / "Day1"
+
+
+def load(name, filename):
+    """
+    Execute DAY1/filename as module `name` and put it in sys.modules, so
+    `from utils import x` and monkeypatching its globals both see it.
+    """
+    spec = importlib.util.spec_from_file_location(name, DAY1 / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,8 @@
+"""
+Queue-based logging handlers and listener used by utils.logger. This is
+Day1/log_backend.py.
+"""
+
+from utils._day1 import load
+
+load(__name__, "log_backend.py")
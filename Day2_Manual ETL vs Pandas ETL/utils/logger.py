@@ -1,43 +1,158 @@
+import atexit
 import logging
+import logging.handlers
+import multiprocessing.util
+import queue
+import threading
 from pathlib import Path
 
+from utils import log_backend
+from utils.log_backend import BatchedRotatingFileHandler, BatchingQueueListener
 
-def get_logger(name: str):
+LOG_DIR = Path(__file__).parent.parent / "logs"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# One queue + one background listener per process, shared by every logger.
+# The listener (and the log directory) only appear with the first record,
+# so importing a module that calls get_logger costs nothing.
+_log_queue = queue.SimpleQueue()
+_listener = None
+_start_lock = threading.Lock()
+_shut_down = False  # set by shutdown_logging: later records don't restart it
+
+
+class InProcessQueueHandler(log_backend.InProcessQueueHandler):
     """
-    Returns a configured logger instance.
-    Logs both to console and to a file in /logs/app.log
+    The shared InProcessQueueHandler; the first record starts the backend
+    with its defaults unless configure_logging() was called before.
+    Records logged after shutdown_logging() (e.g. from atexit hooks) are
+    dropped rather than starting a listener nobody stops.
+    """
+
+    def enqueue(self, record):
+        if _listener is None:
+            if _shut_down:
+                return
+            configure_logging()
+        super().enqueue(record)
+
+
+def configure_logging(
+    log_file=None,
+    level=logging.INFO,
+    max_bytes=5_000_000,
+    backup_count=5,
+    compress=False,
+):
+    """
+    Start the shared queue-based backend (idempotent).
+    Loggers only enqueue records; a single background thread formats them
+    and writes to console and a rotating file. Stopped and flushed at exit.
+    An explicit call after shutdown_logging() starts it again.
+    """
+    global _listener, _shut_down
+    with _start_lock:
+        _shut_down = False
+        if _listener is None:
+            _listener = _start_listener(
+                log_file, level, max_bytes, backup_count, compress
+            )
+    return _log_queue
+
+
+def _start_listener(log_file, level, max_bytes, backup_count, compress):
+    if log_file is None:
+        LOG_DIR.mkdir(exist_ok=True)
+        log_file = LOG_DIR / "app.log"
+
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+    # File handler
+    file_handler = BatchedRotatingFileHandler(
+        log_file,
+        compress=compress,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
+    )
+    file_handler.setLevel(level)
+    file_handler.setFormatter(formatter)
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(level)
+    console_handler.setFormatter(formatter)
+
+    listener = BatchingQueueListener(
+        _log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.unregister(shutdown_logging)  # once, however often it restarts
+    atexit.register(shutdown_logging)
+    return listener
+
+
+def shutdown_logging():
+    """Flush pending records and stop the background listener."""
+    global _listener, _shut_down
+    with _start_lock:
+        _shut_down = True
+        listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def forward_from_processes(mp_context):
     """
-    # Define log directory and file path
-    log_dir = Path(__file__).parent.parent / "logs"
-    log_dir.mkdir(exist_ok=True)
+    Collect the records of worker processes started from mp_context into
+    this process's backend, so they reach the same console and log file.
+    Returns (queue, listener): pass the queue to forward_to_parent() in each
+    worker (e.g. as the pool initializer) and stop the listener once the
+    workers have exited.
+    """
+    process_queue = mp_context.Queue()
+    listener = logging.handlers.QueueListener(
+        process_queue, InProcessQueueHandler(_log_queue)
+    )
+    listener.start()
+    return process_queue, listener
 
-    log_file = log_dir / "app.log"
 
+def forward_to_parent(process_queue):
+    """
+    Worker-process side of forward_from_processes(): this process's records
+    go to the parent instead of starting a backend (and log file) of its own.
+    """
+    global _listener, _shut_down
+    with _start_lock:
+        _shut_down = False
+        if _listener is None:
+            _listener = BatchingQueueListener(
+                _log_queue, logging.handlers.QueueHandler(process_queue)
+            )
+            _listener.start()
+    # Pool workers exit without running atexit hooks, but with finalizers;
+    # this one runs before the queue's own, which sends what's left
+    multiprocessing.util.Finalize(None, shutdown_logging, exitpriority=10)
+
+
+def get_logger(name: str):
+    """
+    Returns a configured logger instance.
+    Logs both to console and to a file in /logs/app.log through the shared
+    background listener, so a log call costs only a queue put. Nothing is
+    started until the first record is logged.
+    """
     # Configure logger
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
     # Avoid duplicate log entries if logger is reused
     if not logger.handlers:
-        # File handler
-        file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
-        file_handler.setLevel(logging.INFO)
-
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-
-        # Log message format
-        formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-
-        # Add handlers
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        logger.addHandler(InProcessQueueHandler(_log_queue))
 
     return logger
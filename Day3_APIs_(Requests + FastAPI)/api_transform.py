@@ -1,14 +1,51 @@
 # api_transform.py
 from fastapi import FastAPI, HTTPException, Request, Query
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field, ValidationError
 from typing import Optional, List
+from contextlib import asynccontextmanager
+from metrics import Metrics, MetricsMiddleware
+import csv
+import io
+import itertools
+import json
 import logging
+import os
+import tempfile
 
-app = FastAPI(title="API Transformer", version="1.0.0")
+try:
+    import orjson
+except ImportError:  # only used by the fast response mode
+    orjson = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Configured when the server starts rather than on import, so importing
+    # the module (tests, tools) leaves the root logger alone
+    logging.basicConfig(level=logging.INFO)
+    yield
+
+
+app = FastAPI(title="API Transformer", version="1.0.0", lifespan=lifespan)
+
+# Per-route request counts, status codes and latency histograms, at /metrics
+metrics = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("api_transform")
 
+MAX_NAME_LENGTH = 50
+MAX_BATCH = 10_000  # records per /transform/batch request
+STREAM_FLUSH_ROWS = 500  # NDJSON lines per chunk written by /transform/stream
+SPOOL_MAX_BYTES = 1024 * 1024  # /transform/stream bodies above this go to disk
+# Log 1 in N /transform payloads (0 turns payload logging off)
+LOG_SAMPLE_EVERY = int(os.environ.get("API_LOG_SAMPLE_EVERY", "100"))
+_request_seq = itertools.count()
+# Opt-in fast responses: handlers return pre-encoded JSON bytes (orjson when
+# installed) instead of models that FastAPI validates again and encodes
+FAST_RESPONSES = os.environ.get("API_FAST_RESPONSES", "0") == "1"
+
 
 class TransformIn(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
@@ -22,24 +59,54 @@ class TransformOut(BaseModel):
     message: Optional[str] = None
 
 
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _dumps_text(obj):
+    return _dumps(obj).decode("utf-8")
+
+
+def _json_response(obj):
+    return Response(_dumps(obj), media_type="application/json")
+
+
+DEMO = [
+    {"name_upper": "SAM", "passed": True, "score": 72, "message": "Congrats"},
+    {
+        "name_upper": "RIA",
+        "passed": False,
+        "score": 34,
+        "message": "Needs improvement",
+    },
+]
+# Constant responses, encoded once exactly as the validated response would be
+HEALTH_BODY = _dumps({"status": "ok"})
+DEMO_BODY = _dumps([TransformOut(**d).model_dump() for d in DEMO])
+
+
 @app.get("/health")
 async def health():
+    if FAST_RESPONSES:
+        return Response(HEALTH_BODY, media_type="application/json")
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/demo", response_model=List[TransformOut])
 async def demo():
     # Simple demo data to show output shape and example responses
-    sample = [
-        {"name_upper": "SAM", "passed": True, "score": 72, "message": "Congrats"},
-        {
-            "name_upper": "RIA",
-            "passed": False,
-            "score": 34,
-            "message": "Needs improvement",
-        },
-    ]
-    return sample
+    if FAST_RESPONSES:
+        return Response(DEMO_BODY, media_type="application/json")
+    return DEMO
 
 
 @app.post("/transform", response_model=TransformOut)
@@ -55,27 +122,164 @@ async def transform(
     Body: {"name": str, "score": float}
     Query param: ?threshold=50
     """
-    # Log request info (client IP + payload)
-    client_ip = request.client.host if request.client else "unknown"
-    logger.info(
-        "Request from %s body=%s threshold=%s", client_ip, payload.json(), threshold
-    )
+    # Log request info (client IP + payload) for a sample of requests; the
+    # payload is only turned into text if the record is actually emitted
+    if LOG_SAMPLE_EVERY and next(_request_seq) % LOG_SAMPLE_EVERY == 0:
+        client_ip = request.client.host if request.client else "unknown"
+        logger.info(
+            "Request from %s body=%s threshold=%s (1 in %d logged)",
+            client_ip,
+            payload,
+            threshold,
+            LOG_SAMPLE_EVERY,
+        )
 
     # Business rule: reject absurdly long names (example custom error)
-    if len(payload.name.strip()) > 50:
+    if len(payload.name.strip()) > MAX_NAME_LENGTH:
         raise HTTPException(status_code=400, detail="Name too long (max 50 characters)")
 
-    # Transform logic
-    name_upper = payload.name.strip().upper()
-    passed = payload.score >= threshold
-    message = "Congrats" if passed else "Needs improvement"
+    if FAST_RESPONSES:
+        return _json_response(rule_fields(payload.name, payload.score, threshold))
+    return apply_rule(payload.name, payload.score, threshold)
 
-    return TransformOut(
-        name_upper=name_upper,
-        passed=passed,
-        score=payload.score,
-        message=message,
-    )
+
+def rule_fields(name, score, threshold):
+    """
+    Transform logic shared by the single, batch and streaming endpoints, as
+    the plain dict of TransformOut fields (score is already a validated
+    float, so no model needs to be built to serialise it).
+    """
+    passed = score >= threshold
+    return {
+        "name_upper": name.strip().upper(),
+        "passed": passed,
+        "score": score,
+        "message": "Congrats" if passed else "Needs improvement",
+    }
+
+
+def apply_rule(name, score, threshold):
+    return TransformOut(**rule_fields(name, score, threshold))
+
+
+@app.post("/transform/batch", response_model=List[TransformOut])
+async def transform_batch(
+    payloads: List[TransformIn],
+    threshold: Optional[float] = Query(
+        40.0, ge=0, le=100, description="Pass threshold (default 40)"
+    ),
+):
+    """
+    POST /transform/batch
+    Body: [{"name": str, "score": float}, ...] (up to MAX_BATCH records)
+    One request, one validation pass and one response for the whole list.
+    """
+    if len(payloads) > MAX_BATCH:
+        raise HTTPException(
+            status_code=413, detail=f"Batch too large (max {MAX_BATCH} records)"
+        )
+    too_long = [
+        i for i, p in enumerate(payloads) if len(p.name.strip()) > MAX_NAME_LENGTH
+    ]
+    if too_long:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Name too long (max 50 characters) at index {too_long}",
+        )
+    logger.info("Batch of %d records threshold=%s", len(payloads), threshold)
+    if FAST_RESPONSES:
+        return _json_response(
+            [rule_fields(p.name, p.score, threshold) for p in payloads]
+        )
+    return [apply_rule(p.name, p.score, threshold) for p in payloads]
+
+
+async def _spool_body(request):
+    """
+    Read the request body once into a temp file: kept in memory up to
+    SPOOL_MAX_BYTES, then on disk, so memory stays flat for any upload size.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def _records(lines, is_csv):
+    """(line number, dict or error) for every non-empty NDJSON or CSV line."""
+    header = None
+    for lineno, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if is_csv:
+            # One record per line: quoted fields can't contain newlines
+            row = next(csv.reader([line]))
+            if header is None:
+                header = [h.strip() for h in row]
+                continue
+            yield lineno, dict(zip(header, row))
+            continue
+        try:
+            yield lineno, json.loads(line)
+        except ValueError as e:
+            yield lineno, e
+
+
+def _transform_line(lineno, record, threshold):
+    if isinstance(record, Exception):
+        return {"line": lineno, "error": f"Invalid JSON: {record}"}
+    try:
+        payload = TransformIn.model_validate(record)
+    except ValidationError as e:
+        return {"line": lineno, "error": e.errors(include_url=False)}
+    if len(payload.name.strip()) > MAX_NAME_LENGTH:
+        return {"line": lineno, "error": "Name too long (max 50 characters)"}
+    return rule_fields(payload.name, payload.score, threshold)
+
+
+@app.post("/transform/stream")
+async def transform_stream(
+    request: Request,
+    threshold: Optional[float] = Query(
+        40.0, ge=0, le=100, description="Pass threshold (default 40)"
+    ),
+):
+    """
+    POST /transform/stream
+    Body: NDJSON, one {"name", "score"} per line, or a CSV file with a
+    name,score header (Content-Type: text/csv), sent as the raw body.
+    Streams back one TransformOut per line as NDJSON. Output only starts
+    once the whole upload has been received: the body is spooled to a temp
+    file first and rows are then read back one at a time, so memory stays
+    flat whatever the upload size, but this is not a full-duplex stream
+    (reading request.stream() while responding would race Starlette's
+    disconnect listener for the body messages). Bad lines become
+    {"line": n, "error": ...} rows instead of failing the response.
+    """
+    is_csv = "csv" in request.headers.get("content-type", "")
+    spool = await _spool_body(request)
+    dumps = _dumps_text if FAST_RESPONSES else json.dumps
+
+    def rows():
+        out = []
+        count = 0
+        try:
+            lines = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+            for lineno, record in _records(lines, is_csv):
+                out.append(dumps(_transform_line(lineno, record, threshold)))
+                count += 1
+                if len(out) >= STREAM_FLUSH_ROWS:
+                    yield "\n".join(out) + "\n"
+                    out = []
+            if out:
+                yield "\n".join(out) + "\n"
+        finally:
+            spool.close()
+        logger.info("Streamed %d records threshold=%s", count, threshold)
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
 
 
 @app.exception_handler(ValidationError)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Throughput of the default (validated models + stdlib JSON) responses
+against API_FAST_RESPONSES (pre-encoded / orjson bytes), driving the app
+in-process with the same TestClient and requests as test_api.py.
+
+TestClient itself costs about a millisecond per call, so next to req/s the
+mean time spent inside the app (from the /metrics histogram) is reported.
+
+Usage:
+  python bench_api.py --seconds 2 --batch 1000
+"""
+
+import time
+import logging
+import argparse
+
+from fastapi.testclient import TestClient
+
+import api_transform
+from api_transform import app
+
+
+def scenarios(batch):
+    body = [{"name": f"user{i}", "score": i % 100} for i in range(batch)]
+    return [
+        ("GET /health", "get", "/health", {}),
+        ("GET /demo", "get", "/demo", {}),
+        ("POST /transform", "post", "/transform", {"json": {"name": "a", "score": 41}}),
+        (f"POST /transform/batch x{batch}", "post", "/transform/batch", {"json": body}),
+    ]
+
+
+def throughput(client, method, url, kwargs, seconds):
+    """
+    (requests per second, mean microseconds inside the app) over `seconds`,
+    after a short warm-up.
+    """
+    call = getattr(client, method)
+    for _ in range(20):
+        call(url, **kwargs)
+    stats = api_transform.metrics.routes[method.upper(), url]
+    count0, total0 = stats.count, stats.total_s
+    count, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        r = call(url, **kwargs)
+        assert r.status_code == 200, r.text
+        count += 1
+    in_app_us = (stats.total_s - total0) / (stats.count - count0) * 1e6
+    return count / elapsed, in_app_us
+
+
+def main():
+    p = argparse.ArgumentParser(description="api_transform fast response benchmark")
+    p.add_argument("--seconds", type=float, default=2.0, help="Per endpoint and mode")
+    p.add_argument("--batch", type=int, default=1000, help="Records per batch call")
+    args = p.parse_args()
+
+    # Keep request logging out of the measurement
+    logging.getLogger("api_transform").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(app)
+    orjson = "orjson" if api_transform.orjson is not None else "stdlib json"
+
+    print(
+        f"{'endpoint':<28}{'req/s':>9}{'fast':>9}{'gain':>7}"
+        f"{'in-app us':>12}{'fast':>9}{'gain':>7}"
+    )
+    for name, method, url, kwargs in scenarios(args.batch):
+        results = []
+        for fast in (False, True):
+            api_transform.FAST_RESPONSES = fast
+            results.append(throughput(client, method, url, kwargs, args.seconds))
+        (rate, us), (fast_rate, fast_us) = results
+        print(
+            f"{name:<28}{rate:>9,.0f}{fast_rate:>9,.0f}{fast_rate / rate:>6.2f}x"
+            f"{us:>12,.0f}{fast_us:>9,.0f}{us / fast_us:>6.2f}x"
+        )
+    print(f"(fast mode encoder: {orjson})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 # client_post.py
+import json
 import time
+import random
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import requests
-import json
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, HTTPError
 
 ENDPOINTS = [
@@ -14,70 +20,225 @@ ENDPOINTS = [
 PAYLOAD = {"name": "akhil", "score": 44}
 HEADERS = {"Content-Type": "application/json", "User-Agent": "python-client/1.0"}
 
+logger = logging.getLogger("client_post")
+
+
+class EndpointDown(Exception):
+    """A 5xx/429 answer: the endpoint is unhealthy, another may work."""
+
+    def __init__(self, url, response):
+        super().__init__(f"{url} answered {response.status_code}")
+        self.response = response
+
+
+class AllEndpointsFailed(RuntimeError):
+    def __init__(self, errors):
+        detail = "; ".join(f"{url}: {e}" for url, e in errors) or "all circuits open"
+        super().__init__(f"No endpoint succeeded ({detail})")
+        self.errors = errors
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint health. Closed until `failure_threshold` failures in a row,
+    then open: calls are refused for `reset_timeout` seconds, after which a
+    single trial call is let through (half-open). Its success closes the
+    circuit, its failure opens it again. Thread-safe, so hedged calls and
+    callers on several threads share one view of each endpoint.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        """True if a call may go to this endpoint now (takes the trial slot)."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running:
+                return False
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+def backoff_delay(attempt, base=0.5, cap=8.0):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**n)]."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
 
-def try_post_with_retries(url, payload, headers, max_retries=3, backoff=1.0):
-    attempt = 0
-    while attempt < max_retries:
-        attempt += 1
+class EndpointClient:
+    """
+    POST the same payload to any of several equivalent endpoints.
+
+    - One requests.Session: keep-alive connection pools per host, reused
+      across calls and threads.
+    - Endpoints are tried in order, skipping those whose circuit is open;
+      a failed endpoint hands over to the next one at once (no sleep).
+    - With hedge_after set, if the current attempt has not answered within
+      that many seconds the next healthy endpoint is raced against it and
+      the first success wins (the loser still reports to its breaker).
+    - Only when every endpoint failed is there a jittered backoff before
+      the next round.
+    4xx answers (other than 429) are the caller's problem: raised at once.
+    """
+
+    def __init__(
+        self,
+        endpoints,
+        headers=HEADERS,
+        timeout=10.0,
+        rounds=3,
+        backoff=0.5,
+        max_backoff=8.0,
+        hedge_after=None,
+        failure_threshold=3,
+        reset_timeout=30.0,
+        pool_size=10,
+    ):
+        self.endpoints = list(endpoints)
+        self.timeout = timeout
+        self.rounds = rounds
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self.breakers = {
+            url: CircuitBreaker(failure_threshold, reset_timeout)
+            for url in self.endpoints
+        }
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        # Retries are ours (across endpoints), not urllib3's
+        adapter = HTTPAdapter(
+            pool_connections=len(self.endpoints), pool_maxsize=pool_size, max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(
+            max_workers=2 * len(self.endpoints), thread_name_prefix="client_post"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def _attempt(self, url, payload):
+        breaker = self.breakers[url]
         try:
-            resp = requests.post(url, json=payload, headers=headers, timeout=10)
-            # raise for 4xx/5xx so we can handle them
-            resp.raise_for_status()
-            return resp
-        except HTTPError as he:
-            status = None
-            try:
-                status = he.response.status_code
-            except Exception:
-                pass
-            # Retry on 5xx server errors; fail fast on 4xx
-            if status and 500 <= status < 600:
-                print(
-                    f"[{url}] Server error {status} (attempt {attempt}/{max_retries}). Retrying after {backoff}s..."
-                )
-                time.sleep(backoff)
-                backoff *= 2
+            resp = self.session.post(url, json=payload, timeout=self.timeout)
+        except RequestException:
+            breaker.record_failure()
+            raise
+        if resp.status_code >= 500 or resp.status_code == 429:
+            breaker.record_failure()
+            raise EndpointDown(url, resp)
+        breaker.record_success()  # a 4xx still means the endpoint is alive
+        resp.raise_for_status()
+        return url, resp
+
+    def _race(self, payload):
+        """One pass over the endpoints, hedging after hedge_after seconds."""
+        candidates = iter(self.endpoints)
+        pending, errors = {}, []
+
+        def launch_next():
+            for url in candidates:
+                if self.breakers[url].allow():
+                    pending[self._pool.submit(self._attempt, url, payload)] = url
+                    return True
+            return False
+
+        more = launch_next()
+        while pending:
+            budget = self.hedge_after if more else None
+            done, _ = wait(pending, timeout=budget, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.info("No answer within %.2fs, hedging", self.hedge_after)
+                more = launch_next()
                 continue
-            else:
-                # 4xx or no status — don't retry
-                print(f"[{url}] HTTP error: {he}. Not retrying.")
-                raise
-        except RequestException as e:
-            # network / TLS / connection problems — retry a few times
-            print(
-                f"[{url}] Network/TLS error (attempt {attempt}/{max_retries}): {e}. Retrying after {backoff}s..."
-            )
-            time.sleep(backoff)
-            backoff *= 2
-            continue
-    raise RuntimeError(f"Failed to POST to {url} after {max_retries} attempts")
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    return future.result()
+                except HTTPError:
+                    raise  # 4xx: retrying elsewhere won't help
+                except (RequestException, EndpointDown) as e:
+                    logger.warning("[%s] %s", url, e)
+                    errors.append((url, e))
+            if not pending:
+                more = launch_next()
+        raise AllEndpointsFailed(errors)
+
+    def post(self, payload):
+        """Returns (url, response) from the first endpoint that succeeded."""
+        for attempt in range(self.rounds):
+            try:
+                return self._race(payload)
+            except AllEndpointsFailed as e:
+                if attempt + 1 == self.rounds:
+                    raise
+                delay = backoff_delay(attempt, self.backoff, self.max_backoff)
+                logger.warning("%s. Retrying in %.2fs...", e, delay)
+                time.sleep(delay)
 
 
 def main():
-    for url in ENDPOINTS:
-        print("\nTrying:", url)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with EndpointClient(ENDPOINTS, hedge_after=2.0) as client:
         try:
-            resp = try_post_with_retries(
-                url, PAYLOAD, HEADERS, max_retries=3, backoff=1
+            url, resp = client.post(PAYLOAD)
+        except Exception as e:
+            print(f"\nAll endpoints failed: {e}")
+            print(
+                "If you want a guaranteed test, run your local FastAPI server:\n"
+                "1) In another terminal: uvicorn api_transform:app --reload --port 8000\n"
+                "2) Then re-run this script (it will try http://127.0.0.1:8000/transform)."
             )
-            print("Success ->", resp.status_code)
-            # safe attempt to show JSON (some endpoints wrap/rename)
-            try:
-                data = resp.json()
-                print("Response JSON (preview):")
-                print(json.dumps(data, indent=2)[:1000])
-            except Exception:
-                print("Response text (preview):")
-                print(resp.text[:1000])
             return
-        except Exception as e:
-            print(f"Failed on {url}: {e}")
-            # try next endpoint
-    print(
-        "\nAll endpoints failed. If you want a guaranteed test, run your local FastAPI server:"
-    )
-    print("1) In another terminal: uvicorn api_transform:app --reload --port 8000")
-    print("2) Then re-run this script (it will try http://127.0.0.1:8000/transform).")
+    print(f"Success -> {resp.status_code} from {url}")
+    # safe attempt to show JSON (some endpoints wrap/rename)
+    try:
+        data = resp.json()
+        print("Response JSON (preview):")
+        print(json.dumps(data, indent=2)[:1000])
+    except Exception:
+        print("Response text (preview):")
+        print(resp.text[:1000])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Async load generator for api_transform (client_post.py only sends one
+blocking POST). Runs fully offline against a local uvicorn.
+
+Two modes:
+  closed loop (default)  --concurrency workers each send their next request
+                         as soon as the previous one is answered
+  fixed rate (--rps N)   requests start on a fixed schedule whatever the
+                         server does; latency is measured from the scheduled
+                         start, so a stalled server can't hide its queueing
+                         (no coordinated omission). --concurrency caps the
+                         requests in flight.
+
+Usage:
+  uvicorn api_transform:app --port 8000 &
+  python load_test.py --concurrency 50 --duration 10
+  python load_test.py --rps 500 --duration 30 --payload-file payloads.ndjson
+  python load_test.py --spawn-server --requests 5000 --json   # starts uvicorn itself
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import itertools
+import subprocess
+from collections import Counter
+from pathlib import Path
+
+# httpx is imported where requests are sent, so --help and argument errors
+# return without loading it
+DEFAULT_PAYLOAD = {"name": "akhil", "score": 44}
+PERCENTILES = (50, 95, 99)
+
+
+def load_payloads(path):
+    """Request bodies from a JSON array or NDJSON file (one body per line)."""
+    text = Path(path).read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        bodies = json.loads(text)
+    else:
+        bodies = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if not bodies:
+        raise ValueError(f"No payloads in {path}")
+    return bodies
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Results:
+    def __init__(self):
+        self.latencies = []  # seconds, for every request that got a response
+        self.statuses = Counter()
+        self.errors = Counter()  # "HTTP 400", "ConnectError", ...
+        self.sent = 0
+        self.late_starts = 0  # fixed-rate requests started behind schedule
+        self.started = self.finished = 0.0
+
+    def report(self):
+        lat = sorted(self.latencies)
+        elapsed = self.finished - self.started
+        ok = sum(n for s, n in self.statuses.items() if s < 400)
+        report = {
+            "requests": self.sent,
+            "ok": ok,
+            "errors": dict(self.errors.most_common()),
+            "elapsed_s": round(elapsed, 3),
+            "rps": round(self.sent / elapsed, 1) if elapsed else 0.0,
+            "latency_ms": {
+                **{f"p{p}": round(percentile(lat, p) * 1000, 3) for p in PERCENTILES},
+                "max": round(lat[-1] * 1000, 3) if lat else 0.0,
+                "mean": round(sum(lat) / len(lat) * 1000, 3) if lat else 0.0,
+            },
+        }
+        if self.late_starts:
+            report["late_starts"] = self.late_starts
+        return report
+
+
+async def run_load(
+    url,
+    bodies=(DEFAULT_PAYLOAD,),
+    method="POST",
+    concurrency=10,
+    duration=10.0,
+    total=None,
+    rps=None,
+    timeout=10.0,
+    transport=None,
+):
+    """
+    Send requests until `duration` seconds have passed or `total` requests
+    were started, whichever comes first. Returns a Results.
+    """
+    import httpx
+
+    results = Results()
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    deadline = time.perf_counter() + duration if duration else float("inf")
+
+    async with httpx.AsyncClient(
+        limits=limits, timeout=timeout, transport=transport
+    ) as client:
+
+        async def send_one(i, start):
+            results.sent += 1
+            try:
+                r = await client.request(method, url, json=bodies[i % len(bodies)])
+            except httpx.HTTPError as e:
+                results.errors[type(e).__name__] += 1
+                return
+            results.latencies.append(time.perf_counter() - start)
+            results.statuses[r.status_code] += 1
+            if r.status_code >= 400:
+                results.errors[f"HTTP {r.status_code}"] += 1
+
+        results.started = time.perf_counter()
+        if rps:
+            await _fixed_rate(send_one, rps, concurrency, deadline, total, results)
+        else:
+            await _closed_loop(send_one, concurrency, deadline, total)
+        results.finished = time.perf_counter()
+    return results
+
+
+async def _closed_loop(send_one, concurrency, deadline, total):
+    counter = itertools.count()
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            if total is not None and i >= total:
+                return
+            await send_one(i, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def _fixed_rate(send_one, rps, concurrency, deadline, total, results):
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+    start = time.perf_counter()
+    for i in itertools.count():
+        scheduled = start + i / rps
+        if scheduled >= deadline or (total is not None and i >= total):
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slots.acquire()  # all connections busy: we fall behind schedule
+        if time.perf_counter() - scheduled > 0.001:
+            results.late_starts += 1
+        task = asyncio.create_task(send_one(i, scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        task.add_done_callback(lambda _: slots.release())
+    await asyncio.gather(*tasks)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LocalServer:
+    """`uvicorn api_transform:app` in a subprocess, for fully offline runs."""
+
+    def __init__(self, port=None, app="api_transform:app"):
+        self.port = port or _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._cmd = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            app,
+            "--port",
+            str(self.port),
+            "--log-level",
+            "warning",
+        ]
+        self._proc = None
+
+    def __enter__(self):
+        import httpx
+
+        # Payload log sampling is off unless asked for: it is not what we size
+        env = {"API_LOG_SAMPLE_EVERY": "0", **os.environ}
+        self._proc = subprocess.Popen(self._cmd, cwd=Path(__file__).parent, env=env)
+        give_up = time.monotonic() + 30
+        while time.monotonic() < give_up:
+            if self._proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {self._proc.returncode}")
+            try:
+                httpx.get(self.base_url + "/health", timeout=1).raise_for_status()
+                return self
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError("uvicorn did not become healthy within 30s")
+
+    def __exit__(self, *exc):
+        self._proc.terminate()
+        try:
+            self._proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+
+
+def print_report(report, url, args):
+    mode = f"fixed rate {args.rps:g} rps" if args.rps else "closed loop"
+    lat = report["latency_ms"]
+    print(f"{url}  ({mode}, concurrency {args.concurrency})")
+    print(
+        f"  requests {report['requests']:,}  ok {report['ok']:,}  "
+        f"in {report['elapsed_s']:.2f}s  ->  {report['rps']:,.1f} req/s"
+    )
+    print(
+        f"  latency ms  p50 {lat['p50']:.2f}  p95 {lat['p95']:.2f}  "
+        f"p99 {lat['p99']:.2f}  max {lat['max']:.2f}  mean {lat['mean']:.2f}"
+    )
+    if report.get("late_starts"):
+        print(f"  {report['late_starts']:,} requests started behind schedule")
+    for error, n in report["errors"].items():
+        print(f"  error {error}: {n:,}")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Async load test for api_transform")
+    p.add_argument("--base-url", default="http://127.0.0.1:8000")
+    p.add_argument("--path", default="/transform", help="e.g. /transform?threshold=50")
+    p.add_argument("--method", default="POST")
+    p.add_argument("--concurrency", type=int, default=10, help="Connections in use")
+    p.add_argument("--duration", type=float, default=10.0, help="Seconds (0: no limit)")
+    p.add_argument("--requests", type=int, help="Stop after N requests")
+    p.add_argument("--rps", type=float, help="Fixed request rate (default closed loop)")
+    p.add_argument("--payload-file", help="JSON array or NDJSON of request bodies")
+    p.add_argument("--timeout", type=float, default=10.0)
+    p.add_argument(
+        "--spawn-server",
+        action="store_true",
+        help="Start uvicorn api_transform:app on a free port for the run "
+        "(instead of --base-url)",
+    )
+    p.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = p.parse_args(argv)
+    if not args.duration and not args.requests:
+        p.error("--duration 0 needs --requests")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    bodies = (
+        load_payloads(args.payload_file) if args.payload_file else [DEFAULT_PAYLOAD]
+    )
+
+    def run(base_url):
+        url = base_url + args.path
+        results = asyncio.run(
+            run_load(
+                url,
+                bodies,
+                method=args.method,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                total=args.requests,
+                rps=args.rps,
+                timeout=args.timeout,
+            )
+        )
+        return url, results.report()
+
+    if args.spawn_server:
+        with LocalServer() as server:
+            url, report = run(server.base_url)
+    else:
+        url, report = run(args.base_url)
+
+    if args.json:
+        print(json.dumps({"url": url, **report}, indent=2))
+    else:
+        print_report(report, url, args)
+    return report
+
+
+if __name__ == "__main__":
+    main()
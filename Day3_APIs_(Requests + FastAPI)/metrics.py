@@ -0,0 +1,163 @@
+# metrics.py
+"""
+In-process request metrics for the FastAPI app, exported in Prometheus
+text format.
+
+MetricsMiddleware is a plain ASGI middleware (no BaseHTTPMiddleware, no
+per-request task or copy of the body), so recording a request is two
+perf_counter() calls, a bisect and a few integer increments. The counters
+are plain ints updated on the event loop thread, which is the only thread
+that runs the middleware: no locks are needed.
+"""
+
+import time
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUANTILES = (0.5, 0.95, 0.99)
+UNMATCHED = "<unmatched>"  # 404s are grouped so random paths can't add labels
+
+
+class RouteStats:
+    __slots__ = ("count", "statuses", "buckets", "total_s")
+
+    def __init__(self):
+        self.count = 0
+        self.statuses = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last one is +Inf
+        self.total_s = 0.0
+
+    def observe(self, status, seconds):
+        self.count += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total_s += seconds
+
+    def quantile(self, q):
+        """
+        Latency quantile estimated from the histogram (linear within the
+        bucket), like Prometheus' histogram_quantile().
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if seen + n >= rank and n:
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                if i == len(LATENCY_BUCKETS):
+                    return lower  # +Inf bucket: best we can say
+                return lower + (LATENCY_BUCKETS[i] - lower) * (rank - seen) / n
+            seen += n
+        return LATENCY_BUCKETS[-1]
+
+
+class Metrics:
+    """Request counters and latency histograms per (method, route)."""
+
+    def __init__(self):
+        self.routes = {}
+        self.started = time.time()
+
+    def observe(self, method, route, status, seconds):
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[method, route] = RouteStats()
+        stats.observe(status, seconds)
+
+    def render(self):
+        """All metrics in Prometheus text exposition format 0.0.4."""
+        name = "http_requests"
+        lines = [
+            f"# HELP {name}_total Requests handled, by route and status code.",
+            f"# TYPE {name}_total counter",
+        ]
+        routes = sorted(self.routes.items())
+        for (method, route), stats in routes:
+            for status, n in sorted(stats.statuses.items()):
+                lines.append(
+                    f'{name}_total{{method="{method}",route="{route}",'
+                    f'status="{status}"}} {n}'
+                )
+
+        hist = "http_request_duration_seconds"
+        lines += [
+            f"# HELP {hist} Request latency, from first byte in to last byte out.",
+            f"# TYPE {hist} histogram",
+        ]
+        for (method, route), stats in routes:
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                cumulative += n
+                lines.append(f'{hist}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{hist}_sum{{{labels}}} {stats.total_s:.6f}")
+            lines.append(f"{hist}_count{{{labels}}} {stats.count}")
+
+        # Pre-computed p50/p95/p99 for dashboards without PromQL
+        quant = "http_request_duration_quantile_seconds"
+        lines += [
+            f"# HELP {quant} Latency quantiles estimated from the histogram.",
+            f"# TYPE {quant} gauge",
+        ]
+        for (method, route), stats in routes:
+            for q in QUANTILES:
+                lines.append(
+                    f'{quant}{{method="{method}",route="{route}",quantile="{q}"}} '
+                    f"{stats.quantile(q):.6f}"
+                )
+
+        lines += [
+            "# HELP process_start_time_seconds Start time since the Unix epoch.",
+            "# TYPE process_start_time_seconds gauge",
+            f"process_start_time_seconds {self.started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording every HTTP request into a Metrics object."""
+
+    def __init__(self, app, metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # if the app raises before sending a response
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED
+            self.metrics.observe(
+                scope["method"], path, status, time.perf_counter() - start
+            )
@@ -1,4 +1,5 @@
 # test_api.py
+import json
 from fastapi.testclient import TestClient
 from api_transform import app
 
@@ -27,3 +28,106 @@ def test_name_too_long():
     long_name = "a" * 60
     r = client.post("/transform", json={"name": long_name, "score": 90})
     assert r.status_code == 400
+
+
+def test_transform_batch():
+    body = [{"name": " sam ", "score": 72}, {"name": "ria", "score": 34}]
+    r = client.post("/transform/batch?threshold=50", json=body)
+    assert r.status_code == 200
+    assert [(o["name_upper"], o["passed"]) for o in r.json()] == [
+        ("SAM", True),
+        ("RIA", False),
+    ]
+
+
+def test_transform_batch_name_too_long():
+    body = [{"name": "a", "score": 90}, {"name": "a" * 60, "score": 90}]
+    r = client.post("/transform/batch", json=body)
+    assert r.status_code == 400
+    assert "[1]" in r.json()["detail"]
+
+
+def test_transform_stream_ndjson():
+    body = '{"name": "sam", "score": 72}\nnot json\n\n{"name": "ria", "score": 34}'
+    r = client.post(
+        "/transform/stream",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert rows[0]["name_upper"] == "SAM" and rows[0]["passed"] is True
+    assert rows[1]["line"] == 2 and "error" in rows[1]
+    assert rows[2]["name_upper"] == "RIA" and rows[2]["passed"] is False
+
+
+def test_transform_stream_csv_in_chunks():
+    csv_body = "name,score\r\n" + "".join(f"user{i},{i % 100}\r\n" for i in range(2000))
+
+    def chunks(size=37):  # chunk boundaries fall inside lines
+        data = csv_body.encode("utf-8")
+        for i in range(0, len(data), size):
+            yield data[i : i + size]
+
+    r = client.post(
+        "/transform/stream?threshold=50",
+        content=chunks(),
+        headers={"Content-Type": "text/csv"},
+    )
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert len(rows) == 2000
+    assert rows[-1] == {
+        "name_upper": "USER1999",
+        "passed": True,
+        "score": 99.0,
+        "message": "Congrats",
+    }
+
+
+def test_metrics_prometheus_format():
+    client.post("/transform", json={"name": "a", "score": 41})
+    client.post("/transform", json={"name": "a" * 60, "score": 90})
+    client.get("/no/such/path")
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = r.text.splitlines()
+    assert any(
+        l.startswith(
+            'http_requests_total{method="POST",route="/transform",status="400"}'
+        )
+        for l in lines
+    )
+    # Unknown paths are grouped under one label, not one series per path
+    assert not any("/no/such/path" in l for l in lines)
+    assert any('route="<unmatched>",status="404"' in l for l in lines)
+    # The +Inf bucket counts every request of the route
+    bucket = [l for l in lines if 'route="/transform",le="+Inf"' in l][0]
+    total = [l for l in lines if l.startswith("http_request_duration_seconds_count")]
+    assert bucket.split()[-1] in [l.split()[-1] for l in total if "/transform" in l]
+    assert any('route="/transform",quantile="0.99"' in l for l in lines)
+
+
+def test_fast_responses_match_validated_ones(monkeypatch):
+    import api_transform
+
+    requests = [
+        ("get", "/health", {}),
+        ("get", "/demo", {}),
+        ("post", "/transform?threshold=50", {"json": {"name": " sam ", "score": 41}}),
+        ("post", "/transform/batch", {"json": [{"name": "ria", "score": 72}] * 3}),
+        ("post", "/transform", {"json": {"name": "a" * 60, "score": 90}}),
+        ("post", "/transform/stream", {"content": '{"name": "x", "score": 5}\nbad'}),
+    ]
+
+    def responses():
+        out = []
+        for method, url, kwargs in requests:
+            r = getattr(client, method)(url, **kwargs)
+            body = [json.loads(l) for l in r.text.splitlines()]
+            out.append((r.status_code, r.headers["content-type"], body))
+        return out
+
+    expected = responses()
+    monkeypatch.setattr(api_transform, "FAST_RESPONSES", True)
+    assert responses() == expected
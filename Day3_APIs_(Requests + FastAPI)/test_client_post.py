@@ -0,0 +1,155 @@
+# test_client_post.py
+import json
+import time
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from requests.exceptions import HTTPError
+from client_post import (
+    AllEndpointsFailed,
+    CircuitBreaker,
+    EndpointClient,
+    backoff_delay,
+)
+
+
+class StubServer:
+    """Local HTTP/1.1 server answering POSTs with a fixed status after a delay."""
+
+    def __init__(self, status=200, delay=0.0):
+        self.status = status
+        self.delay = delay
+        self.hits = 0
+        self.client_ports = set()  # one per TCP connection used
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stub.hits += 1
+                stub.client_ports.add(self.client_address[1])
+                time.sleep(stub.delay)
+                out = json.dumps({"echo": json.loads(body)}).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}/post"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stubs():
+    servers = []
+
+    def make(**kwargs):
+        servers.append(StubServer(**kwargs))
+        return servers[-1]
+
+    yield make
+    for s in servers:
+        s.close()
+
+
+def dead_url():
+    with socket.socket() as s:  # bound then closed: connections are refused
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}/post"
+
+
+def test_dead_endpoint_fails_over_without_sleeping(stubs):
+    ok = stubs()
+    with EndpointClient([dead_url(), ok.url], backoff=5) as client:
+        start = time.perf_counter()
+        url, resp = client.post({"n": 1})
+    assert url == ok.url and resp.json() == {"echo": {"n": 1}}
+    assert time.perf_counter() - start < 2
+
+
+def test_connections_are_kept_alive(stubs):
+    ok = stubs()
+    with EndpointClient([ok.url]) as client:
+        for i in range(5):
+            client.post({"n": i})
+    assert ok.hits == 5
+    assert len(ok.client_ports) == 1
+
+
+def test_circuit_opens_and_skips_a_failing_endpoint(stubs):
+    broken, ok = stubs(status=503), stubs()
+    with EndpointClient([broken.url, ok.url], failure_threshold=2) as client:
+        for i in range(5):
+            assert client.post({"n": i})[0] == ok.url
+        assert client.breakers[broken.url].state == "open"
+    assert broken.hits == 2  # later calls never reached it
+
+
+def test_hedged_request_wins_over_slow_endpoint(stubs):
+    slow, fast = stubs(delay=1.5), stubs()
+    with EndpointClient([slow.url, fast.url], hedge_after=0.1) as client:
+        start = time.perf_counter()
+        url, _ = client.post({"n": 1})
+        elapsed = time.perf_counter() - start
+    assert url == fast.url
+    assert elapsed < 1.0
+
+
+def test_client_errors_are_not_retried(stubs):
+    bad, ok = stubs(status=404), stubs()
+    with EndpointClient([bad.url, ok.url]) as client:
+        with pytest.raises(HTTPError):
+            client.post({"n": 1})
+        assert client.breakers[bad.url].state == "closed"
+    assert (bad.hits, ok.hits) == (1, 0)
+
+
+def test_all_endpoints_failing_backs_off_then_raises(stubs):
+    broken = stubs(status=500)
+    with EndpointClient([broken.url, dead_url()], rounds=2, backoff=0.01) as client:
+        with pytest.raises(AllEndpointsFailed) as exc:
+            client.post({"n": 1})
+    assert len(exc.value.errors) == 2
+    assert broken.hits == 2
+
+
+def test_breaker_half_open_trial():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=10, clock=lambda: now[0]
+    )
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.state == "half-open"
+    assert breaker.allow()  # the single trial call
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backoff_delay(10, base=0.5, cap=2.0) for _ in range(200)]
+    assert all(0 <= d <= 2.0 for d in delays)
+    assert len(set(delays)) > 100
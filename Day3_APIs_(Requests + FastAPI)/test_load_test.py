@@ -0,0 +1,53 @@
+# test_load_test.py
+import json
+import asyncio
+import httpx
+from api_transform import app
+from load_test import load_payloads, percentile, run_load
+
+URL = "http://testserver/transform"
+
+
+def run(**kwargs):
+    transport = httpx.ASGITransport(app=app)
+    return asyncio.run(run_load(URL, transport=transport, **kwargs)).report()
+
+
+def test_closed_loop_sends_exactly_n_requests():
+    report = run(concurrency=4, duration=0, total=40)
+    assert report["requests"] == report["ok"] == 40
+    assert report["errors"] == {}
+    lat = report["latency_ms"]
+    assert 0 < lat["p50"] <= lat["p95"] <= lat["p99"] <= lat["max"]
+
+
+def test_fixed_rate_keeps_the_schedule():
+    report = run(concurrency=4, duration=0.5, rps=40)
+    assert report["requests"] == 20  # starts at 0, 25ms, ... 475ms
+    assert 30 <= report["rps"] <= 45
+
+
+def test_error_breakdown_and_payload_cycling(tmp_path):
+    path = tmp_path / "payloads.ndjson"
+    bodies = [{"name": "ok", "score": 50}, {"name": "x" * 60, "score": 50}, {}]
+    path.write_text("\n".join(json.dumps(b) for b in bodies) + "\n")
+
+    report = run(bodies=load_payloads(path), concurrency=2, duration=0, total=9)
+    assert report["ok"] == 3
+    assert report["errors"] == {"HTTP 400": 3, "HTTP 422": 3}
+
+
+def test_connection_errors_are_counted():
+    report = asyncio.run(
+        run_load("http://127.0.0.1:9/transform", duration=0, total=3, timeout=1)
+    ).report()
+    assert report["requests"] == 3
+    assert report["errors"] == {"ConnectError": 3}
+
+
+def test_payload_file_formats_and_percentile(tmp_path):
+    path = tmp_path / "payloads.json"
+    path.write_text('[{"name": "a", "score": 1}, {"name": "b", "score": 2}]')
+    assert [b["name"] for b in load_payloads(path)] == ["a", "b"]
+    values = sorted(range(1, 101))
+    assert [percentile(values, p) for p in (50, 95, 99)] == [50, 95, 99]
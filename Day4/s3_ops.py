@@ -3,27 +3,75 @@
 s3_ops.py
 Simple S3 operations: upload, download, list.
 Supports AWS_PROFILE (env var) or --profile argument.
+Whole directories / prefixes move concurrently on one pooled client
+(--upload-dir, --download-prefix); --resume picks interrupted large
+transfers up where they stopped. --sync mirrors a directory and a prefix
+in either direction, moving only what changed. --delete-prefix,
+--copy-prefix and --move-prefix reorganize whole prefixes server-side.
+boto3 is only imported once an operation runs, so --help and argument
+errors return right away; sessions and clients are reused within a process.
 
 Usage examples:
   python s3_ops.py --profile myprofile --bucket my-bucket --upload ./local.txt --key folder/remote.txt
   python s3_ops.py --bucket my-bucket --list
   python s3_ops.py --bucket my-bucket --download folder/remote.txt --destination ./local_copy.txt
+  python s3_ops.py --bucket my-bucket --upload-dir ./data/output --prefix etl/ --workers 16
+  python s3_ops.py --bucket my-bucket --download-prefix etl/ --destination ./restore --resume
+  python s3_ops.py --bucket my-bucket --sync ./data/output --prefix etl/ --direction up
+  python s3_ops.py --bucket my-bucket --move-prefix raw/2024/ --to-prefix archive/2024/ --dry-run
 """
 
+from __future__ import annotations
+
 import os
+import csv
+import json
+import time
+import sqlite3
+import hashlib
 import argparse
-import boto3
-from botocore.exceptions import NoCredentialsError, ClientError
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+# Set by _require_boto3() on first use: importing boto3 costs more than a
+# --help run itself
+boto3 = S3UploadFailedError = TransferConfig = Config = None
+NoCredentialsError = ClientError = None
+
+MB = 1024 * 1024
+PARTIAL_SUFFIX = ".part"  # resumable downloads land here until complete
+DELETE_BATCH = 1000  # most keys a DeleteObjects request takes
+DEFAULT_SYNC_INDEX = os.path.join(os.path.expanduser("~"), ".cache", "s3_ops", "sync.sqlite")
+
+_sessions: dict = {}  # profile -> Session
+_clients: dict = {}  # (Session, max_pool_connections) -> S3 client
+_cache_lock = threading.Lock()
+
+def _require_boto3():
+    global boto3, S3UploadFailedError, TransferConfig, Config, NoCredentialsError, ClientError
+    if boto3 is not None:
+        return
+    import boto3 as _boto3
+    from boto3.exceptions import S3UploadFailedError
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+    from botocore.exceptions import NoCredentialsError, ClientError
+    boto3 = _boto3
 
 def get_session(profile_name: str | None):
-    """Return a boto3 Session, honoring profile_name or AWS_PROFILE env var."""
-    env_profile = os.environ.get("AWS_PROFILE")
-    profile = profile_name or env_profile
-    if profile:
-        return boto3.Session(profile_name=profile)
-    return boto3.Session()
+    """
+    Return a boto3 Session, honoring profile_name or AWS_PROFILE env var.
+    One Session per profile and process: creating one reloads the config files.
+    """
+    _require_boto3()
+    profile = profile_name or os.environ.get("AWS_PROFILE") or None
+    with _cache_lock:
+        if profile not in _sessions:
+            _sessions[profile] = boto3.Session(profile_name=profile)
+        return _sessions[profile]
 
 def upload_file(session: boto3.Session, bucket: str, local_path: str, key: str):
+    _require_boto3()
     s3 = session.resource('s3')
     try:
         print(f"Uploading {local_path} -> s3://{bucket}/{key}")
@@ -39,6 +87,7 @@ def upload_file(session: boto3.Session, bucket: str, local_path: str, key: str):
         raise
 
 def download_file(session: boto3.Session, bucket: str, key: str, destination: str):
+    _require_boto3()
     s3 = session.client('s3')
     try:
         print(f"Downloading s3://{bucket}/{key} -> {destination}")
@@ -55,26 +104,759 @@ def download_file(session: boto3.Session, bucket: str, key: str, destination: st
             print(f"Download failed: {e}")
         raise
 
-def list_objects(session: boto3.Session, bucket: str, prefix: str | None = None):
-    s3 = session.client('s3')
+def make_transfer_config(part_size_mb: int = 8, max_concurrency: int = 10,
+                         multipart_threshold_mb: int = 8) -> TransferConfig:
+    """Part size, threads per object and the size from which multipart is used."""
+    _require_boto3()
+    return TransferConfig(
+        multipart_threshold=multipart_threshold_mb * MB,
+        multipart_chunksize=part_size_mb * MB,
+        max_concurrency=max_concurrency,
+    )
+
+def get_client(session: boto3.Session, max_pool_connections: int = 10):
+    """
+    One S3 client for every worker: clients are thread-safe, and sharing one
+    means sharing its keep-alive connection pool, sized for all the threads.
+    Cached per session and pool size, so repeated operations reuse it.
+    """
+    _require_boto3()
+    with _cache_lock:
+        client = _clients.get((session, max_pool_connections))
+        if client is None:
+            config = Config(max_pool_connections=max_pool_connections, retries={"mode": "standard"})
+            client = _clients[session, max_pool_connections] = session.client('s3', config=config)
+        return client
+
+def _delimited(client, bucket: str, prefix: str, on_objects) -> list:
+    """One Delimiter='/' listing of prefix: its objects go to on_objects, its sub-prefixes are returned."""
+    sub_prefixes = []
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter='/'):
+        if page.get('Contents'):
+            on_objects(page['Contents'])
+        sub_prefixes += [p['Prefix'] for p in page.get('CommonPrefixes', [])]
+    return sub_prefixes
+
+def _paginate(client, bucket: str, prefix: str, on_objects):
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        if page.get('Contents'):
+            on_objects(page['Contents'])
+
+def scan_objects(client, bucket: str, prefix: str, on_objects, workers: int = 8, depth: int = 1):
+    """
+    List every object under prefix, handing each page of objects to
+    on_objects (from several threads; it must be thread-safe).
+
+    One paginator walks a prefix 1000 keys per request, strictly in order.
+    Instead, the prefix is split `depth` levels down at '/' with Delimiter
+    listings, and the sub-prefixes found (shards) are paginated concurrently.
+    Objects met while splitting are passed on as they come.
+    """
+    shards = [prefix]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in range(depth):
+            found = pool.map(lambda p: _delimited(client, bucket, p, on_objects), shards)
+            shards = [p for sub_prefixes in found for p in sub_prefixes]
+            if not shards:
+                return
+        for future in as_completed([pool.submit(_paginate, client, bucket, p, on_objects) for p in shards]):
+            future.result()
+
+def group_of(key: str, prefix: str, depth: int) -> str:
+    """The prefix `key` is counted under: at most `depth` folders below prefix."""
+    folders = key[len(prefix):].split('/')[:-1][:depth]
+    return prefix + ''.join(f + '/' for f in folders)
+
+def human_size(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if n < 1024 or unit == "TB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+INVENTORY_FIELDS = ["key", "size", "etag", "last_modified", "storage_class"]
+INVENTORY_FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".parquet": "parquet"}
+
+class NdjsonInventory:
+    def __init__(self, path: str):
+        self.f = open(path, 'w', encoding='utf-8')
+
+    def write(self, rows: list):
+        self.f.writelines(json.dumps(row) + "\n" for row in rows)
+
+    def close(self):
+        self.f.close()
+
+class CsvInventory:
+    def __init__(self, path: str):
+        self.f = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.f, fieldnames=INVENTORY_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, rows: list):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.f.close()
+
+class ParquetInventory:
+    """Row groups of up to batch_rows keys; pyarrow is only needed for this format."""
+
+    def __init__(self, path: str, batch_rows: int = 100_000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet inventories need pyarrow: pip install pyarrow") from None
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([
+            ("key", pyarrow.string()), ("size", pyarrow.int64()), ("etag", pyarrow.string()),
+            ("last_modified", pyarrow.string()), ("storage_class", pyarrow.string()),
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        self.batch_rows = batch_rows
+        self.rows = []
+
+    def write(self, rows: list):
+        self.rows += rows
+        if len(self.rows) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+INVENTORY_WRITERS = {"ndjson": NdjsonInventory, "csv": CsvInventory, "parquet": ParquetInventory}
+
+class Inventory:
+    """
+    Thread-safe sink for scan_objects: counts objects and bytes per prefix
+    group, and streams rows to an inventory file and/or stdout as pages arrive,
+    so memory stays flat however many keys there are.
+    """
+
+    def __init__(self, prefix: str = "", depth: int = 1, path: str | None = None,
+                 fmt: str | None = None, echo: bool = False):
+        self.prefix = prefix
+        self.depth = depth
+        self.echo = echo
+        self.groups = {}  # prefix -> [objects, bytes]
+        self.objects = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self.writer = None
+        if path:
+            fmt = fmt or INVENTORY_FORMATS.get(os.path.splitext(path)[1].lower())
+            if fmt not in INVENTORY_WRITERS:
+                raise ValueError(f"Unknown inventory format for {path}; use --inventory-format")
+            self.writer = INVENTORY_WRITERS[fmt](path)
+
+    def __call__(self, objects: list):
+        rows = [{
+            "key": obj['Key'],
+            "size": obj['Size'],
+            "etag": obj.get('ETag'),
+            "last_modified": obj['LastModified'].isoformat() if 'LastModified' in obj else None,
+            "storage_class": obj.get('StorageClass'),
+        } for obj in objects]
+        with self._lock:
+            for row in rows:
+                group = self.groups.setdefault(group_of(row['key'], self.prefix, self.depth), [0, 0])
+                group[0] += 1
+                group[1] += row['size']
+            self.objects += len(rows)
+            self.bytes += sum(row['size'] for row in rows)
+            if self.writer:
+                self.writer.write(rows)
+            if self.echo:
+                print("\n".join(f" - {row['key']}    (Size: {row['size']})" for row in rows))
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+    def print_summary(self):
+        width = max([len(g) for g in self.groups] + [len("prefix")])
+        print(f"{'prefix':<{width}}  {'objects':>12}  {'size':>10}")
+        for group, (count, size) in sorted(self.groups.items()):
+            print(f"{group or '/':<{width}}  {count:>12,}  {human_size(size):>10}")
+        print(f"{'total':<{width}}  {self.objects:>12,}  {human_size(self.bytes):>10}")
+
+def list_objects(session: boto3.Session, bucket: str, prefix: str | None = None,
+                 inventory: str | None = None, inventory_format: str | None = None,
+                 summary_only: bool = False, workers: int = 8, depth: int = 1) -> Inventory:
+    """
+    List prefix with scan_objects. Prints every key unless an inventory file
+    is written or summary_only is set; those print counts and bytes per prefix.
+    """
+    prefix = prefix or ""
+    s3 = get_client(session, workers)
+    sink = Inventory(prefix, depth, inventory, inventory_format,
+                     echo=not (inventory or summary_only))
     try:
-        paginator = s3.get_paginator('list_objects_v2')
-        params = {'Bucket': bucket}
-        if prefix:
-            params['Prefix'] = prefix
-        print(f"Listing objects in s3://{bucket}/{'' if not prefix else prefix}")
-        for page in paginator.paginate(**params):
-            contents = page.get('Contents', [])
-            if not contents:
-                continue
-            for obj in contents:
-                print(f" - {obj['Key']}    (Size: {obj['Size']})")
+        print(f"Listing objects in s3://{bucket}/{prefix}")
+        started = time.perf_counter()
+        scan_objects(s3, bucket, prefix, sink, workers, depth)
+        elapsed = time.perf_counter() - started
     except NoCredentialsError:
         print("ERROR: No AWS credentials found.")
         raise
     except ClientError as e:
         print(f"List failed: {e}")
         raise
+    finally:
+        sink.close()
+    if inventory or summary_only:
+        sink.print_summary()
+        rate = sink.objects / elapsed if elapsed else 0.0
+        print(f"Listed {sink.objects:,} objects in {elapsed:.2f}s ({rate:,.0f} keys/s)"
+              + (f", inventory: {inventory}" if inventory else ""))
+    return sink
+
+class TransferStats:
+    """Aggregate result of a bulk transfer or operation."""
+
+    def __init__(self, action: str, unit: str = "files"):
+        self.action = action
+        self.unit = unit
+        self.files = 0
+        self.bytes = 0
+        self.failures = []  # (name, error)
+        self.done = []  # jobs that succeeded
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return self.bytes / MB / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def ops_per_s(self) -> float:
+        return (self.files + len(self.failures)) / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        print(f"{self.action} {self.files:,} {self.unit}, {self.bytes / MB:.1f} MB in "
+              f"{self.elapsed:.2f}s ({self.throughput_mb_s:.1f} MB/s, {self.ops_per_s:,.0f} ops/s)"
+              + (f", {len(self.failures)} failed" if self.failures else ""))
+
+def run_bounded(jobs, fn, workers: int):
+    """
+    Yield (job, future) for fn(*job) as each finishes, on `workers` threads.
+    At most 2 * workers jobs are submitted at a time, so a million-key job
+    list never turns into a million pending futures.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for job in jobs:
+            if len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future
+            pending[pool.submit(fn, *job)] = job
+        for future in as_completed(pending):
+            yield pending[future], future
+
+def run_transfers(jobs, transfer, workers: int, action: str, unit: str = "files") -> TransferStats:
+    """
+    Run transfer(*job) for every job on `workers` threads. Each returns the
+    bytes it moved; one failing object is reported and does not stop the rest.
+    """
+    stats = TransferStats(action, unit)
+    for job, future in run_bounded(jobs, transfer, workers):
+        name = job[0]
+        try:
+            stats.bytes += future.result()
+            stats.files += 1
+            stats.done.append(job)
+        except (ClientError, S3UploadFailedError, OSError) as e:
+            print(f"  FAILED {name}: {e}")
+            stats.failures.append((name, e))
+    stats.elapsed = time.perf_counter() - stats.started
+    stats.report()
+    return stats
+
+def _part_count(size: int, part_size: int) -> int:
+    return max(1, -(-size // part_size))
+
+def _latest_multipart_upload(client, bucket: str, key: str) -> str | None:
+    """UploadId of the newest unfinished multipart upload of `key`, if any."""
+    uploads = []
+    paginator = client.get_paginator('list_multipart_uploads')
+    for page in paginator.paginate(Bucket=bucket, Prefix=key):
+        uploads += [u for u in page.get('Uploads', []) if u['Key'] == key]
+    if not uploads:
+        return None
+    return max(uploads, key=lambda u: u['Initiated'])['UploadId']
+
+def resumable_upload(client, bucket: str, local_path: str, key: str,
+                     config: TransferConfig) -> int:
+    """
+    Multipart upload that continues an interrupted one. S3 keeps the parts of
+    an unfinished upload, so it is the record of progress: a part already
+    there whose ETag (its MD5) matches the local bytes is not sent again.
+    """
+    size = os.path.getsize(local_path)
+    part_size = config.multipart_chunksize
+    uploaded = {}
+    upload_id = _latest_multipart_upload(client, bucket, key)
+    if upload_id:
+        paginator = client.get_paginator('list_parts')
+        for page in paginator.paginate(Bucket=bucket, Key=key, UploadId=upload_id):
+            uploaded.update((p['PartNumber'], p) for p in page.get('Parts', []))
+        print(f"Resuming s3://{bucket}/{key}: {len(uploaded)} parts already uploaded")
+    else:
+        upload_id = client.create_multipart_upload(Bucket=bucket, Key=key)['UploadId']
+
+    def send(number: int) -> str:
+        offset = (number - 1) * part_size
+        with open(local_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(part_size)
+        etag = '"%s"' % hashlib.md5(data).hexdigest()
+        old = uploaded.get(number)
+        if old and old['ETag'] == etag and old['Size'] == len(data):
+            return etag
+        return client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id,
+                                  PartNumber=number, Body=data)['ETag']
+
+    numbers = range(1, _part_count(size, part_size) + 1)
+    with ThreadPoolExecutor(max_workers=config.max_concurrency) as pool:
+        etags = list(pool.map(send, numbers))
+    client.complete_multipart_upload(
+        Bucket=bucket, Key=key, UploadId=upload_id,
+        MultipartUpload={'Parts': [{'PartNumber': n, 'ETag': e} for n, e in zip(numbers, etags)]},
+    )
+    return size
+
+def resumable_download(client, bucket: str, key: str, destination: str,
+                       config: TransferConfig) -> int:
+    """
+    Ranged GETs of part_size into destination + '.part', written in place by
+    max_concurrency threads. Finished parts are recorded in a '.part.json'
+    next to it, so a rerun only fetches the rest - unless the object changed
+    (its ETag differs), in which case it starts over. The file is renamed to
+    `destination` once complete.
+    """
+    head = client.head_object(Bucket=bucket, Key=key)
+    size, etag = head['ContentLength'], head['ETag']
+    part_size = config.multipart_chunksize
+    partial = destination + PARTIAL_SUFFIX
+    state_path = partial + ".json"
+    state = {}
+    if os.path.exists(partial) and os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+    if (state.get('etag'), state.get('size'), state.get('part_size')) != (etag, size, part_size):
+        state = {'etag': etag, 'size': size, 'part_size': part_size, 'done': []}
+        with open(partial, 'wb') as f:
+            f.truncate(size)
+    elif state['done']:
+        print(f"Resuming s3://{bucket}/{key}: {len(state['done'])} parts already downloaded")
+    done = set(state['done'])
+    lock = threading.Lock()
+
+    def fetch(number: int):
+        if number in done or size == 0:
+            return
+        start = (number - 1) * part_size
+        end = min(size, start + part_size) - 1
+        body = client.get_object(Bucket=bucket, Key=key, IfMatch=etag,
+                                 Range=f"bytes={start}-{end}")['Body'].read()
+        with open(partial, 'r+b') as f:
+            f.seek(start)
+            f.write(body)
+        with lock:
+            done.add(number)
+            state['done'] = sorted(done)
+            with open(state_path, 'w') as f:
+                json.dump(state, f)
+
+    with ThreadPoolExecutor(max_workers=config.max_concurrency) as pool:
+        list(pool.map(fetch, range(1, _part_count(size, part_size) + 1)))
+    os.replace(partial, destination)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    return size
+
+def upload_one(client, bucket: str, path: str, key: str, config: TransferConfig,
+               resume: bool = False) -> int:
+    size = os.path.getsize(path)
+    if resume and size >= config.multipart_threshold:
+        return resumable_upload(client, bucket, path, key, config)
+    client.upload_file(path, bucket, key, Config=config)
+    return size
+
+def download_one(client, bucket: str, key: str, path: str, size: int,
+                 config: TransferConfig, resume: bool = False) -> int:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if resume and size >= config.multipart_threshold:
+        return resumable_download(client, bucket, key, path, config)
+    client.download_file(bucket, key, path, Config=config)
+    return size
+
+def walk_files(local_dir: str, prefix: str):
+    """(path, key) for every file under local_dir, keyed by its relative path."""
+    for root, _, files in os.walk(local_dir):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            yield path, prefix + os.path.relpath(path, local_dir).replace(os.sep, "/")
+
+def local_path_for(key: str, prefix: str, root: str) -> str | None:
+    """Where `key` goes under root; None for folder markers and keys escaping root."""
+    relative = key[len(prefix):].lstrip('/')
+    path = os.path.abspath(os.path.join(root, relative))
+    if not relative or relative.endswith('/') or not path.startswith(root + os.sep):
+        return None
+    return path
+
+def upload_dir(session: boto3.Session, bucket: str, local_dir: str, prefix: str = "",
+               workers: int = 8, config: TransferConfig | None = None,
+               resume: bool = False) -> TransferStats:
+    """Upload every file under local_dir to prefix + its relative path."""
+    config = config or make_transfer_config()
+    client = get_client(session, workers * config.max_concurrency)
+    jobs = list(walk_files(local_dir, prefix))
+
+    def upload(path: str, key: str) -> int:
+        return upload_one(client, bucket, path, key, config, resume)
+
+    print(f"Uploading {len(jobs)} files {local_dir} -> s3://{bucket}/{prefix} ({workers} workers)")
+    return run_transfers(jobs, upload, workers, "Uploaded")
+
+def download_prefix(session: boto3.Session, bucket: str, prefix: str, destination: str,
+                    workers: int = 8, config: TransferConfig | None = None,
+                    resume: bool = False) -> TransferStats:
+    """Download every object under prefix into destination, keeping the key layout."""
+    config = config or make_transfer_config()
+    client = get_client(session, workers * config.max_concurrency)
+    root = os.path.abspath(destination)
+    jobs = []
+
+    def collect(page: list):
+        for obj in page:
+            path = local_path_for(obj['Key'], prefix, root)
+            if path:
+                jobs.append((obj['Key'], path, obj['Size']))
+
+    scan_objects(client, bucket, prefix, collect, workers)
+    jobs.sort()
+
+    def download(key: str, path: str, size: int) -> int:
+        return download_one(client, bucket, key, path, size, config, resume)
+
+    print(f"Downloading {len(jobs)} objects s3://{bucket}/{prefix} -> {destination} ({workers} workers)")
+    return run_transfers(jobs, download, workers, "Downloaded")
+
+def local_etag(path: str, part_size: int | None = None) -> str:
+    """
+    The ETag S3 gives these bytes: their MD5, or uploaded in parts of
+    part_size, the MD5 of the concatenated part MD5s followed by -<parts>.
+    """
+    with open(path, 'rb') as f:
+        if part_size is None:
+            digest = hashlib.md5()
+            for chunk in iter(lambda: f.read(MB), b''):
+                digest.update(chunk)
+            return '"%s"' % digest.hexdigest()
+        parts = [hashlib.md5(data).digest() for data in iter(lambda: f.read(part_size), b'')]
+    return '"%s-%d"' % (hashlib.md5(b''.join(parts)).hexdigest(), len(parts))
+
+def etag_matches(path: str, size: int, etag: str, part_size: int = 8 * MB) -> bool:
+    """
+    Does the local file have this ETag? A multipart ETag depends on the part
+    size used, which S3 does not record, so the usual ones are tried: ours,
+    the AWS CLI/boto3 8 MB default, the 5 MB minimum, 16 MB, and the size
+    that splits the file into exactly that many whole-MB parts.
+    """
+    if '-' not in etag:
+        return local_etag(path) == etag
+    parts = int(etag.strip('"').rsplit('-', 1)[1])
+    guess = -(-size // parts // MB) * MB
+    tried = set()
+    for candidate in (part_size, 8 * MB, 5 * MB, 16 * MB, guess, guess + MB):
+        if candidate in tried or not candidate or _part_count(size, candidate) != parts:
+            continue
+        tried.add(candidate)
+        if local_etag(path, candidate) == etag:
+            return True
+    return False
+
+class SyncIndex:
+    """
+    SQLite file remembering, per bucket, the last listing of each synced
+    prefix (so a repeat sync within listing_ttl needs no LIST calls) and the
+    size/mtime/ETag each local file had when it was last in sync (so
+    unchanged files are not hashed again). Used from one thread only.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS listings (
+        bucket TEXT, prefix TEXT, listed_at REAL, PRIMARY KEY (bucket, prefix));
+    CREATE TABLE IF NOT EXISTS objects (
+        bucket TEXT, key TEXT, size INTEGER, etag TEXT, PRIMARY KEY (bucket, key));
+    CREATE TABLE IF NOT EXISTS synced (
+        bucket TEXT, key TEXT, path TEXT, size INTEGER, mtime_ns INTEGER, etag TEXT,
+        PRIMARY KEY (bucket, key, path));
+    """
+
+    def __init__(self, path: str = DEFAULT_SYNC_INDEX):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(self.SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def listing(self, bucket: str, prefix: str, max_age: float) -> dict | None:
+        """{key: (size, etag)} from a listing at most max_age seconds old, else None."""
+        row = self.db.execute("SELECT listed_at FROM listings WHERE bucket = ? AND prefix = ?",
+                              (bucket, prefix)).fetchone()
+        if row is None or time.time() - row[0] > max_age:
+            return None
+        rows = self.db.execute(
+            "SELECT key, size, etag FROM objects WHERE bucket = ? AND substr(key, 1, ?) = ?",
+            (bucket, len(prefix), prefix))
+        return {key: (size, etag) for key, size, etag in rows}
+
+    def save_listing(self, bucket: str, prefix: str, objects: dict):
+        with self.db:
+            self.db.execute("DELETE FROM objects WHERE bucket = ? AND substr(key, 1, ?) = ?",
+                            (bucket, len(prefix), prefix))
+            self.db.executemany("INSERT INTO objects VALUES (?, ?, ?, ?)",
+                                ((bucket, key, size, etag) for key, (size, etag) in objects.items()))
+            self.db.execute("INSERT OR REPLACE INTO listings VALUES (?, ?, ?)",
+                            (bucket, prefix, time.time()))
+
+    def put_objects(self, bucket: str, objects: dict):
+        """Objects we just wrote; their ETag may be None until the next real listing."""
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?)",
+                                ((bucket, key, size, etag) for key, (size, etag) in objects.items()))
+
+    def synced(self, bucket: str, prefix: str) -> dict:
+        """{(key, path): (size, mtime_ns, etag)} for files last in sync under prefix."""
+        rows = self.db.execute(
+            "SELECT key, path, size, mtime_ns, etag FROM synced"
+            " WHERE bucket = ? AND substr(key, 1, ?) = ?", (bucket, len(prefix), prefix))
+        return {(key, path): (size, mtime_ns, etag) for key, path, size, mtime_ns, etag in rows}
+
+    def record_synced(self, bucket: str, rows):
+        """rows: (key, path, size, mtime_ns, etag)."""
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO synced VALUES (?, ?, ?, ?, ?, ?)",
+                                ((bucket, *row) for row in rows))
+
+def remote_listing(client, index: SyncIndex, bucket: str, prefix: str,
+                   listing_ttl: float, workers: int = 8) -> dict:
+    """{key: (size, etag)} under prefix, from the index while it is fresh enough."""
+    objects = index.listing(bucket, prefix, listing_ttl)
+    if objects is not None:
+        print(f"Using cached listing of s3://{bucket}/{prefix} ({len(objects)} objects)")
+        return objects
+    objects = {}
+
+    def collect(page: list):
+        objects.update((obj['Key'], (obj['Size'], obj['ETag'])) for obj in page)
+
+    scan_objects(client, bucket, prefix, collect, workers)
+    index.save_listing(bucket, prefix, objects)
+    return objects
+
+def in_sync(path: str, stat: os.stat_result, remote: tuple | None, last: tuple | None,
+            part_size: int) -> bool:
+    """
+    Whether the local file and the remote (size, etag) hold the same bytes.
+    Sizes differ: changed. Size and mtime as recorded at the last sync and
+    the same remote ETag (or one we have not listed since writing it):
+    unchanged without reading the file. Otherwise compare ETags by hashing.
+    """
+    if remote is None or remote[0] != stat.st_size:
+        return False
+    size, etag = remote
+    if last and last[:2] == (stat.st_size, stat.st_mtime_ns) and last[2] in (None, etag):
+        return True
+    return bool(etag) and etag_matches(path, size, etag, part_size)
+
+def sync(session: boto3.Session, bucket: str, local_dir: str, prefix: str = "",
+         direction: str = "up", index: SyncIndex | None = None, workers: int = 8,
+         config: TransferConfig | None = None, listing_ttl: float = 300,
+         resume: bool = False) -> TransferStats:
+    """
+    Make prefix mirror local_dir (direction "up") or local_dir mirror prefix
+    ("down"), transferring new and changed files concurrently. Nothing is
+    deleted on the other side.
+    """
+    config = config or make_transfer_config()
+    index = index or SyncIndex()
+    client = get_client(session, workers * config.max_concurrency)
+    remote = remote_listing(client, index, bucket, prefix, listing_ttl, workers)
+    last = index.synced(bucket, prefix)
+    root = os.path.abspath(local_dir)
+    unchanged, jobs = [], []
+
+    if direction == "up":
+        for path, key in walk_files(root, prefix):
+            stat = os.stat(path)
+            if in_sync(path, stat, remote.get(key), last.get((key, path)), config.multipart_chunksize):
+                unchanged.append((key, path, stat.st_size, stat.st_mtime_ns, remote[key][1]))
+            else:
+                jobs.append((path, key, stat))
+
+        def transfer(path: str, key: str, stat: os.stat_result) -> int:
+            return upload_one(client, bucket, path, key, config, resume)
+    else:
+        for key, (size, etag) in remote.items():
+            path = local_path_for(key, prefix, root)
+            if path is None:
+                continue
+            stat = os.stat(path) if os.path.isfile(path) else None
+            if stat and in_sync(path, stat, (size, etag), last.get((key, path)),
+                                config.multipart_chunksize):
+                unchanged.append((key, path, stat.st_size, stat.st_mtime_ns, etag))
+            else:
+                jobs.append((key, path, size))
+
+        def transfer(key: str, path: str, size: int) -> int:
+            return download_one(client, bucket, key, path, size, config, resume)
+
+    index.record_synced(bucket, unchanged)
+    print(f"Sync {direction} {local_dir} <-> s3://{bucket}/{prefix}: "
+          f"{len(unchanged)} unchanged, {len(jobs)} to transfer ({workers} workers)")
+    stats = run_transfers(jobs, transfer, workers, "Uploaded" if direction == "up" else "Downloaded")
+
+    if direction == "up":
+        # Uploaded ETags are learnt from the next real listing
+        index.put_objects(bucket, {key: (stat.st_size, None) for _, key, stat in stats.done})
+        index.record_synced(bucket, [(key, path, stat.st_size, stat.st_mtime_ns, None)
+                                     for path, key, stat in stats.done])
+    else:
+        done = []
+        for key, path, _ in stats.done:
+            stat = os.stat(path)
+            done.append((key, path, stat.st_size, stat.st_mtime_ns, remote[key][1]))
+        index.record_synced(bucket, done)
+    return stats
+
+def list_keys(client, bucket: str, prefix: str, workers: int = 8) -> list:
+    """Sorted (key, size) of every object under prefix."""
+    objects = []
+    scan_objects(client, bucket, prefix,
+                 lambda page: objects.extend((obj['Key'], obj['Size']) for obj in page), workers)
+    objects.sort()
+    return objects
+
+def preview(verb: str, lines: list, total_bytes: int, show: int = 10):
+    """Dry run: what would happen, without doing it."""
+    for line in lines[:show]:
+        print(f"  (dry run) {verb} {line}")
+    if len(lines) > show:
+        print(f"  (dry run) ... and {len(lines) - show:,} more")
+    print(f"Dry run: would {verb} {len(lines):,} objects, {human_size(total_bytes)}")
+
+def delete_keys(client, bucket: str, objects: list, workers: int = 8,
+                batch_size: int = DELETE_BATCH) -> TransferStats:
+    """
+    Delete (key, size) objects with DeleteObjects, batch_size keys per
+    request, batches running concurrently. Keys S3 refuses to delete are
+    reported one by one; a failed request reports each of its keys.
+    """
+    stats = TransferStats("Deleted", "objects")
+    batches = [(objects[i:i + batch_size],) for i in range(0, len(objects), batch_size)]
+
+    def delete_batch(batch: list) -> list:
+        resp = client.delete_objects(Bucket=bucket, Delete={
+            'Objects': [{'Key': key} for key, _ in batch], 'Quiet': True})
+        return resp.get('Errors', [])
+
+    for (batch,), future in run_bounded(batches, delete_batch, workers):
+        try:
+            errors = {e['Key']: f"{e.get('Code')}: {e.get('Message')}" for e in future.result()}
+        except ClientError as e:
+            errors = {key: str(e) for key, _ in batch}
+        for key, size in batch:
+            if key in errors:
+                print(f"  FAILED {key}: {errors[key]}")
+                stats.failures.append((key, errors[key]))
+            else:
+                stats.files += 1
+                stats.bytes += size
+                stats.done.append((key, size))
+    stats.elapsed = time.perf_counter() - stats.started
+    stats.report()
+    return stats
+
+def delete_prefix(session: boto3.Session, bucket: str, prefix: str, workers: int = 8,
+                  dry_run: bool = False, batch_size: int = DELETE_BATCH) -> TransferStats | None:
+    if not prefix:
+        raise ValueError("Refusing to delete a whole bucket: give a non-empty prefix")
+    client = get_client(session, workers)
+    objects = list_keys(client, bucket, prefix, workers)
+    if dry_run:
+        preview("delete", [f"s3://{bucket}/{key}" for key, _ in objects],
+                sum(size for _, size in objects))
+        return None
+    print(f"Deleting {len(objects):,} objects under s3://{bucket}/{prefix} "
+          f"({-(-len(objects) // batch_size)} batches, {workers} workers)")
+    return delete_keys(client, bucket, objects, workers, batch_size)
+
+def copy_one(client, bucket: str, key: str, dest_bucket: str, dest_key: str, size: int,
+             config: TransferConfig) -> int:
+    """
+    Server-side copy: CopyObject for objects under the multipart threshold;
+    larger ones through the managed copy, which copies parts of part_size
+    with UploadPartCopy on max_concurrency threads (and has no 5 GB limit).
+    """
+    source = {'Bucket': bucket, 'Key': key}
+    if size >= config.multipart_threshold:
+        client.copy(source, dest_bucket, dest_key, Config=config)
+    else:
+        client.copy_object(CopySource=source, Bucket=dest_bucket, Key=dest_key)
+    return size
+
+def copy_prefix(session: boto3.Session, bucket: str, prefix: str, dest_prefix: str,
+                dest_bucket: str | None = None, workers: int = 8,
+                config: TransferConfig | None = None, dry_run: bool = False,
+                move: bool = False) -> TransferStats | None:
+    """
+    Copy every object under prefix to dest_prefix + the rest of its key,
+    server-side. With move, each source is deleted (in DeleteObjects
+    batches) once its copy succeeded; failed copies keep their source.
+    Overlapping prefixes in one bucket are refused: a copy could land on a
+    source key that is still to be copied (or deleted, with move).
+    """
+    if move and not prefix:
+        raise ValueError("Refusing to move a whole bucket: give a non-empty prefix")
+    dest_bucket = dest_bucket or bucket
+    if dest_bucket == bucket and (dest_prefix.startswith(prefix) or prefix.startswith(dest_prefix)):
+        raise ValueError(f"Refusing to {'move' if move else 'copy'} {prefix!r} to the overlapping "
+                         f"prefix {dest_prefix!r} in the same bucket")
+    config = config or make_transfer_config()
+    client = get_client(session, workers * config.max_concurrency)
+    jobs = [(key, dest_prefix + key[len(prefix):], size)
+            for key, size in list_keys(client, bucket, prefix, workers)]
+    verb = "move" if move else "copy"
+    if dry_run:
+        preview(verb, [f"s3://{bucket}/{key} -> s3://{dest_bucket}/{dest}" for key, dest, _ in jobs],
+                sum(size for _, _, size in jobs))
+        return None
+
+    def copy(key: str, dest_key: str, size: int) -> int:
+        return copy_one(client, bucket, key, dest_bucket, dest_key, size, config)
+
+    print(f"{'Moving' if move else 'Copying'} {len(jobs):,} objects s3://{bucket}/{prefix} -> "
+          f"s3://{dest_bucket}/{dest_prefix} ({workers} workers)")
+    stats = run_transfers(jobs, copy, workers, "Copied", "objects")
+    if move and stats.done:
+        deleted = delete_keys(client, bucket, [(key, size) for key, _, size in stats.done], workers)
+        stats.failures += [(key, f"copied, but not deleted: {e}") for key, e in deleted.failures]
+    return stats
 
 def parse_args():
     p = argparse.ArgumentParser(description="Simple S3 operations.")
@@ -85,11 +867,47 @@ def parse_args():
     p.add_argument("--destination", help="Local destination path for download (required if --download).")
     p.add_argument("--key", help="S3 key for upload (required if --upload).")
     p.add_argument("--list", action="store_true", help="List objects in bucket.")
-    p.add_argument("--prefix", help="Optional prefix to filter listing.")
+    p.add_argument("--prefix", help="Optional prefix to filter listing (key prefix for --upload-dir).")
+    p.add_argument("--inventory", help="--list: write the keys to this file (.ndjson, .csv or .parquet).")
+    p.add_argument("--inventory-format", choices=sorted(INVENTORY_WRITERS),
+                   help="Inventory format when the extension does not tell.")
+    p.add_argument("--summary", action="store_true",
+                   help="--list: only print object counts and bytes per prefix.")
+    p.add_argument("--shard-depth", type=int, default=1,
+                   help="--list: split the prefix this many '/' levels down and list the parts concurrently.")
+    p.add_argument("--upload-dir", help="Local directory to upload recursively under --prefix.")
+    p.add_argument("--download-prefix", help="Download every object under this prefix into --destination.")
+    p.add_argument("--workers", type=int, default=8, help="Objects transferred at once (default 8).")
+    p.add_argument("--part-size-mb", type=int, default=8, help="Multipart part size (default 8).")
+    p.add_argument("--max-concurrency", type=int, default=10, help="Threads per multipart object (default 10).")
+    p.add_argument("--multipart-threshold-mb", type=int, default=8,
+                   help="Objects from this size up go multipart (default 8).")
+    p.add_argument("--resume", action="store_true",
+                   help="Continue interrupted multipart transfers instead of starting over.")
+    p.add_argument("--sync", metavar="DIR", help="Transfer only new/changed files between DIR and --prefix.")
+    p.add_argument("--direction", choices=["up", "down"], default="up",
+                   help="--sync direction: up (DIR -> S3, default) or down (S3 -> DIR).")
+    p.add_argument("--sync-index", default=DEFAULT_SYNC_INDEX,
+                   help=f"SQLite file caching listings and sync state (default {DEFAULT_SYNC_INDEX}).")
+    p.add_argument("--delete-prefix", help="Delete every object under this prefix (DeleteObjects batches).")
+    p.add_argument("--copy-prefix", help="Server-side copy every object under this prefix to --to-prefix.")
+    p.add_argument("--move-prefix", help="Like --copy-prefix, then delete each copied source.")
+    p.add_argument("--to-prefix", help="Destination prefix for --copy-prefix / --move-prefix.")
+    p.add_argument("--to-bucket", help="Destination bucket for --copy-prefix / --move-prefix (default --bucket).")
+    p.add_argument("--dry-run", action="store_true",
+                   help="Show what --delete/--copy/--move-prefix would do, and change nothing.")
+    p.add_argument("--listing-ttl", type=float, default=300,
+                   help="Reuse a cached listing younger than this many seconds (default 300, 0: always LIST).")
     return p.parse_args()
 
 def main():
     args = parse_args()
+    if not any([args.upload, args.download, args.list, args.upload_dir,
+                args.download_prefix is not None, args.sync, args.delete_prefix,
+                args.copy_prefix, args.move_prefix]):
+        print("No operation specified. Use --upload, --download, --list, --upload-dir, "
+              "--download-prefix, --sync, --delete-prefix, --copy-prefix or --move-prefix.")
+        return
     session = get_session(args.profile)
     # Basic sanity:
     try:
@@ -104,10 +922,38 @@ def main():
             download_file(session, args.bucket, args.download, args.destination)
 
         if args.list:
-            list_objects(session, args.bucket, args.prefix)
+            list_objects(session, args.bucket, args.prefix, args.inventory, args.inventory_format,
+                         args.summary, args.workers, args.shard_depth)
+
+        config = make_transfer_config(args.part_size_mb, args.max_concurrency,
+                                      args.multipart_threshold_mb)
+        if args.upload_dir:
+            upload_dir(session, args.bucket, args.upload_dir, args.prefix or "",
+                       args.workers, config, args.resume)
+
+        if args.download_prefix is not None:
+            if not args.destination:
+                raise SystemExit("Error: --destination is required when using --download-prefix")
+            download_prefix(session, args.bucket, args.download_prefix, args.destination,
+                            args.workers, config, args.resume)
+
+        if args.sync:
+            index = SyncIndex(args.sync_index)
+            try:
+                sync(session, args.bucket, args.sync, args.prefix or "", args.direction, index,
+                     args.workers, config, args.listing_ttl, args.resume)
+            finally:
+                index.close()
+
+        if args.delete_prefix:
+            delete_prefix(session, args.bucket, args.delete_prefix, args.workers, args.dry_run)
 
-        if not any([args.upload, args.download, args.list]):
-            print("No operation specified. Use --upload, --download, or --list.")
+        for source, move in ((args.copy_prefix, False), (args.move_prefix, True)):
+            if source:
+                if args.to_prefix is None:
+                    raise SystemExit("Error: --to-prefix is required when using --copy-prefix or --move-prefix")
+                copy_prefix(session, args.bucket, source, args.to_prefix, args.to_bucket,
+                            args.workers, config, args.dry_run, move)
     except NoCredentialsError:
         print("NoCredentialsError: Check your AWS credentials. Try 'aws configure' or set AWS_PROFILE.")
     except ClientError as e:
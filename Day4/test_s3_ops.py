@@ -0,0 +1,431 @@
+# test_s3_ops.py
+import os
+import sys
+import json
+import subprocess
+import boto3
+import pytest
+from moto import mock_aws
+import s3_ops
+from s3_ops import (
+    MB,
+    PARTIAL_SUFFIX,
+    SyncIndex,
+    download_prefix,
+    get_client,
+    get_session,
+    local_etag,
+    make_transfer_config,
+    resumable_download,
+    resumable_upload,
+    sync,
+    upload_dir,
+)
+
+BUCKET = "test-bucket"
+
+
+def fake_s3():
+    """A moto S3 with BUCKET in it, and fake credentials."""
+    with pytest.MonkeyPatch.context() as mp:
+        for name, value in {
+            "AWS_ACCESS_KEY_ID": "testing",
+            "AWS_SECRET_ACCESS_KEY": "testing",
+            "AWS_DEFAULT_REGION": "us-east-1",
+        }.items():
+            mp.setenv(name, value)
+        mp.delenv("AWS_PROFILE", raising=False)
+        with mock_aws():
+            session = boto3.Session()
+            session.client("s3").create_bucket(Bucket=BUCKET)
+            yield session
+
+
+@pytest.fixture
+def session():
+    yield from fake_s3()
+
+
+def small_parts():
+    # 5 MB is the smallest part S3 (and moto) accepts
+    return make_transfer_config(
+        part_size_mb=5, max_concurrency=4, multipart_threshold_mb=5
+    )
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return data
+
+
+def tree(root):
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in root.rglob("*")
+        if p.is_file()
+    }
+
+
+def test_directory_round_trip(session, tmp_path):
+    src = tmp_path / "src"
+    write(src / "a.txt", b"alpha")
+    write(src / "sub" / "b.csv", b"x,y\n1,2\n")
+    write(src / "sub" / "deep" / "big.bin", os.urandom(11 * MB))
+
+    up = upload_dir(session, BUCKET, str(src), "etl/", workers=3, config=small_parts())
+    assert (up.files, up.bytes, up.failures) == (3, 11 * MB + 13, [])
+
+    client = session.client("s3")
+    head = client.head_object(Bucket=BUCKET, Key="etl/sub/deep/big.bin")
+    assert head["ETag"].endswith('-3"')  # went multipart, 5+5+1 MB
+
+    down = download_prefix(session, BUCKET, "etl/", str(tmp_path / "dst"), workers=3)
+    assert (down.files, down.failures) == (3, [])
+    assert tree(tmp_path / "dst") == tree(src)
+
+
+def test_failed_objects_are_reported_not_raised(session, tmp_path):
+    write(tmp_path / "a.txt", b"alpha")
+    stats = upload_dir(session, "no-such-bucket", str(tmp_path), workers=2)
+    assert stats.files == 0 and len(stats.failures) == 1
+
+
+def test_resumable_upload_sends_only_missing_parts(session, tmp_path):
+    data = write(tmp_path / "big.bin", os.urandom(12 * MB))
+    client = get_client(session)
+    # An interrupted upload: part 1 made it, part 2 holds stale bytes
+    upload_id = client.create_multipart_upload(Bucket=BUCKET, Key="big.bin")["UploadId"]
+    for number, body in ((1, data[: 5 * MB]), (2, b"\0" * 5 * MB)):
+        client.upload_part(
+            Bucket=BUCKET,
+            Key="big.bin",
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+
+    sent = []
+    real_upload_part = client.upload_part
+    client.upload_part = lambda **kw: sent.append(kw["PartNumber"]) or real_upload_part(
+        **kw
+    )
+    resumable_upload(
+        client, BUCKET, str(tmp_path / "big.bin"), "big.bin", small_parts()
+    )
+
+    assert sorted(sent) == [2, 3]
+    assert client.get_object(Bucket=BUCKET, Key="big.bin")["Body"].read() == data
+    assert client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+
+
+def test_resumable_download_fetches_only_missing_parts(session, tmp_path):
+    data = os.urandom(12 * MB)
+    client = get_client(session)
+    client.put_object(Bucket=BUCKET, Key="big.bin", Body=data)
+    etag = client.head_object(Bucket=BUCKET, Key="big.bin")["ETag"]
+
+    # An interrupted download with part 2 finished
+    destination = tmp_path / "big.bin"
+    partial = tmp_path / ("big.bin" + PARTIAL_SUFFIX)
+    with open(partial, "wb") as f:
+        f.truncate(len(data))
+        f.seek(5 * MB)
+        f.write(data[5 * MB : 10 * MB])
+    state = {"etag": etag, "size": len(data), "part_size": 5 * MB, "done": [2]}
+    (tmp_path / ("big.bin" + PARTIAL_SUFFIX + ".json")).write_text(json.dumps(state))
+
+    ranges = []
+    real_get_object = client.get_object
+    client.get_object = lambda **kw: ranges.append(kw["Range"]) or real_get_object(**kw)
+    resumable_download(client, BUCKET, "big.bin", str(destination), small_parts())
+
+    assert sorted(ranges) == [f"bytes=0-{5 * MB - 1}", f"bytes={10 * MB}-{12 * MB - 1}"]
+    assert destination.read_bytes() == data
+    assert sorted(os.listdir(tmp_path)) == ["big.bin"]
+
+
+def test_resumable_download_restarts_when_object_changed(session, tmp_path):
+    client = get_client(session)
+    client.put_object(Bucket=BUCKET, Key="k", Body=b"new contents")
+    partial = tmp_path / ("k" + PARTIAL_SUFFIX)
+    partial.write_bytes(b"old")
+    state = {"etag": '"stale"', "size": 3, "part_size": 5 * MB, "done": [1]}
+    (tmp_path / ("k" + PARTIAL_SUFFIX + ".json")).write_text(json.dumps(state))
+
+    resumable_download(client, BUCKET, "k", str(tmp_path / "k"), small_parts())
+    assert (tmp_path / "k").read_bytes() == b"new contents"
+
+
+def count_calls(session, operation):
+    calls = []
+    session.events.register(f"before-call.s3.{operation}", lambda **kw: calls.append(1))
+    return calls
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """Paths whose ETag sync had to compute."""
+    paths = []
+    real = s3_ops.etag_matches
+    monkeypatch.setattr(
+        s3_ops, "etag_matches", lambda path, *a: paths.append(path) or real(path, *a)
+    )
+    return paths
+
+
+def test_sync_up_transfers_only_changes(session, tmp_path, hashed):
+    src = tmp_path / "src"
+    write(src / "a.txt", b"alpha")
+    write(src / "sub" / "b.txt", b"bravo")
+    index = SyncIndex(str(tmp_path / "index.sqlite"))
+    lists = count_calls(session, "ListObjectsV2")
+
+    first = sync(session, BUCKET, str(src), "out/", "up", index, workers=2)
+    assert first.files == 2 and lists
+    listed = len(lists)
+
+    again = sync(session, BUCKET, str(src), "out/", "up", index, workers=2)
+    assert again.files == 0
+    assert len(lists) == listed  # listing came from the index
+    assert hashed == []  # size + mtime unchanged since the upload
+
+    write(src / "a.txt", b"ALPHA")  # same size, new mtime
+    os.utime(src / "a.txt", ns=(1, 1))
+    write(src / "c.txt", b"new")
+    changed = sync(session, BUCKET, str(src), "out/", "up", index, listing_ttl=0)
+    assert sorted(job[1] for job in changed.done) == ["out/a.txt", "out/c.txt"]
+    assert len(lists) > listed
+    body = session.client("s3").get_object(Bucket=BUCKET, Key="out/a.txt")["Body"]
+    assert body.read() == b"ALPHA"
+
+
+def test_sync_down_matches_multipart_etags(session, tmp_path, hashed):
+    src = tmp_path / "src"
+    big = write(src / "big.bin", os.urandom(11 * MB))
+    write(src / "small.txt", b"small")
+    upload_dir(session, BUCKET, str(src), "in/", config=small_parts())
+    dst = tmp_path / "dst"
+    write(dst / "big.bin", big)  # already there, but never synced
+    index = SyncIndex(":memory:")
+
+    stats = sync(session, BUCKET, str(dst), "in/", "down", index, listing_ttl=0)
+    assert [job[0] for job in stats.done] == ["in/small.txt"]
+    assert hashed == [str(dst / "big.bin")]  # recognised by its 5 MB-part ETag
+    assert tree(dst) == tree(src)
+
+    session.client("s3").put_object(Bucket=BUCKET, Key="in/small.txt", Body=b"SMALL")
+    stats = sync(session, BUCKET, str(dst), "in/", "down", index, listing_ttl=0)
+    assert [job[0] for job in stats.done] == ["in/small.txt"]
+    assert (dst / "small.txt").read_bytes() == b"SMALL"
+
+
+def test_local_etag_matches_s3(session, tmp_path):
+    data = write(tmp_path / "f.bin", os.urandom(12 * MB))
+    client = session.client("s3")
+    client.put_object(Bucket=BUCKET, Key="single", Body=data)
+    assert (
+        local_etag(str(tmp_path / "f.bin"))
+        == client.head_object(Bucket=BUCKET, Key="single")["ETag"]
+    )
+    upload_dir(session, BUCKET, str(tmp_path), "multi/", config=small_parts())
+    etag = client.head_object(Bucket=BUCKET, Key="multi/f.bin")["ETag"]
+    assert local_etag(str(tmp_path / "f.bin"), 5 * MB) == etag
+
+
+def put_keys(session, keys, body=b"x"):
+    client = session.client("s3")
+    for key in keys:
+        client.put_object(Bucket=BUCKET, Key=key, Body=body)
+    return client
+
+
+def all_keys(client):
+    return sorted(
+        obj["Key"] for obj in client.list_objects_v2(Bucket=BUCKET).get("Contents", [])
+    )
+
+
+def test_delete_prefix_in_batches(session):
+    client = put_keys(
+        session, [f"tmp/{i:03d}" for i in range(250)] + ["keep/a", "tmpx"]
+    )
+    batches = count_calls(session, "DeleteObjects")
+    stats = s3_ops.delete_prefix(session, BUCKET, "tmp/", workers=3, batch_size=100)
+    assert (stats.files, stats.failures) == (250, [])
+    assert len(batches) == 3
+    assert all_keys(client) == ["keep/a", "tmpx"]
+
+
+def test_delete_reports_refused_keys(session, monkeypatch):
+    put_keys(session, ["tmp/a", "tmp/locked", "tmp/b"])
+    client = get_client(session)
+    real_delete = client.delete_objects
+
+    def delete_objects(**kw):
+        kw["Delete"]["Objects"] = [
+            o for o in kw["Delete"]["Objects"] if o["Key"] != "tmp/locked"
+        ]
+        resp = real_delete(**kw)
+        resp["Errors"] = [
+            {"Key": "tmp/locked", "Code": "AccessDenied", "Message": "nope"}
+        ]
+        return resp
+
+    client.delete_objects = delete_objects
+    monkeypatch.setattr(s3_ops, "get_client", lambda *a: client)
+    stats = s3_ops.delete_prefix(session, BUCKET, "tmp/")
+    assert stats.files == 2
+    assert stats.failures == [("tmp/locked", "AccessDenied: nope")]
+    assert all_keys(client) == ["tmp/locked"]
+
+
+def test_copy_prefix_uses_multipart_copy_for_large_objects(session, tmp_path):
+    big = write(tmp_path / "src" / "big.bin", os.urandom(11 * MB))
+    write(tmp_path / "src" / "small.txt", b"small")
+    upload_dir(session, BUCKET, str(tmp_path / "src"), "a/")
+    part_copies = count_calls(session, "UploadPartCopy")
+
+    stats = s3_ops.copy_prefix(
+        session, BUCKET, "a/", "b/", workers=2, config=small_parts()
+    )
+    assert (stats.files, stats.failures) == (2, [])
+    assert len(part_copies) == 3  # 5 + 5 + 1 MB, only for the big object
+    client = session.client("s3")
+    assert client.get_object(Bucket=BUCKET, Key="b/big.bin")["Body"].read() == big
+    assert all_keys(client) == ["a/big.bin", "a/small.txt", "b/big.bin", "b/small.txt"]
+
+
+def test_move_prefix_deletes_only_copied_sources(session):
+    client = put_keys(session, ["raw/1", "raw/2", "raw/sub/3"])
+    client.create_bucket(Bucket="archive")
+    stats = s3_ops.copy_prefix(session, BUCKET, "raw/", "2024/", "archive", move=True)
+    assert stats.files == 3
+    assert all_keys(client) == []
+    moved = client.list_objects_v2(Bucket="archive")["Contents"]
+    assert sorted(obj["Key"] for obj in moved) == ["2024/1", "2024/2", "2024/sub/3"]
+
+    put_keys(session, ["raw/4"])
+    failed = s3_ops.copy_prefix(
+        session, BUCKET, "raw/", "x/", "no-such-bucket", move=True
+    )
+    assert failed.files == 0 and len(failed.failures) == 1
+    assert all_keys(client) == ["raw/4"]  # source kept
+
+
+def test_overlapping_prefixes_are_refused(session):
+    client = put_keys(session, ["logs/f", "logs/old/f"])
+    for src, dest in [
+        ("logs/", "logs/old/"),
+        ("logs/old/", "logs/"),
+        ("logs/", "logs/"),
+    ]:
+        with pytest.raises(ValueError, match="overlapping"):
+            s3_ops.copy_prefix(session, BUCKET, src, dest, move=True)
+    with pytest.raises(ValueError, match="overlapping"):
+        s3_ops.copy_prefix(session, BUCKET, "logs", "logs-archive/")
+    assert all_keys(client) == ["logs/f", "logs/old/f"]
+
+    client.create_bucket(Bucket="archive")  # same prefix, other bucket: fine
+    stats = s3_ops.copy_prefix(session, BUCKET, "logs/", "logs/old/", "archive")
+    assert stats.files == 2 and stats.failures == []
+
+
+def test_dry_run_changes_nothing(session, capsys):
+    client = put_keys(session, [f"old/{i}" for i in range(15)])
+    assert (
+        s3_ops.copy_prefix(session, BUCKET, "old/", "new/", move=True, dry_run=True)
+        is None
+    )
+    assert s3_ops.delete_prefix(session, BUCKET, "old/", dry_run=True) is None
+    assert all_keys(client) == sorted(f"old/{i}" for i in range(15))
+    out = capsys.readouterr().out
+    assert "(dry run) move s3://test-bucket/old/0 -> s3://test-bucket/new/0" in out
+    assert "would delete 15 objects" in out and "and 5 more" in out
+
+
+def test_whole_bucket_delete_is_refused(session):
+    with pytest.raises(ValueError):
+        s3_ops.delete_prefix(session, BUCKET, "")
+
+
+def test_help_does_not_import_boto3():
+    code = "import sys, s3_ops; print('boto3' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(s3_ops.__file__),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_sessions_and_clients_are_reused(session, monkeypatch):
+    monkeypatch.setattr(s3_ops, "_sessions", {})
+    assert get_session(None) is get_session(None)
+    assert get_client(session) is get_client(session)
+    assert get_client(session, 20) is not get_client(session)
+
+
+# Last in the file: this moto S3 stays up for the rest of the module, so
+# tests after it would share its state
+@pytest.fixture(scope="module")
+def listed_bucket():
+    for session in fake_s3():
+        client = session.client("s3")
+        keys = {
+            "top.txt": 1,
+            "a/1.txt": 10,
+            "a/2.txt": 20,
+            "a/b/3.txt": 30,
+            "c/d/e/4.txt": 40,
+        }
+        keys.update({f"many/{i:04d}": 1 for i in range(1200)})  # more than one page
+        for key, size in keys.items():
+            client.put_object(Bucket=BUCKET, Key=key, Body=b"x" * size)
+        yield session, keys
+
+
+@pytest.mark.parametrize("depth", [0, 1, 3])
+def test_scan_lists_every_key_once(listed_bucket, depth):
+    session, keys = listed_bucket
+    client = session.client("s3")
+    seen = []
+    s3_ops.scan_objects(client, BUCKET, "", seen.extend, workers=4, depth=depth)
+    assert sorted(obj["Key"] for obj in seen) == sorted(keys)
+
+
+def test_summary_groups_by_prefix(listed_bucket, capsys):
+    session, _ = listed_bucket
+    sink = s3_ops.list_objects(session, BUCKET, summary_only=True, depth=1)
+    assert sink.groups == {
+        "": [1, 1],
+        "a/": [3, 60],
+        "c/": [1, 40],
+        "many/": [1200, 1200],
+    }
+    assert (sink.objects, sink.bytes) == (1205, 1301)
+    out = capsys.readouterr().out
+    assert "many/0001" not in out and "1,200" in out
+
+
+@pytest.mark.parametrize("name", ["inv.ndjson", "inv.csv", "inv.parquet"])
+def test_inventory_files(listed_bucket, tmp_path, name):
+    session, keys = listed_bucket
+    path = tmp_path / name
+    s3_ops.list_objects(session, BUCKET, "a/", inventory=str(path), depth=2)
+    if name.endswith(".parquet"):
+        pq = pytest.importorskip("pyarrow.parquet")
+        rows = pq.read_table(path).to_pylist()
+    elif name.endswith(".csv"):
+        import csv
+
+        with open(path, newline="") as f:
+            rows = [{**r, "size": int(r["size"])} for r in csv.DictReader(f)]
+    else:
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert {r["key"]: r["size"] for r in rows} == {
+        k: v for k, v in keys.items() if k.startswith("a/")
+    }
+    assert all(r["etag"] and r["last_modified"] for r in rows)
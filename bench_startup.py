@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Cold-start time of every CLI entry point: each one is started as a fresh
+interpreter (`--help`, or a bare import for the API module) several times,
+and one extra run with `-X importtime` shows which top-level imports the
+time goes to.
+
+Usage:
+  python bench_startup.py                 # all entry points, 10 runs each
+  python bench_startup.py --repeat 30 --top 8 --only s3_ops word_count
+  python bench_startup.py --json > startup.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+DAY1 = ROOT / "Day1"
+DAY2 = ROOT / "Day2_Manual ETL vs Pandas ETL"
+DAY3 = ROOT / "Day3_APIs_(Requests + FastAPI)"
+DAY4 = ROOT / "Day4"
+
+# name -> (working directory, interpreter arguments)
+ENTRY_POINTS = {
+    "python (baseline)": (ROOT, ["-c", "pass"]),
+    "word_count": (DAY1, ["word_count.py", "--help"]),
+    "char_count": (DAY1, ["char_count.py", "--help"]),
+    "line_count": (DAY1, ["line_count.py"]),  # usage error, exits 1, no log file
+    "line_count_with_logging": (DAY1, ["line_count_with_logging.py", "--help"]),
+    "main_etl": (DAY2, ["-m", "etl_scripts.main_etl", "--help"]),
+    "etl_employees": (DAY2, ["-m", "etl_scripts.etl_employees", "--help"]),
+    "run_all": (DAY2, ["-m", "etl_scripts.run_all", "--help"]),
+    "api_transform (import)": (DAY3, ["-c", "import api_transform"]),
+    "load_test": (DAY3, ["load_test.py", "--help"]),
+    # No arguments: running it posts to live endpoints, so time the import
+    "client_post (import)": (DAY3, ["-c", "import client_post"]),
+    "s3_ops": (DAY4, ["s3_ops.py", "--help"]),
+}
+
+
+def run(cwd, args, importtime=False):
+    """Wall time of one interpreter run, and its stderr."""
+    cmd = [sys.executable, *(["-X", "importtime"] if importtime else []), *args]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    return time.perf_counter() - start, proc.stderr
+
+
+def top_imports(stderr, top):
+    """
+    Largest top-level imports from -X importtime output, as
+    (module, cumulative ms). Nested imports are folded into their parent.
+    """
+    costs = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            costs.append((name.strip(), int(cumulative) / 1000))
+    return sorted(costs, key=lambda c: c[1], reverse=True)[:top]
+
+
+def measure(name, repeat, top):
+    cwd, args = ENTRY_POINTS[name]
+    run(cwd, args)  # warm the OS file cache and __pycache__
+    times = [run(cwd, args)[0] * 1000 for _ in range(repeat)]
+    _, stderr = run(cwd, args, importtime=True)
+    return {
+        "entry_point": name,
+        "median_ms": round(statistics.median(times), 1),
+        "min_ms": round(min(times), 1),
+        "imports": [
+            {"module": m, "ms": round(ms, 1)} for m, ms in top_imports(stderr, top)
+        ],
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="Cold-start benchmark of the CLI entry points"
+    )
+    p.add_argument("--repeat", type=int, default=10, help="Runs per entry point")
+    p.add_argument("--top", type=int, default=5, help="Top-level imports to show")
+    p.add_argument("--only", nargs="+", choices=sorted(ENTRY_POINTS), metavar="NAME")
+    p.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = p.parse_args()
+
+    names = args.only or list(ENTRY_POINTS)
+    results = [measure(name, args.repeat, args.top) for name in names]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return results
+
+    print(
+        f"{'entry point':<26}{'median ms':>10}{'min ms':>9}   top imports (cumulative ms)"
+    )
+    for r in results:
+        imports = ", ".join(f"{i['module']} {i['ms']:.0f}" for i in r["imports"])
+        print(
+            f"{r['entry_point']:<26}{r['median_ms']:>10.1f}{r['min_ms']:>9.1f}   {imports}"
+        )
+    print(f"({args.repeat} runs each, {sys.executable} on {os.cpu_count()} CPUs)")
+    return results
+
+
+if __name__ == "__main__":
+    main()